@@ -2,22 +2,112 @@
 from __future__ import unicode_literals
 import frappe
 from frappe import _
-import jwt
-import time
 import uuid
+from werkzeug.exceptions import TooManyRequests
+from erpnext_meet.erpnext_meet.utils import active_rooms, analytics, db_routing, guest_tokens, invite_delivery, invite_digest, jitsi_token, metrics, participants, profiler, rate_limit, search, tracing
+from erpnext_meet.erpnext_meet.utils.session_id import new_session_id
+
+ROOM_CREATION_LOCK_TIMEOUT = 30
+ROOM_CREATION_LOCK_WAIT = 10
 
 @frappe.whitelist()
+@metrics.timed("create_room")
+@profiler.profile("create_room")
+@tracing.traced("create_room")
 def create_room(doctype, docname):
     """
-    Creates a new Jitsi room/session for the given document.
-    Returns: { "room_url": "...", "session_name": "..." }
+    Creates a new Jitsi room/session for the given document, or returns the
+    live (Active/Waiting) one if the document already has a meeting running.
+    The caller must be able to read the document. A live meeting is returned
+    as is: callers who are not its host or participants have to be invited.
+    Returns: { "room_name": "...", "session_name": "...", "join_link": "...", "existing": bool,
+               "can_join": bool }
     """
+    rate_limit.check_room_creation()
+
     settings = frappe.get_single("Meeting Settings")
     if not settings.enable_chat:
         frappe.throw(_("Meeting integration is disabled."))
 
-    # Generate a unique session ID
-    session_id = str(uuid.uuid4())[:8]
+    existing = False
+    can_join = True
+    if doctype and docname:
+        frappe.has_permission(doctype, "read", docname, throw=True)
+        # Singleflight: concurrent "Start Meeting" clicks on the same document
+        # wait on one Redis lock and all end up in the same room
+        lock = frappe.cache().lock(
+            frappe.cache().make_key(f"erpnext_meet:create_room:{doctype}:{docname}"),
+            timeout=ROOM_CREATION_LOCK_TIMEOUT,
+            blocking_timeout=ROOM_CREATION_LOCK_WAIT
+        )
+        if not lock.acquire():
+            frappe.throw(_("A meeting is already being started for this document. Please try again."))
+        try:
+            session = get_live_meeting(doctype, docname)
+            if session:
+                existing = True
+                can_join = can_join_live_meeting(session)
+            else:
+                session = insert_meeting(settings, doctype, docname)
+            # Commit while holding the lock so waiting callers see the new room
+            frappe.db.commit()
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                pass  # Lock expired; nothing to release
+    else:
+        session = insert_meeting(settings, doctype, docname)
+
+    session_id = session.session_id
+    tracing.set_meeting(session.name)
+    
+    # Room name format: Meet-DocType-DocName-SessionID (Sanitized)
+    if doctype and docname:
+        room_name = f"Meet-{doctype}-{docname}-{session_id}".replace(" ", "_")
+    else:
+        room_name = f"Meet-Instant-{session_id}"
+    
+    join_link = get_join_url(room_name)
+    
+    return {
+        "room_name": room_name,
+        "session_name": session.name,
+        "join_link": join_link,
+        "existing": existing,
+        "can_join": can_join
+    }
+
+def get_live_meeting(doctype, docname):
+    """
+    Returns the most recent Active or Waiting meeting for a document, if any.
+    """
+    meetings = frappe.get_all("Meeting",
+        filters={
+            "reference_doctype": doctype,
+            "reference_docname": docname,
+            "status": ["in", ["Active", "Waiting"]]
+        },
+        fields=["name", "session_id", "host", "large_meeting"],
+        order_by="creation desc",
+        limit=1
+    )
+    return meetings[0] if meetings else None
+
+def can_join_live_meeting(meeting):
+    """
+    Whether join_room admits the current user to a live meeting: its host or
+    one of its participants.
+    """
+    user = frappe.session.user
+    return user == meeting.host or participants.is_participant(meeting.name, user, large=meeting.large_meeting)
+
+def insert_meeting(settings, doctype, docname):
+    """
+    Inserts a new Active meeting hosted by the current user.
+    """
+    # Generate a unique, time-ordered session ID
+    session_id = new_session_id()
     
     # Create Call Session Record
     session_data = {
@@ -58,96 +148,42 @@ def create_room(doctype, docname):
     })
     
     session.insert(ignore_permissions=True)
-    
-    # Construct Jitsi URL
-    domain = settings.jitsi_domain or "meet.jit.si"
-    # Room name format: Meet-DocType-DocName-SessionID (Sanitized)
-    if doctype and docname:
-        room_name = f"Meet-{doctype}-{docname}-{session_id}".replace(" ", "_")
-    else:
-        room_name = f"Meet-Instant-{session_id}"
-    
-    token = None
-    if settings.app_id and settings.app_secret:
-        # Default behavior for room creation: Creator gets moderator rights
-        token = generate_jitsi_jwt(settings, room_name, frappe.session.user, is_moderator=True)
-
-    domain_url = domain
-    if not domain_url.startswith("http"):
-        domain_url = f"https://{domain_url}"
-
-    join_link = frappe.utils.get_url(f"/api/method/erpnext_meet.erpnext_meet.api.join_room?room_name={room_name}")
-    
-    return {
-        "room_name": room_name,
-        "session_name": session.name,
-        "join_link": join_link
-    }
+    return session
 
 @frappe.whitelist()
-def generate_jitsi_jwt(settings, room_name, user_email, is_moderator=False):
+def generate_jitsi_jwt(settings, room_name, user_email, is_moderator=False, display_name=None, role=None):
     """
-    Generates a JWT token for Jitsi Meet (SaaS or Self-hosted with auth).
-    Payload heavily depends on Jitsi configuration.
+    Generates a room-scoped JWT for Jitsi Meet (see utils/jitsi_token.py for the claims).
+    role: host, moderator, participant or guest; defaults from is_moderator.
+    display_name: identity from a verified guest invite; skips the User lookup.
     """
     user_avatar = ""
     user_name = "Guest"
     
-    if user_email and frappe.db.exists("User", user_email):
-        user_doc = frappe.get_doc("User", user_email)
-        user_name = user_doc.full_name
-        user_avatar = user_doc.user_image or ""
+    if display_name:
+        user_name = display_name
+    elif user_email and frappe.db.exists("User", user_email):
+        user_name, user_avatar = frappe.db.get_value("User", user_email, ["full_name", "user_image"])
+        user_avatar = user_avatar or ""
     elif user_email:
          user_name = user_email # Fallback if email provided but no doc (unlikely for Guests)
     
     # Guest Handling
     if not user_email:
-         import uuid
          user_email = f"guest-{str(uuid.uuid4())[:8]}" # Random ID for guest
-         user_name = "Guest" # Or let them set it in Jitsi UI if possible, but token usually overrides
-
-    payload = {
-        "context": {
-            "user": {
-                "avatar": user_avatar,
-                "name": user_name,
-                "email": user_email,
-                "id": user_email,
-                "moderator": is_moderator,
-                "affiliation": "owner" if is_moderator else "member"
-            },
-            "features": {
-                "livestreaming": is_moderator,
-                "recording": is_moderator
-            }
-        },
-        "aud": "jitsi",
-        "iss": settings.app_id,
-        "sub": "meet.jitsi",
-        "room": "*", # Using wildcard to avoid regex mismatches
-        "moderator": is_moderator,
-        "affiliation": "owner" if is_moderator else "member",
-        "exp": int(time.time() + 7200) # 2 hours
-    }
-    
-    # Debug logging
-    frappe.log_error(f"JWT Payload: {payload}\nSecret Length: {len(settings.get_password('app_secret') or '')}", "Jitsi Token Debug")
-    
-    encoded_jwt = jwt.encode(payload, settings.get_password("app_secret"), algorithm="HS256")
-    
-    # DEBUG LOG
-    frappe.log_error(title="Jitsi JWT Debug", message=f"User: {user_email}, Is Moderator: {is_moderator}, Payload: {payload}, Token: {encoded_jwt}")
-    
-    if isinstance(encoded_jwt, bytes):
-        return encoded_jwt.decode('utf-8')
-    return encoded_jwt
+         user_name = "Guest"
+
+    if not role:
+        role = "host" if is_moderator else "participant"
+
+    claims = jitsi_token.build_claims(settings, room_name, role, user_email, user_name, avatar=user_avatar)
+    return jitsi_token.encode(settings, claims)
 
 # ... (join_room unchanged)
 
 @frappe.whitelist()
 def update_invitation_status(room_name, status):
     logged_user = frappe.session.user
-    frappe.log_error(f"RSVP Request: User={logged_user}, Room={room_name}, Status={status}", "RSVP Debug")
     
     if status not in ["Accepted", "Rejected"]:
          frappe.throw(_("Invalid status"))
@@ -159,7 +195,6 @@ def update_invitation_status(room_name, status):
             return
             
         session_id = parts[1].split("?")[0]
-        frappe.log_error(f"Extracted Session ID: {session_id}", "RSVP Debug")
         
         meeting = frappe.get_doc("Meeting", {"session_id": session_id})
         if not meeting:
@@ -178,7 +213,6 @@ def update_invitation_status(room_name, status):
             meeting.flags.ignore_permissions = True
             meeting.save(ignore_permissions=True)
             frappe.db.commit()
-            frappe.log_error("Meeting Saved Successfully", "RSVP Debug")
             return True
         else:
             frappe.log_error(f"User {logged_user} not found in participants: {[p.user for p in meeting.participants]}", "RSVP Error")
@@ -189,24 +223,29 @@ def update_invitation_status(room_name, status):
         return False
 
 @frappe.whitelist(allow_guest=True)
-def join_room(room_name):
+@metrics.timed("join_room")
+@profiler.profile("join_room")
+def join_room(room_name, token=None):
     """
     Generates a token for the current user and redirects to the Jitsi room.
     Usage: /api/method/erpnext_meet.erpnext_meet.api.join_room?room_name=...
+    Guests must pass a signed invite: ...&token=... (see create_guest_invite)
     """
+    rate_limit.check_request("join")
+
+    guest_claims = None
     if frappe.session.user == "Guest":
         # Guest Access Logic
+        # Only guests holding a signed invite may join. The invite carries the
+        # meeting, display name and role, so no Meeting lookup is needed.
         is_guest = True
-        user_email = "" # No email for guest
         is_moderator = False
-        
-        # We can implement token validation here if needed, but for now open for invited guests
-        # Validating existence of meeting is enough for basic security
-        pass
+        if not token:
+            frappe.throw(_("An invite link is required to join as a guest."), frappe.PermissionError)
     else:
         is_guest = False
 
-    settings = frappe.get_single("Meeting Settings")
+    settings = frappe.get_cached_doc("Meeting Settings")
     
     # 1. GET MEETING DETAILS
     # Extract session_id from room_name (Meet-{doc}-{name}-{session_id})
@@ -215,32 +254,44 @@ def join_room(room_name):
         parts = room_name.rsplit("-", 1)
         if len(parts) >= 2:
             session_id = parts[1].split("?")[0]
-            
-            # Fetch Host and Participants
-            meeting = frappe.db.get_value("Meeting", 
-                {"session_id": session_id}, 
-                ["name", "status", "host"], 
-                as_dict=True
-            )
-            
-            if not meeting:
-                 frappe.throw(_("Meeting not found"), frappe.DoesNotExistError)
 
-            # 2. STRICT PARTICIPANT CHECK (Skip for Guests if desired, or validate token)
-            if not is_guest:
+            if is_guest:
+                # Signature, expiry and revocation are checked without the database.
+                # Ended meetings revoke all of their guest invites.
+                guest_claims = guest_tokens.verify(token, session_id)
+                rate_limit.check_room(session_id)
+                is_moderator = guest_claims["role"] == "moderator"
+            else:
+                # Fetch Host and Participants from the read replica.
+                # Staleness guard: a denial (missing, not invited, not live) may
+                # only be replica lag, e.g. a meeting created a moment ago, so it
+                # is re-checked on the primary before being acted upon.
+                with db_routing.read_replica():
+                    meeting, is_participant = get_join_details(session_id)
+                if not meeting or meeting.status not in ["Active", "Waiting"] or (
+                    meeting.host != frappe.session.user and not is_participant
+                ):
+                    meeting, is_participant = get_join_details(session_id)
+                
+                if not meeting:
+                     frappe.throw(_("Meeting not found"), frappe.DoesNotExistError)
+
                 # Allow if User is Host
                 is_host = (meeting.host == frappe.session.user)
-                
-                # Allow if User is in Participants List
-                is_participant = frappe.db.exists("Meeting Participant", {
-                    "parent": meeting.name,
-                    "user": frappe.session.user
-                })
+
+                # 2. STRICT PARTICIPANT CHECK
+                # Allow if User is in Participants List (is_participant)
                 
                 # DENY if neither
                 if not is_host and not is_participant:
                      frappe.throw(_("You are not invited to this meeting."), frappe.PermissionError)
 
+                # Per-room admission control, charged only for invited callers so
+                # uninvited requests cannot use up the room's budget. The host
+                # always bypasses it (priority lane).
+                if not is_host:
+                    rate_limit.check_room(session_id)
+
                 # 3. DETERMINE MODERATOR STATUS
                 # STRICT CHECK: Only the recorded host can be moderator
                 # Allow joining if Active or Waiting
@@ -250,33 +301,49 @@ def join_room(room_name):
                      is_moderator = False
                 else:
                      frappe.throw(_("Meeting is not active."), frappe.PermissionError)
-            else:
-                 # Guest logic for meeting status
-                 if meeting.status not in ["Active", "Waiting"]:
-                      frappe.throw(_("Meeting is not active."), frappe.PermissionError)
 
-    except frappe.PermissionError as e:
+    except (frappe.PermissionError, TooManyRequests) as e:
         raise e
     except Exception as e:
         frappe.log_error(f"Join Error: {str(e)}", "Meeting Join Error")
         is_moderator = False 
 
-    token = generate_jitsi_jwt(settings, room_name, frappe.session.user, is_moderator=is_moderator)
+    if is_guest:
+        if not guest_claims:
+            frappe.throw(_("Invalid invite link."), frappe.PermissionError)
+        token = generate_jitsi_jwt(settings, room_name, f"guest-{guest_claims['jti']}",
+            display_name=guest_claims["name"], role="moderator" if is_moderator else "guest")
+    else:
+        token = generate_jitsi_jwt(settings, room_name, frappe.session.user,
+            role="host" if is_moderator else "participant")
     
     # Ensure protocol is present
     domain = settings.jitsi_domain
     if not domain.startswith("http"):
         domain = f"https://{domain}"
         
-    url = f"{domain}/{room_name}"
+    url = f"{domain}/{jitsi_token.room_path(room_name)}"
     if token:
         url += f"?jwt={token}"
     
-    frappe.log_error(title="Jitsi Join URL", message=f"User: {frappe.session.user}, URL: {url}")
-    
     frappe.local.response["type"] = "redirect"
     frappe.local.response["location"] = url
 
+def get_join_details(session_id):
+    """
+    Returns (meeting, is_participant) for the current user and the meeting with session_id.
+    """
+    meeting = frappe.db.get_value("Meeting", 
+        {"session_id": session_id}, 
+        ["name", "status", "host", "large_meeting"], 
+        as_dict=True
+    )
+    if not meeting:
+        return None, False
+
+    is_participant = participants.is_participant(meeting.name, frappe.session.user, large=meeting.large_meeting)
+    return meeting, is_participant
+
 @frappe.whitelist()
 def start_instant_meeting():
     """
@@ -287,11 +354,14 @@ def start_instant_meeting():
         room_data = create_room(None, None)
         frappe.local.response["type"] = "redirect"
         frappe.local.response["location"] = room_data["join_link"]
+    except TooManyRequests:
+        raise
     except Exception as e:
-        frappe.log_error(f"Instant Meeting Error: {str(e)}")
+        frappe.log_error(title="Instant Meeting Error", message=str(e))
         frappe.throw(_("Could not start instant meeting. Check logs."))
 
 @frappe.whitelist()
+@tracing.traced("invite_users")
 def invite_users(users, room_name, doctype, docname, meeting_name=None):
     """
     API wrapper that enqueues the invite job.
@@ -331,8 +401,10 @@ def invite_users(users, room_name, doctype, docname, meeting_name=None):
         except Exception:
             pass
 
+    tracing.set_meeting(meeting_name)
+
     # Enqueue background job - runs as Administrator
-    frappe.enqueue(
+    tracing.enqueue(
         "erpnext_meet.erpnext_meet.api.send_meeting_invites",
         meeting_name=meeting_name,
         added_users=users,
@@ -343,6 +415,7 @@ def invite_users(users, room_name, doctype, docname, meeting_name=None):
     )
 
 @frappe.whitelist()
+@tracing.traced("sync_event_shares")
 def sync_event_shares(event_name, valid_users):
     """
     Background job to sync Event shares.
@@ -361,10 +434,13 @@ def sync_event_shares(event_name, valid_users):
              valid_users = json.loads(valid_users)
         
         valid_users_set = set(valid_users)
+        already_shared = set(frappe.get_all("DocShare",
+            filters={"share_doctype": "Event", "share_name": event_name, "user": ["in", list(valid_users_set)]},
+            pluck="user")) if valid_users_set else set()
         
-        # 1. Share with valid users
+        # 1. Share with valid users (only the ones not shared yet, so large lists cost their diff)
         for user in valid_users:
-            if user:
+            if user and user not in already_shared:
                 try:
                     frappe.share.add_docshare("Event", event_name, user, read=1, write=0, share=0, flags={"ignore_share_permission": True, "ignore_permissions": True})
                 except Exception as e:
@@ -388,10 +464,17 @@ def sync_event_shares(event_name, valid_users):
     finally:
          frappe.set_user(original_user)
 
+@metrics.timed("send_meeting_invites")
+@profiler.profile("send_meeting_invites")
+@tracing.traced("send_meeting_invites")
 def send_meeting_invites(meeting_name, added_users=None, room_name=None, doctype=None, docname=None):
     """
     Background job function to send meeting invitations.
     Runs as Administrator to bypass permission issues.
+    With an invite digest window configured, the notification and email are
+    buffered per recipient and sent as one digest (see utils/invite_digest.py).
+    The outcome of each step is recorded per recipient; failed steps are retried
+    by utils/invite_delivery.py.
     """
     if not meeting_name:
         frappe.log_error("send_meeting_invites called without meeting_name", "Meeting Invite Error")
@@ -406,11 +489,7 @@ def send_meeting_invites(meeting_name, added_users=None, room_name=None, doctype
         
         # Determine room_name if not passed
         if not room_name:
-            session_id = meeting.session_id
-            if meeting.reference_doctype and meeting.reference_docname:
-                room_name = f"Meet-{meeting.reference_doctype}-{meeting.reference_docname}-{session_id}".replace(" ", "_")
-            else:
-                room_name = f"Meet-Instant-{session_id}"
+            room_name = get_room_name(meeting)
         
         # Determine doctype/docname for notification
         if not doctype:
@@ -419,137 +498,177 @@ def send_meeting_invites(meeting_name, added_users=None, room_name=None, doctype
             docname = meeting.reference_docname or meeting.name
         
         # Build join URL
-        join_url = frappe.utils.get_url(f"/api/method/erpnext_meet.erpnext_meet.api.join_room?room_name={room_name}")
+        join_url = get_join_url(room_name)
         
         # If no specific users provided, use all participants except host
         if not added_users:
-            added_users = [p.user for p in meeting.participants if p.user != meeting.host]
+            added_users = [u for u in participants.get_users(meeting_name, large=meeting.large_meeting) if u != meeting.host]
+
+        digest = invite_digest.is_enabled()
+        states = {}
         
         for user in added_users:
             if user == meeting.host:
                 continue
                 
             # Grant Read Permission via Share (running as Admin)
-            try:
-                frappe.share.add("Meeting", meeting_name, user, read=1, write=0, share=0)
-            except Exception as e:
-                frappe.log_error(f"Failed to share Meeting {meeting_name} with {user}: {str(e)}", "Meeting Share Error")
+            # Always immediate, so the meeting opens as soon as the invite arrives
+            steps = {invite_delivery.SHARED: share_meeting(meeting_name, user)}
+
+            if digest:
+                # Pending until invite_digest.send_digest records the outcome;
+                # delivered already if an earlier digest covered this meeting
+                if not invite_digest.buffer(user, meeting_name, room_name, doctype, docname):
+                    steps[invite_delivery.NOTIFIED] = steps[invite_delivery.EMAILED] = True
+            else:
+                steps[invite_delivery.NOTIFIED] = create_invite_notification(user, doctype, docname, join_url)
+                steps[invite_delivery.EMAILED] = send_invite_email(meeting, user, doctype, docname, join_url)
 
-            # Create Notification Log
-            try:
-                doc = frappe.new_doc("Notification Log")
-                doc.subject = f"Video Meeting Invite: {doctype} {docname}"
-                doc.email_content = f"""
-                    <p>You have been invited to a video meeting.</p>
-                    <p><b>Reference:</b> {doctype} {docname}</p>
-                    <p><a href="{join_url}" target="_blank">Click here to Join Meeting</a></p>
-                """
-                doc.for_user = user
-                doc.document_type = doctype
-                doc.document_name = docname
-                doc.type = "Alert"
-                doc.insert(ignore_permissions=True)
-            except Exception as e:
-                frappe.log_error(f"Failed to create notification for {user}: {str(e)}", "Meeting Notification Error")
-
-            # Send Email
-            try:
-                # 1. Host Name
-                host_name = frappe.utils.get_fullname(meeting.host)
-                intro_msg = _("{0} has invited you to a video meeting.").format(host_name)
-
-                # 2. Repeat Info
-                repeat_info = ""
-                if meeting.repeat_this_meeting:
-                    repeat_info = _(meeting.repeat_on)
-                    if meeting.repeat_on == "Weekly":
-                        days = []
-                        if meeting.monday: days.append(_("Monday"))
-                        if meeting.tuesday: days.append(_("Tuesday"))
-                        if meeting.wednesday: days.append(_("Wednesday"))
-                        if meeting.thursday: days.append(_("Thursday"))
-                        if meeting.friday: days.append(_("Friday"))
-                        if meeting.saturday: days.append(_("Saturday"))
-                        if meeting.sunday: days.append(_("Sunday"))
-                        if days:
-                            repeat_info += f" ({', '.join(days)})"
-
-                # Prepare Context for Template
-                context = {
-                    "intro_message": intro_msg,
-                    "reference_label": _("Reference"),
-                    "reference_doctype": doctype,
-                    "reference_docname": docname,
-                    "start_time_label": _("Start Time"),
-                    "start_time": frappe.utils.format_datetime(meeting.start_time, "medium"),
-                    "end_time_label": _("End Time"),
-                    "end_time": frappe.utils.format_datetime(meeting.end_time, "medium") if meeting.end_time else None,
-                    "details_label": _("Meeting Details"),
-                    "meeting_details": meeting.get("meeting_details"),
-                    "repeat_label": _("Repeats"),
-                    "repeat_info": repeat_info,
-                    "join_button_label": _("Click here to Join Meeting"),
-                    "join_url": join_url
-                }
-
-                # Render Template
-                if frappe.db.exists("Email Template", "Meeting Invitation"):
-                     template = frappe.get_doc("Email Template", "Meeting Invitation")
-                     subject = frappe.render_template(template.subject, context)
-                     message = frappe.render_template(template.response, context)
-                else:
-                     # Fallback if template missing
-                     subject = f"Video Meeting Invite: {doctype} {docname}"
-                     message = f"""
-                        <p>{context['intro_message']}</p>
-                        <p><b>{context['reference_label']}:</b> {doctype} {docname}</p>
-                        <p><a href="{join_url}" target="_blank">{context['join_button_label']}</a></p>
-                     """
-
-                # Format Recipient as "Name <email>"
-                recipient_name = frappe.utils.get_fullname(user)
-                recipient = f"{recipient_name} <{user}>"
-
-                frappe.sendmail(
-                    recipients=[recipient],
-                    subject=subject,
-                    message=message,
-                    reference_doctype="Meeting",
-                    reference_name=meeting_name
-                )
-            except Exception as e:
-                frappe.log_error(f"Failed to send meeting invite email to {user}: {str(e)}", "Meeting Email Error")
+            states[user] = (
+                sum(bit for bit, ok in steps.items() if ok),
+                sum(bit for bit, ok in steps.items() if not ok),
+            )
+
+        invite_delivery.record(meeting_name, states)
     finally:
         # Always restore original user
         frappe.set_user(original_user)
 
+def get_room_name(meeting):
+    if meeting.reference_doctype and meeting.reference_docname:
+        return f"Meet-{meeting.reference_doctype}-{meeting.reference_docname}-{meeting.session_id}".replace(" ", "_")
+    return f"Meet-Instant-{meeting.session_id}"
+
+def get_join_url(room_name):
+    return frappe.utils.get_url(
+        f"/api/method/erpnext_meet.erpnext_meet.api.join_room?room_name={jitsi_token.room_path(room_name)}")
+
+def share_meeting(meeting_name, user):
+    try:
+        frappe.share.add("Meeting", meeting_name, user, read=1, write=0, share=0)
+        metrics.inc("erpnext_meet_invites_total", {"step": "share", "result": "success"})
+        return True
+    except Exception as e:
+        metrics.inc("erpnext_meet_invites_total", {"step": "share", "result": "error"})
+        frappe.log_error(f"Failed to share Meeting {meeting_name} with {user}: {str(e)}", "Meeting Share Error")
+        return False
+
+def create_invite_notification(user, doctype, docname, join_url):
+    # Create Notification Log
+    try:
+        doc = frappe.new_doc("Notification Log")
+        doc.subject = f"Video Meeting Invite: {doctype} {docname}"
+        doc.email_content = f"""
+            <p>You have been invited to a video meeting.</p>
+            <p><b>Reference:</b> {doctype} {docname}</p>
+            <p><a href="{join_url}" target="_blank">Click here to Join Meeting</a></p>
+        """
+        doc.for_user = user
+        doc.document_type = doctype
+        doc.document_name = docname
+        doc.type = "Alert"
+        doc.erpnext_meet_source = "invite"
+        doc.insert(ignore_permissions=True)
+        metrics.inc("erpnext_meet_invites_total", {"step": "notification", "result": "success"})
+        return True
+    except Exception as e:
+        metrics.inc("erpnext_meet_invites_total", {"step": "notification", "result": "error"})
+        frappe.log_error(f"Failed to create notification for {user}: {str(e)}", "Meeting Notification Error")
+        return False
+
+def get_repeat_info(meeting):
+    repeat_info = ""
+    if meeting.repeat_this_meeting:
+        repeat_info = _(meeting.repeat_on)
+        if meeting.repeat_on == "Weekly":
+            days = []
+            if meeting.monday: days.append(_("Monday"))
+            if meeting.tuesday: days.append(_("Tuesday"))
+            if meeting.wednesday: days.append(_("Wednesday"))
+            if meeting.thursday: days.append(_("Thursday"))
+            if meeting.friday: days.append(_("Friday"))
+            if meeting.saturday: days.append(_("Saturday"))
+            if meeting.sunday: days.append(_("Sunday"))
+            if days:
+                repeat_info += f" ({', '.join(days)})"
+    return repeat_info
+
+def send_invite_email(meeting, user, doctype, docname, join_url):
+    # Send Email
+    try:
+        # 1. Host Name
+        host_name = frappe.utils.get_fullname(meeting.host)
+        intro_msg = _("{0} has invited you to a video meeting.").format(host_name)
+
+        # Prepare Context for Template
+        context = {
+            "intro_message": intro_msg,
+            "reference_label": _("Reference"),
+            "reference_doctype": doctype,
+            "reference_docname": docname,
+            "start_time_label": _("Start Time"),
+            "start_time": frappe.utils.format_datetime(meeting.start_time, "medium"),
+            "end_time_label": _("End Time"),
+            "end_time": frappe.utils.format_datetime(meeting.end_time, "medium") if meeting.end_time else None,
+            "details_label": _("Meeting Details"),
+            "meeting_details": meeting.get("meeting_details"),
+            "repeat_label": _("Repeats"),
+            "repeat_info": get_repeat_info(meeting),
+            "join_button_label": _("Click here to Join Meeting"),
+            "join_url": join_url
+        }
+
+        # Render Template
+        if frappe.db.exists("Email Template", "Meeting Invitation"):
+             template = frappe.get_doc("Email Template", "Meeting Invitation")
+             subject = frappe.render_template(template.subject, context)
+             message = frappe.render_template(template.response, context)
+        else:
+             # Fallback if template missing
+             subject = f"Video Meeting Invite: {doctype} {docname}"
+             message = f"""
+                <p>{context['intro_message']}</p>
+                <p><b>{context['reference_label']}:</b> {doctype} {docname}</p>
+                <p><a href="{join_url}" target="_blank">{context['join_button_label']}</a></p>
+             """
+
+        # Format Recipient as "Name <email>"
+        recipient_name = frappe.utils.get_fullname(user)
+        recipient = f"{recipient_name} <{user}>"
+
+        frappe.sendmail(
+            recipients=[recipient],
+            subject=subject,
+            message=message,
+            reference_doctype="Meeting",
+            reference_name=meeting.name
+        )
+        metrics.inc("erpnext_meet_invites_total", {"step": "email", "result": "success"})
+        return True
+    except Exception as e:
+        metrics.inc("erpnext_meet_invites_total", {"step": "email", "result": "error"})
+        frappe.log_error(f"Failed to send meeting invite email to {user}: {str(e)}", "Meeting Email Error")
+        return False
+
 @frappe.whitelist()
 def get_active_room(doctype, docname):
     """
     Checks if there is an active Meeting Session for this document.
     Returns dict {room_name, host} if active, else None.
     """
-    sessions = frappe.get_all("Meeting", 
-        filters={
-            "reference_doctype": doctype,
-            "reference_docname": docname,
-            "status": "Active"
-        },
-        fields=["session_id", "host"],
-        order_by="creation desc",
-        limit=1
-    )
-    
-    if sessions:
-        session = sessions[0]
-        # Must match create_room name generation
-        room_name = f"Meet-{doctype}-{docname}-{session.session_id}".replace(" ", "_")
-        return {
-            "room_name": room_name,
-            "host": session.host
-        }
-        
-    return None
+    return active_rooms.get_active_rooms(doctype, [docname]).get(docname)
+
+@frappe.whitelist()
+@metrics.timed("get_active_rooms")
+def get_active_rooms(doctype, docnames):
+    """
+    Batched get_active_room for list views and dashboards.
+    docnames: list or JSON list of document names.
+    Returns {docname: {room_name, host}} for the documents with an active meeting.
+    """
+    if isinstance(docnames, str):
+        docnames = frappe.parse_json(docnames)
+    return active_rooms.get_active_rooms(doctype, docnames or [])
 
 @frappe.whitelist()
 def end_meeting(room_name, status="Ended"):
@@ -569,7 +688,8 @@ def end_meeting(room_name, status="Ended"):
         # Check if this is a repeating meeting
         meeting = frappe.db.get_value("Meeting", 
             {"session_id": session_id}, 
-            ["name", "repeat_this_meeting", "event_ref"], 
+            ["name", "status", "repeat_this_meeting", "event_ref", "host", "reference_doctype", "reference_docname",
+                "start_time", "end_time"], 
             as_dict=True
         )
         
@@ -586,12 +706,21 @@ def end_meeting(room_name, status="Ended"):
             SET status = %s, modified = NOW(), end_time = NOW()
             WHERE session_id = %s
         """, (status, session_id))
+        metrics.track_status_change(meeting.status, status)
+        if status == "Ended":
+            guest_tokens.revoke_session(session_id)
+        if status == "Ended" and meeting.status != "Ended":
+            # A Waiting meeting was last active when everyone left
+            analytics.record_meeting_end(meeting,
+                active_until=meeting.end_time if meeting.status == "Waiting" else None)
         
         # Sync Event status for non-repeating meetings that are being ended
         if meeting.event_ref and not meeting.repeat_this_meeting and status == "Ended":
             frappe.db.set_value("Event", meeting.event_ref, "status", "Completed")
         
+        search.queue_update([meeting.name])
         frappe.db.commit()
+        active_rooms.invalidate([meeting])
         return True
     except Exception as e:
         frappe.log_error(f"Failed to end meeting: {str(e)}", "Meeting End Error")
@@ -610,19 +739,29 @@ def start_meeting(room_name):
         session_id = parts[1].split("?")[0]
         
         # Only update if current status is Waiting
+        meeting = frappe.db.get_value("Meeting", {"session_id": session_id},
+            ["name", "status", "reference_doctype", "reference_docname"], as_dict=True)
+        current_status = meeting.status if meeting else None
         frappe.db.sql("""
             UPDATE `tabMeeting`
             SET status = 'Active', modified = NOW()
             WHERE session_id = %s AND status = 'Waiting'
         """, (session_id,))
+        if current_status == "Waiting":
+            metrics.track_status_change("Waiting", "Active")
+            search.queue_update([meeting.name])
         
         frappe.db.commit()
+        if current_status == "Waiting":
+            active_rooms.invalidate([meeting])
         return True
     except Exception as e:
         frappe.log_error(f"Failed to start meeting: {str(e)}", "Meeting Start Error")
         return False
 
 @frappe.whitelist(allow_guest=True)
+@metrics.timed("handle_jitsi_event")
+@profiler.profile("handle_jitsi_event")
 def handle_jitsi_event(**kwargs):
     """
     Handles incoming webhooks from Jitsi Prosody server.
@@ -636,7 +775,9 @@ def handle_jitsi_event(**kwargs):
     if not settings.webhook_token:
         frappe.throw(_("Webhook Token is not configured in Meeting Settings"), frappe.PermissionError)
         
-    if data.get("token") != settings.webhook_token:
+    authenticated = data.get("token") == settings.webhook_token
+    rate_limit.check_webhook(authenticated)
+    if not authenticated:
          frappe.throw(_("Invalid Webhook Token"), frappe.PermissionError)
 
     # 2. Process Event
@@ -669,6 +810,18 @@ def update_invitation_status(room_name, status):
         if len(parts) < 2:
             return
         session_id = parts[1].split("?")[0]
+
+        # Large meetings: single-row UPDATE, the Meeting document is never loaded
+        meeting_name, large = frappe.db.get_value("Meeting", {"session_id": session_id}, ["name", "large_meeting"]) or (None, 0)
+        if large:
+            old_status = participants.get_status(meeting_name, frappe.session.user, large=True)
+            if not participants.set_status(meeting_name, frappe.session.user, status, large=True):
+                frappe.throw(_("You are not a participant in this meeting."))
+            analytics.record_rsvp(
+                frappe.db.get_value("Meeting", meeting_name, ["host", "reference_doctype"], as_dict=True),
+                old_status, status
+            )
+            return True
         
         meeting = frappe.get_doc("Meeting", {"session_id": session_id})
         
@@ -687,10 +840,144 @@ def update_invitation_status(room_name, status):
             frappe.throw(_("You are not a participant in this meeting."))
 
     except Exception as e:
-        frappe.log_error(f"RSVP Error: {str(e)}")
+        frappe.log_error(title="RSVP Error", message=str(e))
         return False
 
 @frappe.whitelist()
 def get_jitsi_domain():
-    settings = frappe.get_single("Meeting Settings")
-    return settings.jitsi_domain
+    # Served from the document cache; no database read at all
+    return frappe.get_cached_doc("Meeting Settings").jitsi_domain
+
+def _check_meeting_host(meeting):
+    if meeting.host != frappe.session.user and "System Manager" not in frappe.get_roles():
+        frappe.throw(_("Only the meeting host can manage guest invites."), frappe.PermissionError)
+
+@frappe.whitelist()
+def create_guest_invite(meeting_name, display_name, valid_hours=guest_tokens.DEFAULT_VALIDITY_HOURS, role="participant", email=None):
+    """
+    Issues a signed guest invite link for a meeting. Host or System Manager only.
+    If email is given, the link is also sent to that address.
+    Returns: { "join_link": "...", "expires_on": "..." }
+    """
+    meeting = frappe.db.get_value("Meeting", meeting_name,
+        ["name", "host", "status", "session_id", "reference_doctype", "reference_docname"],
+        as_dict=True
+    )
+    if not meeting:
+        frappe.throw(_("Meeting not found"), frappe.DoesNotExistError)
+    _check_meeting_host(meeting)
+
+    if meeting.status not in ["Active", "Waiting"]:
+        frappe.throw(_("Meeting is not active."))
+
+    valid_hours = frappe.utils.flt(valid_hours)
+    token = guest_tokens.issue(meeting.session_id, display_name, valid_hours=valid_hours, role=role)
+
+    if meeting.reference_doctype and meeting.reference_docname:
+        room_name = f"Meet-{meeting.reference_doctype}-{meeting.reference_docname}-{meeting.session_id}".replace(" ", "_")
+    else:
+        room_name = f"Meet-Instant-{meeting.session_id}"
+
+    join_link = frappe.utils.get_url(
+        f"/api/method/erpnext_meet.erpnext_meet.api.join_room?room_name={jitsi_token.room_path(room_name)}&token={token}"
+    )
+    expires_on = frappe.utils.add_to_date(frappe.utils.now_datetime(), hours=valid_hours)
+
+    if email:
+        host_name = frappe.utils.get_fullname(meeting.host)
+        frappe.sendmail(
+            recipients=[email],
+            subject=_("Video Meeting Invite from {0}").format(host_name),
+            message=f"""
+                <p>{_("{0} has invited you to a video meeting.").format(host_name)}</p>
+                <p><a href="{join_link}" target="_blank">{_("Click here to Join Meeting")}</a></p>
+                <p>{_("This link is valid until {0}.").format(frappe.utils.format_datetime(expires_on, "medium"))}</p>
+            """,
+            reference_doctype="Meeting",
+            reference_name=meeting.name
+        )
+
+    return {
+        "join_link": join_link,
+        "expires_on": expires_on
+    }
+
+@frappe.whitelist()
+def revoke_guest_invite(join_link_or_token):
+    """
+    Revokes a single guest invite. Accepts the token or the full join link.
+    """
+    token = join_link_or_token.split("token=", 1)[-1].split("&")[0]
+    claims = guest_tokens.decode(token)
+    if not claims:
+        frappe.throw(_("Invalid invite link."))
+
+    meeting = frappe.db.get_value("Meeting", {"session_id": claims["sid"]}, ["name", "host"], as_dict=True)
+    if not meeting:
+        frappe.throw(_("Meeting not found"), frappe.DoesNotExistError)
+    _check_meeting_host(meeting)
+
+    guest_tokens.revoke(claims)
+    return True
+
+def _parse_users(users):
+    import json
+    if isinstance(users, str):
+        try:
+            users = json.loads(users)
+        except ValueError:
+            users = [users]
+    return [u for u in users or [] if u]
+
+@frappe.whitelist()
+def get_meeting_participants(meeting_name, start=0, page_length=50, search=None, status=None):
+    """
+    Paginated participant list for both regular and large meetings.
+    Returns: { "participants": [{user, full_name, invitation_status}], "total": int }
+    """
+    frappe.has_permission("Meeting", "read", meeting_name, throw=True)
+    large = participants.is_large(meeting_name)
+
+    rows = participants.get_page(meeting_name, start=start, page_length=min(frappe.utils.cint(page_length), 500),
+        search=search, status=status, large=large)
+    for row in rows:
+        row.full_name = frappe.utils.get_fullname(row.user)
+
+    return {
+        "participants": rows,
+        "total": participants.count(meeting_name, large=large)
+    }
+
+@frappe.whitelist()
+@tracing.traced("add_meeting_participants")
+def add_meeting_participants(meeting_name, users):
+    """
+    Adds users to a large meeting with set-based queries and invites the new ones.
+    Returns the list of users that were added.
+    """
+    frappe.has_permission("Meeting", "write", meeting_name, throw=True)
+    if not participants.is_large(meeting_name):
+        frappe.throw(_("Add participants to regular meetings in the Participants table."))
+
+    added = participants.add_attendees(meeting_name, _parse_users(users))
+    if added:
+        search.queue_update([meeting_name])
+        tracing.enqueue(
+            "erpnext_meet.erpnext_meet.api.send_meeting_invites",
+            meeting_name=meeting_name,
+            added_users=added,
+            queue="short",
+            enqueue_after_commit=True
+        )
+    return added
+
+@frappe.whitelist()
+def remove_meeting_participants(meeting_name, users):
+    frappe.has_permission("Meeting", "write", meeting_name, throw=True)
+    if not participants.is_large(meeting_name):
+        frappe.throw(_("Remove participants of regular meetings in the Participants table."))
+
+    host = frappe.db.get_value("Meeting", meeting_name, "host")
+    participants.remove_attendees(meeting_name, [u for u in _parse_users(users) if u != host])
+    search.queue_update([meeting_name])
+    return True
@@ -3,6 +3,17 @@ from __future__ import unicode_literals
 import frappe
 import frappe.share
 from frappe.model.document import Document
+from erpnext_meet.erpnext_meet.utils import (
+    active_rooms,
+    analytics,
+    metrics,
+    participants,
+    profiler,
+    reminders,
+    search,
+    tracing,
+)
+from erpnext_meet.erpnext_meet.utils.session_id import new_session_id
 
 class Meeting(Document):
     def validate(self):
@@ -10,16 +21,97 @@ class Meeting(Document):
             self.host = frappe.session.user
             
         if not self.session_id:
-            import uuid
-            self.session_id = str(uuid.uuid4())[:8]
+            self.session_id = new_session_id()
 
         if not self.start_time:
             self.start_time = frappe.utils.now()
 
+        self.next_occurrence = reminders.get_next_occurrence(self)
+
+        # Large meetings keep participants in Meeting Attendee; rows entered in the
+        # child table (e.g. when switching modes) are moved there in on_update
+        if self.large_meeting and self.participants:
+            self.flags.attendees_to_move = [(p.user, p.invitation_status) for p in self.participants]
+            self.set("participants", [])
+        elif not self.large_meeting:
+            self.move_attendees_back()
+
+    def onload(self):
+        if self.large_meeting:
+            self.set_onload("participant_count", participants.count(self.name, large=True))
+            self.set_onload("my_invitation_status",
+                participants.get_status(self.name, frappe.session.user, large=True))
+
+    @profiler.profile("Meeting.on_update")
+    @tracing.traced("Meeting.on_update")
     def on_update(self):
+        tracing.set_meeting(self.name)
+        self.track_status_metrics()
+        self.update_rollups()
+        self.invalidate_active_rooms()
+        self.move_attendees()
         self.invite_new_participants()
         self.sync_with_event()
+        search.queue_update([self.name])
+
+    def on_trash(self):
+        metrics.track_status_change(self.status, None)
+        active_rooms.invalidate([self])
+        # The job finds the meeting gone and drops it from the index
+        search.queue_update([self.name])
+        frappe.db.delete(participants.ATTENDEE, {"meeting": self.name})
+        frappe.db.delete("Meeting Invite Delivery", {"meeting": self.name})
+
+    def move_attendees(self):
+        self.flags.moved_attendees = None
+        if self.flags.attendees_to_move:
+            self.flags.moved_attendees = participants.add_attendees(self.name, self.flags.attendees_to_move)
+            self.flags.attendees_to_move = None
+        if self.flags.attendees_moved_back:
+            frappe.db.delete(participants.ATTENDEE, {"meeting": self.name})
 
+    def move_attendees_back(self):
+        # Turning Large Meeting off: the attendees become child rows again, or
+        # is_participant (which now reads the child table) would lock them out
+        self.flags.attendees_moved_back = None
+        old_doc = self.get_doc_before_save()
+        if not old_doc or not old_doc.large_meeting:
+            return
+        existing = {p.user for p in self.participants}
+        attendees = frappe.get_all(participants.ATTENDEE,
+            filters={"meeting": self.name}, fields=["user", "invitation_status"], order_by="user asc")
+        for row in attendees:
+            if row.user not in existing:
+                self.append("participants", {"user": row.user, "invitation_status": row.invitation_status})
+        self.flags.attendees_moved_back = [row.user for row in attendees]
+
+    def track_status_metrics(self):
+        old_doc = self.get_doc_before_save()
+        metrics.track_status_change(old_doc.status if old_doc else None, self.status)
+
+    def invalidate_active_rooms(self):
+        old_doc = self.get_doc_before_save()
+        if old_doc and old_doc.status == self.status:
+            return
+        # After commit, so a concurrent lookup cannot cache the old status again
+        frappe.db.after_commit.add(lambda: active_rooms.invalidate([self]))
+
+    def update_rollups(self):
+        # Covers edits through the document; end_meeting and tasks.hourly end
+        # meetings with direct UPDATEs and record the rollups themselves
+        old_doc = self.get_doc_before_save()
+        if not old_doc:
+            return
+
+        if self.status == "Ended" and old_doc.status != "Ended":
+            analytics.record_meeting_end(self)
+
+        old_statuses = {p.user: p.invitation_status for p in old_doc.participants}
+        for p in self.participants:
+            if p.user in old_statuses and p.user != self.host:
+                analytics.record_rsvp(self, old_statuses[p.user], p.invitation_status)
+
+    @profiler.profile("Meeting.sync_with_event")
     def sync_with_event(self):
         if not self.start_time:
             return
@@ -37,9 +129,13 @@ class Meeting(Document):
         if self.host:
              event_participants.append({"reference_doctype": "User", "reference_docname": self.host})
              
-        for p in self.participants:
-            if p.invitation_status != "Rejected" and p.user != self.host:
-                 event_participants.append({"reference_doctype": "User", "reference_docname": p.user})
+        # Large meetings are not mirrored on save: rewriting thousands of Event rows
+        # and shares on every edit is the cost large mode avoids. The reconciler
+        # (utils/event_sync.py) applies only the participant diff in the background.
+        if not self.large_meeting:
+            for p in self.participants:
+                if p.invitation_status != "Rejected" and p.user != self.host:
+                    event_participants.append({"reference_doctype": "User", "reference_docname": p.user})
 
         if not self.event_ref:
             event = frappe.new_doc("Event")
@@ -82,8 +178,9 @@ class Meeting(Document):
                 event.ends_on = ends_on
                 
                 # Update participants safely
-                event.set("event_participants", [])
-                event.set("event_participants", event_participants)
+                if not self.large_meeting:
+                    event.set("event_participants", [])
+                    event.set("event_participants", event_participants)
                 
                 event.event_category = "Meeting"
                 event.event_type = "Private" # Use Private + Share
@@ -115,8 +212,8 @@ class Meeting(Document):
         # Enqueue background job to sync shares
         # This avoids permission issues and speeds up save
         valid_users = [p.get("reference_docname") for p in event_participants]
-        if valid_users:
-             frappe.enqueue(
+        if valid_users and not self.large_meeting:
+             tracing.enqueue(
                  "erpnext_meet.erpnext_meet.api.sync_event_shares",
                  event_name=event.name,
                  valid_users=valid_users,
@@ -131,14 +228,21 @@ class Meeting(Document):
             old_participants = set()
             if old_doc:
                 old_participants = {p.user for p in old_doc.participants}
+            # Attendees moved back from large mode were invited already
+            old_participants.update(self.flags.attendees_moved_back or [])
                 
-            new_participants = {p.user for p in self.participants}
-            added_users = list(new_participants - old_participants)
+            if self.large_meeting:
+                # Only rows moved from the child table can be new here.
+                # Attendees added later go through api.add_meeting_participants.
+                added_users = [u for u in (self.flags.moved_attendees or []) if u not in old_participants]
+            else:
+                new_participants = {p.user for p in self.participants}
+                added_users = list(new_participants - old_participants)
             
             if added_users:
                 # Enqueue background job - runs as Administrator
                 # IMPORTANT: enqueue_after_commit ensures Meeting is saved first
-                frappe.enqueue(
+                tracing.enqueue(
                     "erpnext_meet.erpnext_meet.api.send_meeting_invites",
                     meeting_name=self.name,
                     added_users=added_users,
@@ -147,3 +251,14 @@ class Meeting(Document):
                 )
         except Exception as e:
             frappe.log_error(title="Meeting Invite Error", message=frappe.get_traceback())
+
+def on_doctype_update():
+    # Live-meeting lookups per document (create_room, get_active_room)
+    frappe.db.add_index("Meeting", ["reference_doctype", "reference_docname", "status"])
+    # Meeting lookup by Event in the Event <-> Meeting reconciler
+    frappe.db.add_index("Meeting", ["event_ref"])
+    # Lifecycle sweeps in tasks.hourly: status filter plus modified range and order
+    frappe.db.add_index("Meeting", ["status", "modified"])
+    # Start reminders: one-off meetings by start_time range, repeating ones by their next occurrence
+    frappe.db.add_index("Meeting", ["repeat_this_meeting", "start_time"])
+    frappe.db.add_index("Meeting", ["next_occurrence"])
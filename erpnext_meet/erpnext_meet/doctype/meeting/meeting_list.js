@@ -0,0 +1,131 @@
+frappe.listview_settings["Meeting"] = {
+    onload: function (listview) {
+        listview.page.add_menu_item(__("Export Meeting History"), function () {
+            export_meeting_history();
+        });
+        listview.page.add_menu_item(__("Search Meetings"), function () {
+            search_meetings();
+        });
+        listview.page.add_menu_item(__("Bulk Schedule Meetings"), function () {
+            bulk_schedule_meetings(listview);
+        });
+    }
+};
+
+function export_meeting_history() {
+    let d = new frappe.ui.Dialog({
+        title: __("Export Meeting History"),
+        fields: [
+            { fieldname: "file_format", fieldtype: "Select", label: __("Format"), options: "CSV\nExcel", default: "CSV" },
+            { fieldname: "from_date", fieldtype: "Date", label: __("From Date") },
+            { fieldname: "to_date", fieldtype: "Date", label: __("To Date") },
+            { fieldname: "column_break_1", fieldtype: "Column Break" },
+            { fieldname: "status", fieldtype: "Select", label: __("Status"), options: "\nActive\nWaiting\nEnded" },
+            { fieldname: "host", fieldtype: "Link", label: __("Host"), options: "User" },
+            { fieldname: "reference_doctype", fieldtype: "Link", label: __("Reference DocType"), options: "DocType" }
+        ],
+        primary_action_label: __("Export"),
+        primary_action: function (values) {
+            frappe.call({
+                method: "erpnext_meet.erpnext_meet.utils.export.export_meeting_history",
+                args: values,
+                callback: function (r) {
+                    if (r.message) {
+                        frappe.show_alert({ message: r.message, indicator: "blue" });
+                    }
+                }
+            });
+            d.hide();
+        }
+    });
+    d.show();
+}
+
+function bulk_schedule_meetings(listview) {
+    let d = new frappe.ui.Dialog({
+        title: __("Bulk Schedule Meetings"),
+        fields: [
+            {
+                fieldname: "help", fieldtype: "HTML",
+                options: `<p class="text-muted small">${__("CSV with a header row. Columns: start_time (required), end_time, reference_doctype, reference_docname, host, participants (separated by , or ;), meeting_details, large_meeting, repeat_on, repeat_till, monday ... sunday.")}</p>`
+            },
+            { fieldname: "file_url", fieldtype: "Attach", label: __("CSV File"), reqd: 1 }
+        ],
+        primary_action_label: __("Schedule"),
+        primary_action: function (values) {
+            frappe.call({
+                method: "erpnext_meet.erpnext_meet.utils.bulk_schedule.schedule_meetings_from_file",
+                args: values,
+                freeze: true,
+                callback: function (r) {
+                    if (r.message) {
+                        d.hide();
+                        frappe.show_alert({
+                            message: __("{0} meetings scheduled. Invitations are being sent.", [r.message.meetings.length]),
+                            indicator: "green"
+                        });
+                        listview.refresh();
+                    }
+                }
+            });
+        }
+    });
+    d.show();
+}
+
+const SEARCH_PAGE_LENGTH = 20;
+
+function search_meetings() {
+    let state = { start: 0 };
+    let d = new frappe.ui.Dialog({
+        title: __("Search Meetings"),
+        size: "large",
+        fields: [
+            { fieldname: "text", fieldtype: "Data", label: __("Search"), description: __("Words from the details, reference, host or participant names") },
+            { fieldname: "column_break_1", fieldtype: "Column Break" },
+            { fieldname: "from_date", fieldtype: "Date", label: __("From Date") },
+            { fieldname: "to_date", fieldtype: "Date", label: __("To Date") },
+            { fieldname: "section_break_1", fieldtype: "Section Break" },
+            { fieldname: "results", fieldtype: "HTML" }
+        ],
+        primary_action_label: __("Search"),
+        primary_action: function () {
+            state.start = 0;
+            run_search();
+        }
+    });
+
+    let run_search = function () {
+        let values = d.get_values();
+        frappe.call({
+            method: "erpnext_meet.erpnext_meet.utils.search.search_meetings",
+            args: Object.assign({ start: state.start, page_length: SEARCH_PAGE_LENGTH }, values),
+            callback: function (r) {
+                let data = r.message || { total: 0, results: [] };
+                let $results = d.fields_dict.results.$wrapper;
+                $results.html(`
+                    <div class="text-muted small">${__("{0} meetings found", [data.total])}</div>
+                    <table class="table table-bordered table-condensed" style="margin-top: 6px;">
+                        <thead><tr><th>${__("Meeting")}</th><th>${__("Reference")}</th><th>${__("Host")}</th><th>${__("Start Time")}</th><th>${__("Status")}</th></tr></thead>
+                        <tbody>${data.results.map(m => `
+                            <tr>
+                                <td><a href="/app/meeting/${encodeURIComponent(m.name)}">${frappe.utils.escape_html(m.name)}</a></td>
+                                <td>${frappe.utils.escape_html([m.reference_doctype, m.reference_docname].filter(Boolean).join(" "))}</td>
+                                <td>${frappe.utils.escape_html(frappe.user.full_name(m.host))}</td>
+                                <td>${m.start_time ? frappe.datetime.str_to_user(m.start_time) : ""}</td>
+                                <td>${m.status || ""}</td>
+                            </tr>
+                        `).join("")}</tbody>
+                    </table>
+                    <div class="flex justify-between">
+                        <button class="btn btn-default btn-xs meet-search-prev" ${state.start ? "" : "disabled"}>${__("Previous")}</button>
+                        <button class="btn btn-default btn-xs meet-search-next" ${state.start + SEARCH_PAGE_LENGTH < data.total ? "" : "disabled"}>${__("Next")}</button>
+                    </div>
+                `);
+                $results.find(".meet-search-prev").on("click", () => { state.start -= SEARCH_PAGE_LENGTH; run_search(); });
+                $results.find(".meet-search-next").on("click", () => { state.start += SEARCH_PAGE_LENGTH; run_search(); });
+            }
+        });
+    };
+    d.show();
+}
@@ -0,0 +1,10 @@
+import frappe
+from frappe.model.document import Document
+
+
+class MeetingAttendee(Document):
+    pass
+
+def on_doctype_update():
+    # One row per user per meeting; also serves paginated reads ordered by user
+    frappe.db.add_unique("Meeting Attendee", ["meeting", "user"], constraint_name="unique_meeting_user")
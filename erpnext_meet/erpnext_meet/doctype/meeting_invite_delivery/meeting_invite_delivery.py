@@ -0,0 +1,11 @@
+import frappe
+from frappe.model.document import Document
+
+
+class MeetingInviteDelivery(Document):
+    pass
+
+def on_doctype_update():
+    # One row per recipient per meeting; next_retry serves the retry worker's range scan
+    frappe.db.add_unique("Meeting Invite Delivery", ["meeting", "user"], constraint_name="unique_meeting_user")
+    frappe.db.add_index("Meeting Invite Delivery", ["next_retry"])
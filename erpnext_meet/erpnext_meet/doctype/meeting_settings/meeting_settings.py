@@ -4,4 +4,6 @@ import frappe
 from frappe.model.document import Document
 
 class MeetingSettings(Document):
-    pass
+    def on_update(self):
+        from erpnext_meet.erpnext_meet.utils import boot
+        boot.clear_desk_config()
@@ -0,0 +1,10 @@
+import frappe
+from frappe.model.document import Document
+
+
+class MeetingUsageRollup(Document):
+    pass
+
+def on_doctype_update():
+    # Dashboard charts filter by dimension and scan a date range
+    frappe.db.add_index("Meeting Usage Rollup", ["dimension", "date"])
@@ -0,0 +1,29 @@
+// Copyright (c) 2026, Pars and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Meeting Profile Summary"] = {
+    filters: [
+        {
+            fieldname: "view",
+            label: __("View"),
+            fieldtype: "Select",
+            options: "Summary\nCalls",
+            default: "Summary"
+        },
+        {
+            fieldname: "method",
+            label: __("Method"),
+            fieldtype: "Data"
+        }
+    ],
+    onload: function (report) {
+        report.page.add_inner_button(__("Clear Profiles"), function () {
+            frappe.call({
+                method: "erpnext_meet.erpnext_meet.utils.profiler.clear_profiles",
+                callback: function () {
+                    report.refresh();
+                }
+            });
+        });
+    }
+};
@@ -0,0 +1,81 @@
+import frappe
+from frappe import _
+
+from erpnext_meet.erpnext_meet.utils import profiler
+
+
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    profiles = profiler.get_profiles(method=filters.method)
+
+    if filters.view == "Calls":
+        return get_call_columns(), get_call_data(profiles)
+    return get_summary_columns(), get_summary_data(profiles)
+
+
+def get_summary_columns():
+    return [
+        {"fieldname": "method", "label": _("Method"), "fieldtype": "Data", "width": 320},
+        {"fieldname": "calls", "label": _("Sampled Calls"), "fieldtype": "Int", "width": 110},
+        {"fieldname": "errors", "label": _("Errors"), "fieldtype": "Int", "width": 80},
+        {"fieldname": "avg_queries", "label": _("Avg Queries"), "fieldtype": "Float", "width": 110},
+        {"fieldname": "avg_db_ms", "label": _("Avg DB (ms)"), "fieldtype": "Float", "width": 110},
+        {"fieldname": "avg_python_ms", "label": _("Avg Python (ms)"), "fieldtype": "Float", "width": 120},
+        {"fieldname": "p95_total_ms", "label": _("p95 Total (ms)"), "fieldtype": "Float", "width": 120},
+        {"fieldname": "top_statement", "label": _("Slowest Statement"), "fieldtype": "Data", "width": 400},
+    ]
+
+
+def get_summary_data(profiles):
+    grouped = {}
+    for p in profiles:
+        grouped.setdefault(p["method"], []).append(p)
+
+    data = []
+    for method, rows in grouped.items():
+        calls = len(rows)
+        totals = sorted(r["total_ms"] for r in rows)
+
+        # Aggregate statement time across all sampled calls of the method
+        statements = {}
+        for r in rows:
+            for s in r["top_statements"]:
+                statements[s["query"]] = statements.get(s["query"], 0) + s["ms"]
+
+        data.append({
+            "method": method,
+            "calls": calls,
+            "errors": sum(1 for r in rows if r["status"] == "error"),
+            "avg_queries": sum(r["queries"] for r in rows) / calls,
+            "avg_db_ms": sum(r["db_ms"] for r in rows) / calls,
+            "avg_python_ms": sum(r["python_ms"] for r in rows) / calls,
+            "p95_total_ms": totals[min(int(calls * 0.95), calls - 1)],
+            "top_statement": max(statements, key=statements.get) if statements else "",
+        })
+
+    return sorted(data, key=lambda d: d["p95_total_ms"], reverse=True)
+
+
+def get_call_columns():
+    return [
+        {"fieldname": "timestamp", "label": _("Time"), "fieldtype": "Datetime", "width": 170},
+        {"fieldname": "method", "label": _("Method"), "fieldtype": "Data", "width": 320},
+        {"fieldname": "user", "label": _("User"), "fieldtype": "Data", "width": 160},
+        {"fieldname": "status", "label": _("Status"), "fieldtype": "Data", "width": 80},
+        {"fieldname": "queries", "label": _("Queries"), "fieldtype": "Int", "width": 80},
+        {"fieldname": "db_ms", "label": _("DB (ms)"), "fieldtype": "Float", "width": 90},
+        {"fieldname": "python_ms", "label": _("Python (ms)"), "fieldtype": "Float", "width": 100},
+        {"fieldname": "total_ms", "label": _("Total (ms)"), "fieldtype": "Float", "width": 90},
+        {"fieldname": "top_statements", "label": _("Top Statements"), "fieldtype": "Small Text", "width": 500},
+    ]
+
+
+def get_call_data(profiles):
+    data = []
+    for p in profiles:
+        row = dict(p)
+        row["top_statements"] = "\n".join(
+            f"{s['ms']} ms x{s['count']}: {s['query']}" for s in p["top_statements"]
+        )
+        data.append(row)
+    return data
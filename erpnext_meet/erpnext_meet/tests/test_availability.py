@@ -0,0 +1,45 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_meet.erpnext_meet.utils import availability
+
+
+class TestAvailability(FrappeTestCase):
+    def test_working_hours_within_a_day(self):
+        parts = list(availability.clip_to_working_hours(
+            datetime(2026, 3, 2, 0, 0), datetime(2026, 3, 4, 0, 0), "09:00", "18:00"))
+        self.assertEqual(parts, [
+            (datetime(2026, 3, 2, 9, 0), datetime(2026, 3, 2, 18, 0)),
+            (datetime(2026, 3, 3, 9, 0), datetime(2026, 3, 3, 18, 0)),
+        ])
+
+    def test_working_hours_past_midnight(self):
+        parts = list(availability.clip_to_working_hours(
+            datetime(2026, 3, 2, 3, 0), datetime(2026, 3, 3, 12, 0), "22:00", "06:00"))
+        self.assertEqual(parts, [
+            (datetime(2026, 3, 2, 3, 0), datetime(2026, 3, 2, 6, 0)),
+            (datetime(2026, 3, 2, 22, 0), datetime(2026, 3, 3, 6, 0)),
+        ])
+
+    def test_empty_working_hours_are_rejected(self):
+        self.assertRaises(frappe.ValidationError, availability.find_free_slots,
+            ["Administrator"], "2026-03-02 00:00:00", "2026-03-03 00:00:00",
+            working_hours_start="09:00", working_hours_end="09:00")
+
+    def test_unreadable_conflicts_are_anonymous(self):
+        busy = {"someone@example.com": [
+            availability._interval(datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 10), "Event", "EV-PRIVATE"),
+            availability._interval(datetime(2026, 3, 2, 10), datetime(2026, 3, 2, 11), "Event", "EV-OTHER"),
+            availability._interval(datetime(2026, 3, 2, 14), datetime(2026, 3, 2, 15), "Meeting", "MEET-SHARED"),
+        ]}
+        with patch.object(availability.frappe, "has_permission",
+                side_effect=lambda doctype, ptype, doc: doc == "MEET-SHARED"):
+            conflicts = availability.visible_conflicts(busy)
+
+        self.assertEqual(conflicts, {"someone@example.com": [
+            {"start": datetime(2026, 3, 2, 9), "end": datetime(2026, 3, 2, 11)},
+            busy["someone@example.com"][2],
+        ]})
@@ -0,0 +1,100 @@
+import frappe
+import jwt
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_meet.erpnext_meet.utils import jitsi_token
+
+SECRET = "erpnext-meet-test-secret"
+SESSION_ID = "0123456789abcdef"
+
+# Written out rather than derived from jitsi_token.ROLES, so any change to the
+# claims the Prosody modules read fails here.
+ROOMS = {
+    "Meet-Instant-0123456789abcdef": "meet-instant-0123456789abcdef",
+    "Meet-Project-Ayşe-0123456789abcdef": "meet-project-ay%c5%9fe-0123456789abcdef",
+    "Meet-Customer-Acme_&_Co.-0123456789abcdef": "meet-customer-acme_%26_co.-0123456789abcdef",
+    "Meet-Sales_Order-SO/2024/001-0123456789abcdef": "meet-sales_order-so%2f2024%2f001-0123456789abcdef",
+}
+USERS = {
+    "host": {"role": "host", "affiliation": "owner", "moderator": True, "lobby_bypass": True},
+    "moderator": {"role": "moderator", "affiliation": "owner", "moderator": True, "lobby_bypass": True},
+    "participant": {"role": "participant", "affiliation": "member", "moderator": False, "lobby_bypass": True},
+    "guest": {"role": "guest", "affiliation": "member", "moderator": False, "lobby_bypass": False},
+}
+FEATURES = {
+    "host": {"livestreaming": True, "recording": True, "transcription": True, "outbound-call": True,
+        "screen-sharing": True},
+    "moderator": {"livestreaming": False, "recording": True, "transcription": True, "outbound-call": False,
+        "screen-sharing": True},
+    "participant": {"livestreaming": False, "recording": False, "transcription": False, "outbound-call": False,
+        "screen-sharing": True},
+    "guest": {"livestreaming": False, "recording": False, "transcription": False, "outbound-call": False,
+        "screen-sharing": False},
+}
+
+
+def expected_claims(room_node, role, user_id, user_name):
+    user = USERS[role]
+    return {
+        "aud": "jitsi",
+        "iss": "erpnext_meet_test",
+        "sub": "meet.jitsi",
+        "room": room_node,
+        "context": {
+            "user": dict(user, id=user_id, name=user_name, email=user_id, avatar=""),
+            "features": FEATURES[role],
+            "room": {"name": room_node, "session_id": SESSION_ID},
+        },
+        "moderator": user["moderator"],
+        "affiliation": user["affiliation"],
+    }
+
+
+class TestJitsiToken(FrappeTestCase):
+    def setUp(self):
+        self.settings = frappe._dict(app_id="erpnext_meet_test", get_password=lambda fieldname: SECRET)
+
+    def test_jitsi_room_matches_the_muc_node(self):
+        for room_name, room_node in ROOMS.items():
+            self.assertEqual(jitsi_token.jitsi_room(room_name), room_node)
+
+    def test_jitsi_room_normalizes_compatibility_characters(self):
+        # NFKC, as Jitsi Meet's getBackendSafeRoomName: full-width "Project" becomes ASCII
+        self.assertEqual(jitsi_token.jitsi_room("Meet-\uff30\uff52\uff4f\uff4a\uff45\uff43\uff54-0123456789abcdef"),
+            "meet-project-0123456789abcdef")
+
+    def test_room_path_escapes_everything(self):
+        self.assertEqual(jitsi_token.room_path("Meet-Sales_Order-SO/2024/001-0123456789abcdef"),
+            "Meet-Sales_Order-SO%2F2024%2F001-0123456789abcdef")
+
+    def test_claims_per_role_and_room(self):
+        for room_name, room_node in ROOMS.items():
+            for role in USERS:
+                with self.subTest(room=room_name, role=role):
+                    user_id = f"{role}@example.com"
+                    claims = jitsi_token.build_claims(self.settings, room_name, role, user_id, role.title())
+                    issued = {key: claims.pop(key) for key in ("iat", "nbf", "exp")}
+                    self.assertEqual(claims, expected_claims(room_node, role, user_id, role.title()))
+                    self.assertEqual(issued["exp"] - issued["iat"], jitsi_token.TOKEN_TTL)
+                    self.assertEqual(issued["iat"] - issued["nbf"], jitsi_token.LEEWAY)
+
+    def test_claims_are_a_copy_of_the_role_features(self):
+        claims = jitsi_token.build_claims(self.settings, "Meet-Instant-0123456789abcdef", "guest", "g", "Guest")
+        claims["context"]["features"]["recording"] = True
+        self.assertFalse(jitsi_token.ROLES["guest"][2]["recording"])
+
+    def test_unknown_role_is_rejected(self):
+        self.assertRaises(frappe.ValidationError, jitsi_token.build_claims,
+            self.settings, "Meet-Instant-0123456789abcdef", "owner", "someone@example.com", "Someone")
+
+    def test_signed_token_decodes_to_the_claims(self):
+        claims = jitsi_token.build_claims(self.settings, "Meet-Project-Ayşe-0123456789abcdef", "host",
+            "host@example.com", "Host")
+        token = jitsi_token.encode(self.settings, claims)
+
+        self.assertIsInstance(token, str)
+        decoded = jwt.decode(token, SECRET, algorithms=["HS256"], audience="jitsi", leeway=jitsi_token.LEEWAY)
+        self.assertEqual(decoded, claims)
+        self.assertRaises(jwt.InvalidSignatureError, jwt.decode, token, "wrong-secret",
+            algorithms=["HS256"], audience="jitsi")
+
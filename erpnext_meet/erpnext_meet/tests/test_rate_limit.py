@@ -0,0 +1,144 @@
+import time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from werkzeug.exceptions import TooManyRequests
+
+from erpnext_meet.erpnext_meet import api
+from erpnext_meet.erpnext_meet.utils import participants, rate_limit
+
+PARTICIPANT = "meet-load-test@example.com"
+USER_LIMIT = 60
+OVERLOADS = (0.5, 1, 5, 20)
+
+
+def percentile(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))] if values else None
+
+
+class TestTokenBucket(FrappeTestCase):
+    def setUp(self):
+        self.scope = f"test:{frappe.generate_hash(length=8)}"
+
+    def tearDown(self):
+        frappe.cache().delete_keys(f"{rate_limit.BUCKET_PREFIX}:{self.scope}")
+
+    def test_capacity_is_the_limit(self):
+        for _ in range(5):
+            rate_limit.enforce(self.scope, "caller", 5)
+        self.assertRaises(TooManyRequests, rate_limit.enforce, self.scope, "caller", 5)
+        # Buckets are per identifier
+        rate_limit.enforce(self.scope, "other", 5)
+
+    def test_no_limit_admits_everything(self):
+        for _ in range(100):
+            rate_limit.enforce(self.scope, "caller", 0)
+
+    def test_bucket_refills(self):
+        # 600 per minute refills 10 tokens per second
+        rate_limit.enforce(self.scope, "caller", 600, cost=600)
+        self.assertRaises(TooManyRequests, rate_limit.enforce, self.scope, "caller", 600)
+
+        time.sleep(0.35)
+        rate_limit.enforce(self.scope, "caller", 600, cost=3)
+        self.assertRaises(TooManyRequests, rate_limit.enforce, self.scope, "caller", 600, cost=3)
+
+    def test_retry_after_is_the_time_to_refill_the_missing_tokens(self):
+        # 60 per minute refills 1 token per second
+        rate_limit.enforce(self.scope, "caller", 60, cost=60)
+        with self.assertRaises(TooManyRequests) as raised:
+            rate_limit.enforce(self.scope, "caller", 60, cost=30)
+
+        self.assertIn(raised.exception.retry_after, (29, 30))
+        headers = dict(raised.exception.get_headers())
+        self.assertEqual(headers["Retry-After"], str(raised.exception.retry_after))
+
+    def test_retry_after_is_at_least_one_second(self):
+        rate_limit.enforce(self.scope, "caller", 6000, cost=6000)
+        with self.assertRaises(TooManyRequests) as raised:
+            rate_limit.enforce(self.scope, "caller", 6000)
+        self.assertEqual(raised.exception.retry_after, 1)
+
+
+class TestJoinRoomUnderOverload(FrappeTestCase):
+    """
+    Offers join_room 0.5x, 1x, 5x and 20x the per-user limit as one burst from a
+    participant and reports p50/p99 latency per load level. Rejected requests must
+    stay cheaper than admitted ones, so endpoint latency stays flat under overload.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings = frappe.get_single("Meeting Settings")
+        settings.update({
+            "enable_chat": 1,
+            "jitsi_domain": "meet.example.com",
+            "app_id": "erpnext_meet_test",
+            "app_secret": "erpnext-meet-test-secret",
+            "enable_rate_limiting": 1,
+            "rate_limit_per_user": USER_LIMIT,
+            "rate_limit_per_room": 0,
+        })
+        settings.save(ignore_permissions=True)
+
+        if not frappe.db.exists("User", PARTICIPANT):
+            frappe.get_doc({"doctype": "User", "email": PARTICIPANT, "first_name": "Load Test",
+                "send_welcome_email": 0}).insert(ignore_permissions=True)
+
+        meeting = frappe.get_doc({"doctype": "Meeting", "host": "Administrator", "status": "Active",
+            "start_time": frappe.utils.now()}).insert(ignore_permissions=True)
+        participants.add_participants(meeting.name, [PARTICIPANT])
+        participants.set_status(meeting.name, PARTICIPANT, "Accepted")
+        cls.room_name = f"Meet-Instant-{meeting.session_id}"
+
+    @classmethod
+    def tearDownClass(cls):
+        frappe.set_user("Administrator")
+        super().tearDownClass()
+        frappe.clear_document_cache("Meeting Settings", "Meeting Settings")
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+        frappe.cache().delete_keys(f"{rate_limit.BUCKET_PREFIX}:join:user:{PARTICIPANT}")
+
+    def offer(self, requests):
+        frappe.cache().delete_keys(f"{rate_limit.BUCKET_PREFIX}:join:user:{PARTICIPANT}")
+        frappe.set_user(PARTICIPANT)
+        latencies = {True: [], False: []}
+        for _ in range(requests):
+            started = time.monotonic()
+            try:
+                api.join_room(self.room_name)
+                admitted = True
+            except TooManyRequests:
+                admitted = False
+            latencies[admitted].append((time.monotonic() - started) * 1000)
+        frappe.set_user("Administrator")
+        return latencies
+
+    def test_latency_under_overload(self):
+        report = {}
+        for overload in OVERLOADS:
+            latencies = self.offer(int(USER_LIMIT * overload))
+            everything = latencies[True] + latencies[False]
+            report[f"{overload}x"] = {
+                "requests": len(everything),
+                "admitted": len(latencies[True]),
+                "rejected": len(latencies[False]),
+                "p50_ms": percentile(everything, 50),
+                "p99_ms": percentile(everything, 99),
+                "p99_admitted_ms": percentile(latencies[True], 99),
+                "p99_rejected_ms": percentile(latencies[False], 99),
+            }
+        print(frappe.as_json(report))
+
+        # A burst up to the limit is admitted in full; beyond it the excess is rejected
+        self.assertEqual(report["1x"]["rejected"], 0)
+        self.assertGreaterEqual(report["20x"]["rejected"], USER_LIMIT * 18)
+        self.assertTrue(frappe.local.response.location.startswith("https://meet.example.com/"))
+
+        # Rejections return before the meeting lookup and token signing
+        self.assertLess(report["20x"]["p99_rejected_ms"], report["1x"]["p99_admitted_ms"])
+        self.assertLess(report["20x"]["p99_ms"], report["1x"]["p99_ms"] * 2)
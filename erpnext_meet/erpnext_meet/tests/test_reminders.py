@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_meet.erpnext_meet.utils import reminders
+
+
+def meeting(**values):
+    return frappe._dict({"name": "MEET-TEST-REMINDER", "status": "Active", "repeat_this_meeting": 1,
+        "start_time": datetime(2026, 3, 2, 9, 0), "end_time": datetime(2026, 3, 2, 10, 0), **values})
+
+
+class TestNextOccurrence(FrappeTestCase):
+    def test_one_off_and_ended_meetings_have_none(self):
+        self.assertIsNone(reminders.get_next_occurrence(meeting(repeat_this_meeting=0)))
+        self.assertIsNone(reminders.get_next_occurrence(meeting(repeat_on="Daily", status="Ended")))
+
+    def test_daily(self):
+        m = meeting(repeat_on="Daily")
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 5, 8, 0)), datetime(2026, 3, 5, 9, 0))
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 5, 9, 0)), datetime(2026, 3, 5, 9, 0))
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 5, 9, 1)), datetime(2026, 3, 6, 9, 0))
+        # Not before the series starts
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 1, 1)), datetime(2026, 3, 2, 9, 0))
+
+    def test_weekly_on_selected_days(self):
+        m = meeting(repeat_on="Weekly", monday=1, thursday=1)
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 3)), datetime(2026, 3, 5, 9, 0))
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 6)), datetime(2026, 3, 9, 9, 0))
+
+    def test_series_past_repeat_till_has_none(self):
+        m = meeting(repeat_on="Daily", repeat_till=date(2026, 3, 4))
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 4)), datetime(2026, 3, 4, 9, 0))
+        self.assertIsNone(reminders.get_next_occurrence(m, datetime(2026, 3, 4, 10, 0)))
+
+    def test_yearly_on_february_29(self):
+        m = meeting(repeat_on="Yearly", start_time=datetime(2024, 2, 29, 9, 0), end_time=None)
+        self.assertEqual(reminders.get_next_occurrence(m, datetime(2026, 3, 1)), datetime(2028, 2, 29, 9, 0))
+
+
+class TestClaims(FrappeTestCase):
+    def setUp(self):
+        self.due = [(meeting(name=f"MEET-TEST-{frappe.generate_hash(length=8)}"), datetime(2026, 3, 2, 9, 0))]
+
+    def tearDown(self):
+        reminders._release(self.due)
+
+    def test_an_occurrence_is_claimed_once(self):
+        self.assertEqual(reminders._claim(self.due), self.due)
+        self.assertEqual(reminders._claim(self.due), [])
+
+    def test_released_occurrences_can_be_claimed_again(self):
+        reminders._claim(self.due)
+        reminders._release(self.due)
+        self.assertEqual(reminders._claim(self.due), self.due)
@@ -0,0 +1,78 @@
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_meet.erpnext_meet.utils import session_id
+from erpnext_meet.erpnext_meet.utils.session_id import ALPHABET, SEQUENCE_BITS, new_session_id
+
+
+def decode(chars):
+    value = 0
+    for char in chars:
+        value = value * 32 + ALPHABET.index(char)
+    return value
+
+
+def split(sid):
+    """(timestamp ms, node, sequence) of a session ID."""
+    return decode(sid[:10]), decode(sid[10:14]), decode(sid[14:])
+
+
+class TestSessionID(FrappeTestCase):
+    def setUp(self):
+        self.saved_state = dict(session_id._state)
+
+    def tearDown(self):
+        session_id._state.update(self.saved_state)
+
+    def test_layout(self):
+        before = int(time.time() * 1000)
+        sid = new_session_id()
+        after = int(time.time() * 1000)
+
+        self.assertEqual(len(sid), 16)
+        self.assertTrue(set(sid) <= set(ALPHABET))
+        self.assertNotIn("-", sid)
+        timestamp, node, sequence = split(sid)
+        self.assertTrue(before <= timestamp <= after)
+        self.assertEqual(node, session_id._state["node"])
+        self.assertEqual(sequence, session_id._state["sequence"])
+
+    def test_ids_are_monotonic(self):
+        ids = [new_session_id() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_sequence_counts_within_a_millisecond_and_borrows_the_next_one(self):
+        with patch.object(session_id.time, "time", return_value=2_000_000_000.0):
+            ids = [new_session_id() for _ in range((1 << SEQUENCE_BITS) + 2)]
+
+        self.assertEqual(ids, sorted(ids))
+        parts = [split(sid) for sid in ids]
+        start_ms = parts[0][0]
+        self.assertEqual([p[2] for p in parts[:3]], [0, 1, 2])
+        self.assertEqual(parts[(1 << SEQUENCE_BITS) - 1], (start_ms, parts[0][1], (1 << SEQUENCE_BITS) - 1))
+        self.assertEqual(parts[1 << SEQUENCE_BITS][0], start_ms + 1)
+        self.assertEqual(parts[1 << SEQUENCE_BITS][2], 0)
+
+    def test_clock_going_backwards_does_not_reorder_ids(self):
+        with patch.object(session_id.time, "time", return_value=2_000_000_001.0):
+            first = new_session_id()
+        with patch.object(session_id.time, "time", return_value=2_000_000_000.0):
+            second = new_session_id()
+
+        self.assertGreater(second, first)
+        self.assertEqual(split(second)[0], split(first)[0])
+
+    def test_node_id_comes_from_a_counter_shared_by_all_sites(self):
+        session_id._state["pid"] = None
+        node = split(new_session_id())[1]
+
+        counter = frappe.cache().pipeline().get(session_id.NODE_COUNTER_KEY).execute()[0]
+        self.assertEqual(node, int(counter) % (1 << session_id.NODE_BITS))
+
+        # A forked worker takes the next node ID
+        session_id._state["pid"] = None
+        self.assertEqual(split(new_session_id())[1], (node + 1) % (1 << session_id.NODE_BITS))
@@ -0,0 +1,94 @@
+import json
+
+import frappe
+from frappe import _
+
+# Batched "live meeting" lookup for list views and form dashboards. Answers for
+# many documents of one doctype with a single query on the
+# (reference_doctype, reference_docname, status) index of Meeting.
+#
+# Results are cached per document for CACHE_TTL seconds, one Redis key per
+# document (the room, or "" when no meeting is active), each with its own expiry.
+# Every path that moves a meeting into or out of Active calls invalidate() after
+# its commit, so the TTL only bounds how long a missed invalidation can linger.
+# Misses are read from the primary: a replica lagging behind that commit would
+# cache a just-started meeting as not live.
+
+CACHE_KEY = "erpnext_meet:active_rooms:{0}:{1}"
+CACHE_TTL = 60
+MAX_DOCNAMES = 1000
+
+
+def _key(doctype, docname):
+    return frappe.cache().make_key(CACHE_KEY.format(doctype, docname))
+
+
+def get_active_rooms(doctype, docnames):
+    """
+    Returns {docname: {room_name, host}} for the documents that have an Active meeting.
+    """
+    docnames = list(dict.fromkeys(d for d in docnames if d))
+    if not doctype or not docnames:
+        return {}
+    if len(docnames) > MAX_DOCNAMES:
+        frappe.throw(_("Cannot look up more than {0} documents at once.").format(MAX_DOCNAMES))
+
+    pipe = frappe.cache().pipeline()
+    pipe.mget([_key(doctype, d) for d in docnames])
+    cached = pipe.execute()[0]
+
+    result = {}
+    missing = []
+    for docname, value in zip(docnames, cached, strict=True):
+        if value is None:
+            missing.append(docname)
+        elif value:
+            result[docname] = json.loads(value)
+
+    if missing:
+        found = _query(doctype, missing)
+        pipe = frappe.cache().pipeline()
+        for d in missing:
+            pipe.setex(_key(doctype, d), CACHE_TTL, json.dumps(found[d]) if d in found else "")
+        pipe.execute()
+        result.update(found)
+
+    return result
+
+
+def _query(doctype, docnames):
+    rows = frappe.db.sql("""
+        SELECT reference_docname, session_id, host
+        FROM `tabMeeting`
+        WHERE reference_doctype = %(doctype)s AND reference_docname IN %(docnames)s AND status = 'Active'
+        ORDER BY creation DESC
+    """, {"doctype": doctype, "docnames": docnames}, as_dict=True)
+
+    found = {}
+    for row in rows:
+        # Newest meeting wins, as in get_active_room
+        if row.reference_docname not in found:
+            found[row.reference_docname] = {
+                # Must match create_room name generation
+                "room_name": f"Meet-{doctype}-{row.reference_docname}-{row.session_id}".replace(" ", "_"),
+                "host": row.host,
+            }
+    return found
+
+
+def invalidate(meetings):
+    """
+    Drops the cached answers for the documents of `meetings` (dicts or docs with
+    reference_doctype and reference_docname). Call after a status change.
+    """
+    pipe = frappe.cache().pipeline()
+    queued = False
+    for meeting in meetings:
+        if meeting.get("reference_doctype") and meeting.get("reference_docname"):
+            pipe.delete(_key(meeting.get("reference_doctype"), meeting.get("reference_docname")))
+            queued = True
+    if queued:
+        try:
+            pipe.execute()
+        except Exception:
+            frappe.log_error(title="Meeting Active Room Cache Error", message=frappe.get_traceback())
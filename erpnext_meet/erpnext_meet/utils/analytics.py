@@ -0,0 +1,182 @@
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, get_datetime, getdate, now_datetime, nowdate
+
+# Daily usage rollups in "Meeting Usage Rollup", one row per (date, dimension, value).
+# Every ended meeting and RSVP is counted once under each dimension, so totals must
+# always be read filtered to a single dimension.
+ROLLUP = "Meeting Usage Rollup"
+DIMENSIONS = {
+    "Host": "host",
+    "Reference DocType": "reference_doctype",
+}
+INSTANT = "Instant"
+COUNTERS = ("meetings_ended", "duration_samples", "total_duration_minutes", "invitations_accepted", "invitations_rejected")
+
+
+def _row_name(date, dimension, value):
+    # Deterministic primary key, so an upsert needs no extra unique index
+    return hashlib.sha1(f"{date}|{dimension}|{value}".encode()).hexdigest()[:20]
+
+
+def _increment(date, meeting, **deltas):
+    """
+    Atomically adds `deltas` to the rollup rows of `meeting` (host and reference doctype)
+    for `date` with INSERT ... ON DUPLICATE KEY UPDATE.
+    """
+    date = getdate(date)
+    now = frappe.utils.now()
+    values = {c: deltas.get(c, 0) for c in COUNTERS}
+
+    for dimension, field in DIMENSIONS.items():
+        dimension_value = meeting.get(field) or INSTANT
+        frappe.db.sql(f"""
+            INSERT INTO `tabMeeting Usage Rollup`
+                (name, creation, modified, owner, modified_by, date, dimension, dimension_value,
+                {", ".join(COUNTERS)})
+            VALUES (%(name)s, %(now)s, %(now)s, 'Administrator', 'Administrator', %(date)s, %(dimension)s,
+                %(dimension_value)s, {", ".join(f"%({c})s" for c in COUNTERS)})
+            ON DUPLICATE KEY UPDATE modified = VALUES(modified),
+                {", ".join(f"{c} = {c} + VALUES({c})" for c in COUNTERS)}
+        """, dict(values,
+            name=_row_name(date, dimension, dimension_value),
+            now=now,
+            date=date,
+            dimension=dimension,
+            dimension_value=dimension_value
+        ))
+
+
+def record_meeting_end(meeting, ended_at=None, active_until=None):
+    """
+    Counts an ended meeting. `meeting` needs host, reference_doctype, start_time and
+    repeat_this_meeting. `active_until` is when the last participant actually left;
+    repeating meetings are counted without a duration.
+    """
+    ended_at = get_datetime(ended_at or now_datetime())
+    deltas = {"meetings_ended": 1}
+
+    if meeting.get("start_time") and not meeting.get("repeat_this_meeting"):
+        minutes = (get_datetime(active_until or ended_at) - get_datetime(meeting.start_time)).total_seconds() / 60
+        if minutes >= 0:
+            deltas.update(duration_samples=1, total_duration_minutes=minutes)
+
+    try:
+        _increment(ended_at, meeting, **deltas)
+    except Exception:
+        frappe.log_error(title="Meeting Rollup Error", message=frappe.get_traceback())
+
+
+def record_rsvp(meeting, old_status, new_status):
+    """
+    Counts an RSVP change on today's bucket. Switching an answer moves one count
+    from the old status to the new one.
+    """
+    deltas = {}
+    for status, sign in ((old_status, -1), (new_status, 1)):
+        if status == "Accepted":
+            deltas["invitations_accepted"] = deltas.get("invitations_accepted", 0) + sign
+        elif status == "Rejected":
+            deltas["invitations_rejected"] = deltas.get("invitations_rejected", 0) + sign
+
+    if old_status == new_status or not any(deltas.values()):
+        return
+    try:
+        _increment(nowdate(), meeting, **deltas)
+    except Exception:
+        frappe.log_error(title="Meeting Rollup Error", message=frappe.get_traceback())
+
+
+@frappe.whitelist()
+def rebuild_rollups():
+    """
+    Recomputes all rollups from Meeting history. Run once after installing, or to repair.
+    Usage: bench --site <site> execute erpnext_meet.erpnext_meet.utils.analytics.rebuild_rollups
+    RSVP history is bucketed by the participant row's last modification date.
+    """
+    frappe.only_for("System Manager")
+    frappe.db.delete(ROLLUP)
+
+    for dimension, field in DIMENSIONS.items():
+        ended = frappe.db.sql(f"""
+            SELECT DATE(end_time) AS date, COALESCE(NULLIF({field}, ''), %(instant)s) AS dimension_value,
+                COUNT(*) AS meetings_ended,
+                SUM(repeat_this_meeting = 0 AND start_time IS NOT NULL AND end_time >= start_time) AS duration_samples,
+                SUM(IF(repeat_this_meeting = 0 AND start_time IS NOT NULL AND end_time >= start_time,
+                    TIMESTAMPDIFF(SECOND, start_time, end_time) / 60, 0)) AS total_duration_minutes
+            FROM `tabMeeting`
+            WHERE status = 'Ended' AND end_time IS NOT NULL
+            GROUP BY DATE(end_time), COALESCE(NULLIF({field}, ''), %(instant)s)
+        """, {"instant": INSTANT}, as_dict=True)
+
+        rsvps = frappe.db.sql(f"""
+            SELECT DATE(p.modified) AS date, COALESCE(NULLIF(m.{field}, ''), %(instant)s) AS dimension_value,
+                SUM(p.invitation_status = 'Accepted') AS invitations_accepted,
+                SUM(p.invitation_status = 'Rejected') AS invitations_rejected
+            FROM (
+                SELECT parent AS meeting, user, invitation_status, modified FROM `tabMeeting Participant`
+                WHERE parenttype = 'Meeting' AND invitation_status IN ('Accepted', 'Rejected')
+                UNION ALL
+                SELECT meeting, user, invitation_status, modified FROM `tabMeeting Attendee`
+                WHERE invitation_status IN ('Accepted', 'Rejected')
+            ) p
+            INNER JOIN `tabMeeting` m ON m.name = p.meeting
+            -- The host's own row is created as Accepted and is not an RSVP
+            WHERE p.user != m.host
+            GROUP BY DATE(p.modified), COALESCE(NULLIF(m.{field}, ''), %(instant)s)
+        """, {"instant": INSTANT}, as_dict=True)
+
+        buckets = {}
+        for row in ended + rsvps:
+            bucket = buckets.setdefault((row.date, row.dimension_value), {c: 0 for c in COUNTERS})
+            for c in COUNTERS:
+                bucket[c] += row.get(c) or 0
+
+        now = frappe.utils.now()
+        values = [
+            (_row_name(date, dimension, value), now, now, "Administrator", "Administrator", date, dimension, value,
+                *[bucket[c] for c in COUNTERS])
+            for (date, value), bucket in buckets.items()
+        ]
+        frappe.db.bulk_insert(ROLLUP,
+            fields=["name", "creation", "modified", "owner", "modified_by", "date", "dimension", "dimension_value",
+                *COUNTERS],
+            values=values
+        )
+
+    frappe.db.commit()
+
+
+def _totals(days, *fields):
+    return frappe.db.sql(f"""
+        SELECT {", ".join(f"COALESCE(SUM({f}), 0)" for f in fields)}
+        FROM `tabMeeting Usage Rollup`
+        WHERE dimension = 'Reference DocType' AND date >= %s
+    """, (add_days(nowdate(), -days),))[0]
+
+
+@frappe.whitelist()
+def get_average_duration(filters=None):
+    """
+    Number Card: average duration in minutes of meetings ended in the last 30 days.
+    """
+    samples, minutes = _totals(30, "duration_samples", "total_duration_minutes")
+    return {
+        "value": round(minutes / samples, 1) if samples else 0,
+        "fieldtype": "Float",
+        "suffix": _("min")
+    }
+
+
+@frappe.whitelist()
+def get_acceptance_rate(filters=None):
+    """
+    Number Card: share of RSVPs in the last 30 days that were accepted.
+    """
+    accepted, rejected = _totals(30, "invitations_accepted", "invitations_rejected")
+    return {
+        "value": round(100.0 * accepted / (accepted + rejected), 1) if (accepted + rejected) else 0,
+        "fieldtype": "Percent"
+    }
@@ -0,0 +1,247 @@
+import datetime
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, get_time, getdate
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+DEFAULT_DURATION = datetime.timedelta(hours=1)
+MAX_PARTICIPANTS = 200
+MAX_WINDOW_DAYS = 92
+
+
+@frappe.whitelist()
+def find_free_slots(participants, start, end, duration=60, working_hours_start=None, working_hours_end=None, limit=20):
+    """
+    Finds time ranges in [start, end] where all participants are free for at least
+    `duration` minutes, based on their Meetings (recurrences expanded) and Events.
+    Busy intervals of all participants are bulk-fetched in two queries and merged
+    with a sorted sweep.
+    Conflicts name the Meeting or Event only when the caller can read it; the
+    rest of a user's busy time is returned as merged {"start", "end"} blocks.
+    Returns: {
+        "free_slots": [{"start", "end"}],
+        "conflicts": {user: [{"start", "end", "reference_doctype", "reference_name"} or {"start", "end"}]}
+    }
+    """
+    if isinstance(participants, str):
+        participants = json.loads(participants)
+    participants = sorted({p for p in participants or [] if p})
+    if not participants:
+        frappe.throw(_("Please select at least one participant."))
+    if len(participants) > MAX_PARTICIPANTS:
+        frappe.throw(_("At most {0} participants can be checked at once.").format(MAX_PARTICIPANTS))
+
+    window_start, window_end = get_datetime(start), get_datetime(end)
+    if window_end <= window_start:
+        frappe.throw(_("End must be after start."))
+    if (window_end - window_start).days > MAX_WINDOW_DAYS:
+        frappe.throw(_("The search window can be at most {0} days.").format(MAX_WINDOW_DAYS))
+
+    duration = datetime.timedelta(minutes=frappe.utils.cint(duration) or 60)
+    if working_hours_start and working_hours_end and get_time(working_hours_start) == get_time(working_hours_end):
+        frappe.throw(_("Working hours must not start and end at the same time."))
+
+    busy = get_busy_intervals(participants, window_start, window_end)
+    merged = merge_intervals([(b["start"], b["end"]) for intervals in busy.values() for b in intervals])
+
+    free = []
+    for slot_start, slot_end in invert_intervals(merged, window_start, window_end):
+        for part_start, part_end in clip_to_working_hours(slot_start, slot_end, working_hours_start, working_hours_end):
+            if part_end - part_start >= duration:
+                free.append({"start": part_start, "end": part_end})
+        if len(free) >= frappe.utils.cint(limit):
+            break
+
+    return {
+        "free_slots": free[:frappe.utils.cint(limit)],
+        "conflicts": visible_conflicts(busy)
+    }
+
+
+def visible_conflicts(busy):
+    """
+    Hides what the caller may not see: intervals whose Meeting or Event the caller
+    cannot read (e.g. other users' private Events) lose their reference and are
+    merged per user, so neither names nor the individual bookings are disclosed.
+    """
+    readable = {}
+    conflicts = {}
+    for user, intervals in busy.items():
+        shown, hidden = [], []
+        for interval in intervals:
+            key = (interval["reference_doctype"], interval["reference_name"])
+            if key not in readable:
+                readable[key] = bool(frappe.has_permission(key[0], "read", key[1]))
+            if readable[key]:
+                shown.append(interval)
+            else:
+                hidden.append((interval["start"], interval["end"]))
+        shown.extend({"start": start, "end": end} for start, end in merge_intervals(hidden))
+        if shown:
+            conflicts[user] = sorted(shown, key=lambda i: i["start"])
+    return conflicts
+
+
+def get_busy_intervals(users, window_start, window_end):
+    """
+    Returns {user: [interval]} of Meeting occurrences and Events overlapping the window.
+    """
+    busy = {user: [] for user in users}
+    params = {"users": users, "window_start": window_start, "window_end": window_end}
+
+    # Meetings hosted by or (non-rejected) participated in by any of the users
+    meetings = frappe.db.sql("""
+        SELECT m.name, m.start_time AS starts_on, m.end_time AS ends_on, m.event_ref,
+            m.repeat_this_meeting AS is_repeating, m.repeat_on, m.repeat_till,
+            m.monday, m.tuesday, m.wednesday, m.thursday, m.friday, m.saturday, m.sunday,
+            x.user
+        FROM (
+            SELECT name AS meeting, host AS user FROM `tabMeeting` WHERE host IN %(users)s
+            UNION
+            SELECT parent, user FROM `tabMeeting Participant`
+            WHERE parenttype = 'Meeting' AND user IN %(users)s AND invitation_status != 'Rejected'
+            UNION
+            SELECT meeting, user FROM `tabMeeting Attendee`
+            WHERE user IN %(users)s AND invitation_status != 'Rejected'
+        ) x
+        INNER JOIN `tabMeeting` m ON m.name = x.meeting
+        WHERE m.start_time < %(window_end)s
+            AND (
+                (m.repeat_this_meeting = 1 AND m.status != 'Ended'
+                    AND (m.repeat_till IS NULL OR m.repeat_till >= DATE(%(window_start)s)))
+                OR (m.repeat_this_meeting = 0
+                    AND COALESCE(m.end_time, m.start_time + INTERVAL 1 HOUR) > %(window_start)s)
+            )
+    """, params, as_dict=True)
+
+    for row in meetings:
+        for occ_start, occ_end in expand_occurrences(row, window_start, window_end):
+            busy[row.user].append(_interval(occ_start, occ_end, "Meeting", row.name))
+
+    # Events owned by or shared with the users, excluding Events mirrored from the Meetings above
+    synced_events = {row.event_ref for row in meetings if row.event_ref}
+    events = frappe.db.sql("""
+        SELECT e.name, e.starts_on, e.ends_on, e.all_day,
+            e.repeat_this_event AS is_repeating, e.repeat_on, e.repeat_till,
+            e.monday, e.tuesday, e.wednesday, e.thursday, e.friday, e.saturday, e.sunday,
+            x.user
+        FROM (
+            SELECT name AS event, owner AS user FROM `tabEvent` WHERE owner IN %(users)s
+            UNION
+            SELECT parent, reference_docname FROM `tabEvent Participants`
+            WHERE parenttype = 'Event' AND reference_doctype = 'User' AND reference_docname IN %(users)s
+        ) x
+        INNER JOIN `tabEvent` e ON e.name = x.event
+        WHERE e.status NOT IN ('Cancelled', 'Closed')
+            AND e.starts_on < %(window_end)s
+            AND (
+                (e.repeat_this_event = 1
+                    AND (e.repeat_till IS NULL OR e.repeat_till >= DATE(%(window_start)s)))
+                OR (e.repeat_this_event = 0
+                    AND COALESCE(e.ends_on, e.starts_on + INTERVAL 1 HOUR) > %(window_start)s)
+            )
+    """, params, as_dict=True)
+
+    for row in events:
+        if row.name in synced_events:
+            continue
+        if row.all_day:
+            row.starts_on = datetime.datetime.combine(getdate(row.starts_on), datetime.time.min)
+            row.ends_on = datetime.datetime.combine(getdate(row.ends_on or row.starts_on), datetime.time.max)
+        for occ_start, occ_end in expand_occurrences(row, window_start, window_end):
+            busy[row.user].append(_interval(occ_start, occ_end, "Event", row.name))
+
+    for intervals in busy.values():
+        intervals.sort(key=lambda i: i["start"])
+    return busy
+
+
+def _interval(start, end, doctype, name):
+    return {"start": start, "end": end, "reference_doctype": doctype, "reference_name": name}
+
+
+def expand_occurrences(row, window_start, window_end):
+    """
+    Yields (start, end) of every occurrence of a Meeting or Event row that overlaps the window.
+    Supports the Daily/Weekly/Monthly/Yearly rules used by both doctypes.
+    """
+    starts_on = get_datetime(row.starts_on)
+    length = (get_datetime(row.ends_on) - starts_on) if row.ends_on else DEFAULT_DURATION
+    if length <= datetime.timedelta(0):
+        length = DEFAULT_DURATION
+
+    if not row.is_repeating or not row.repeat_on:
+        if starts_on < window_end and starts_on + length > window_start:
+            yield starts_on, starts_on + length
+        return
+
+    weekdays = {i for i, day in enumerate(WEEKDAYS) if row.get(day)} or {starts_on.weekday()}
+    last_day = getdate(window_end)
+    if row.repeat_till:
+        last_day = min(last_day, getdate(row.repeat_till))
+
+    # Only walk the days that can produce an occurrence overlapping the window
+    day = max(starts_on.date(), (window_start - length).date())
+    while day <= last_day:
+        if (
+            row.repeat_on == "Daily"
+            or (row.repeat_on == "Weekly" and day.weekday() in weekdays)
+            or (row.repeat_on == "Monthly" and day.day == starts_on.day)
+            or (row.repeat_on == "Yearly" and (day.month, day.day) == (starts_on.month, starts_on.day))
+        ):
+            occ_start = datetime.datetime.combine(day, starts_on.time())
+            if occ_start < window_end and occ_start + length > window_start:
+                yield occ_start, occ_start + length
+        day += datetime.timedelta(days=1)
+
+
+def merge_intervals(intervals):
+    """
+    Sorted sweep: unions overlapping or touching (start, end) pairs.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def invert_intervals(merged, window_start, window_end):
+    """
+    Yields the gaps between merged busy intervals inside the window.
+    """
+    cursor = window_start
+    for start, end in merged:
+        if start > cursor:
+            yield cursor, min(start, window_end)
+        cursor = max(cursor, end)
+        if cursor >= window_end:
+            return
+    if cursor < window_end:
+        yield cursor, window_end
+
+
+def clip_to_working_hours(start, end, hours_start=None, hours_end=None):
+    """
+    Splits a free range into the parts that fall within daily working hours.
+    Working hours that end before they start (e.g. 22:00-06:00) run past midnight.
+    """
+    if not hours_start or not hours_end:
+        yield start, end
+        return
+
+    hours_start, hours_end = get_time(hours_start), get_time(hours_end)
+    overnight = datetime.timedelta(days=1 if hours_end < hours_start else 0)
+    # An overnight shift that started the day before can still cover the start
+    day = start.date() - overnight
+    while day <= end.date():
+        part_start = max(start, datetime.datetime.combine(day, hours_start))
+        part_end = min(end, datetime.datetime.combine(day + overnight, hours_end))
+        if part_end > part_start:
+            yield part_start, part_end
+        day += datetime.timedelta(days=1)
@@ -0,0 +1,45 @@
+import frappe
+
+# Desk client configuration, delivered in boot data so the bootstrap script
+# (public/js/meeting_bootstrap.js) knows which forms get meeting actions without
+# any runtime call:
+#
+#   frappe.boot.erpnext_meet = {
+#       "client": "/assets/erpnext_meet/js/meeting_client.js",
+#       "doctypes": {"Meeting": ["join", "participants", "timeline", "invite_delivery"], "<DocType>": ["start_meeting"]}
+#   }
+#
+# The configuration is the same for every user and is cached until Meeting Settings
+# is saved.
+
+CACHE_KEY = "erpnext_meet:desk_config"
+CLIENT_PATH = "/assets/erpnext_meet/js/meeting_client.js"
+# "join" covers the RSVP, Join Meeting and Guest Invite Link buttons; "invite_delivery"
+# is the host's invite delivery summary
+MEETING_ACTIONS = ["join", "participants", "timeline", "invite_delivery"]
+
+
+def boot_session(bootinfo):
+    if frappe.session.user == "Guest":
+        return
+    bootinfo.erpnext_meet = get_desk_config()
+
+
+def get_desk_config():
+    return frappe.cache().get_value(CACHE_KEY, generator=_build_desk_config)
+
+
+def _build_desk_config():
+    settings = frappe.get_cached_doc("Meeting Settings")
+    doctypes = {"Meeting": list(MEETING_ACTIONS)}
+    for doctype in (settings.get("meeting_action_doctypes") or "").splitlines():
+        doctype = doctype.strip()
+        if doctype and doctype != "Meeting" and frappe.db.exists("DocType", doctype):
+            doctypes[doctype] = ["start_meeting"]
+    return {"client": CLIENT_PATH, "doctypes": doctypes}
+
+
+def clear_desk_config():
+    frappe.cache().delete_value(CACHE_KEY)
+    # Boot data is cached per user as well
+    frappe.cache().delete_key("bootinfo")
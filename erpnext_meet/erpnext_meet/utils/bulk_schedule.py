@@ -0,0 +1,321 @@
+import json
+
+import frappe
+from frappe import _
+from frappe.model.naming import set_new_name
+from frappe.utils import cint, get_datetime, getdate
+from frappe.utils.csvutils import read_csv_content
+from frappe.utils.html_utils import sanitize_html
+
+from erpnext_meet.erpnext_meet.utils import active_rooms, metrics, participants, reminders, search, tracing
+from erpnext_meet.erpnext_meet.utils.session_id import new_session_id
+
+# Bulk scheduling: a whole batch of meetings is validated up front (nothing is
+# written if any row is invalid), then Meetings, their participants, Events and
+# Event participants are written with one bulk INSERT per table, in the caller's
+# transaction. The Meeting controller (sync_with_event, invite jobs) is bypassed
+# and reproduced here set-wise; Event shares and invites run afterwards in one
+# background job per POST_INSERT_CHUNK meetings.
+#
+# Each meeting is a dict:
+#   reference_doctype, reference_docname   optional, the document the meeting is about
+#   start_time (required), end_time
+#   host                                   defaults to the current user; others only for System Manager
+#   participants                           list of users, or a string separated by "," or ";"
+#   meeting_details, large_meeting
+#   repeat_on, repeat_till, monday ... sunday
+
+MAX_MEETINGS = 2000
+POST_INSERT_CHUNK = 200
+MAX_ERRORS_SHOWN = 50
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+REPEAT_OPTIONS = ("Daily", "Weekly", "Monthly", "Yearly")
+
+MEETING_FIELDS = [
+    "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+    "status", "host", "start_time", "end_time", "session_id", "reference_doctype", "reference_docname",
+    "event_ref", "large_meeting", "meeting_details", "next_occurrence", "repeat_this_meeting", "repeat_on",
+    "repeat_till",
+    *WEEKDAYS,
+]
+EVENT_FIELDS = [
+    "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx", "naming_series",
+    "subject", "starts_on", "ends_on", "event_category", "event_type", "status", "description",
+    "repeat_this_event", "repeat_on", "repeat_till",
+    *WEEKDAYS,
+]
+
+
+@frappe.whitelist()
+@metrics.timed("schedule_meetings")
+@tracing.traced("schedule_meetings")
+def schedule_meetings(meetings):
+    """
+    Schedules a batch of meetings in one transaction.
+    meetings: list (or JSON list) of meeting dicts, see the module comment.
+    Returns {"meetings": [names], "jobs": number of post-insert jobs queued}.
+    """
+    if isinstance(meetings, str):
+        meetings = json.loads(meetings)
+    frappe.has_permission("Meeting", "create", throw=True)
+    if not meetings:
+        return {"meetings": [], "jobs": 0}
+    if len(meetings) > MAX_MEETINGS:
+        frappe.throw(_("Cannot schedule more than {0} meetings at once.").format(MAX_MEETINGS))
+
+    rows = _validate(meetings)
+    names = _insert(rows)
+    jobs = _enqueue_post_insert(names)
+    return {"meetings": names, "jobs": jobs}
+
+
+@frappe.whitelist()
+def schedule_meetings_from_file(file_url):
+    """
+    Schedules the meetings in an uploaded CSV file. The header row holds the field
+    names of the meeting dicts; `participants` is separated by "," or ";".
+    """
+    file_doc = frappe.get_doc("File", {"file_url": file_url})
+    file_doc.check_permission("read")
+    rows = read_csv_content(file_doc.get_content())
+    if len(rows) < 2:
+        frappe.throw(_("The file has no meetings."))
+
+    header = [frappe.scrub(h or "") for h in rows[0]]
+    meetings = [
+        {field: value for field, value in zip(header, row, strict=False) if field and value not in (None, "")}
+        for row in rows[1:] if any(row)
+    ]
+    return schedule_meetings(meetings)
+
+
+def _split_users(value):
+    """
+    Returns the users in a list or a "," / ";" separated string, or None if
+    `value` is neither a string nor a list of strings.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+    if not isinstance(value, list | tuple) or not all(isinstance(u, str) for u in value if u):
+        return None
+    return [u.strip() for u in value if u and u.strip()]
+
+
+def _validate(meetings):
+    """
+    Checks every row and throws once with all problems, so a batch is either
+    scheduled completely or not at all. Returns the normalized rows.
+    """
+    errors = []
+    rows = []
+    is_system_manager = "System Manager" in frappe.get_roles()
+
+    for i, meeting in enumerate(meetings, 1):
+        row_errors = []
+        row = frappe._dict(meeting)
+        row.host = row.host or frappe.session.user
+        row.participants = _split_users(row.participants)
+        row.large_meeting = cint(row.large_meeting)
+
+        if not isinstance(row.host, str):
+            row_errors.append(_("host must be a user"))
+            row.host = frappe.session.user
+        if row.participants is None:
+            row_errors.append(_("participants must be a list of users or a string separated by \",\" or \";\""))
+            row.participants = []
+        if row.meeting_details and not isinstance(row.meeting_details, str):
+            row_errors.append(_("meeting_details must be text"))
+            row.meeting_details = None
+        # Bulk INSERT skips the sanitizing Document.save applies to Text Editor fields
+        row.meeting_details = sanitize_html(row.meeting_details) if row.meeting_details else None
+
+        if row.host != frappe.session.user and not is_system_manager:
+            row_errors.append(_("only a System Manager can schedule meetings for another host"))
+
+        if bool(row.reference_doctype) != bool(row.reference_docname):
+            row_errors.append(_("reference_doctype and reference_docname must be given together"))
+
+        try:
+            row.start_time = get_datetime(row.start_time) if row.start_time else None
+            row.end_time = get_datetime(row.end_time) if row.end_time else None
+        except Exception:
+            row_errors.append(_("start_time or end_time is not a valid date and time"))
+            row.start_time = row.end_time = None
+        if not row.start_time and not row_errors:
+            row_errors.append(_("start_time is required"))
+        elif row.start_time and row.end_time and row.end_time < row.start_time:
+            row_errors.append(_("end_time is before start_time"))
+
+        row.repeat_this_meeting = 1 if row.repeat_on else 0
+        if row.repeat_on and row.repeat_on not in REPEAT_OPTIONS:
+            row_errors.append(_("repeat_on must be one of {0}").format(", ".join(REPEAT_OPTIONS)))
+        try:
+            row.repeat_till = getdate(row.repeat_till) if row.repeat_till else None
+        except Exception:
+            row_errors.append(_("repeat_till is not a valid date"))
+            row.repeat_till = None
+        if row.repeat_till and row.start_time and row.repeat_till < row.start_time.date():
+            row_errors.append(_("repeat_till is before start_time"))
+        for day in WEEKDAYS:
+            row[day] = cint(row.get(day)) if row.repeat_on == "Weekly" else 0
+
+        errors.extend(_("Row {0}: {1}").format(i, e) for e in row_errors)
+        row.idx = i
+        rows.append(row)
+
+    # Set-based checks: one query per referenced doctype and one for all users
+    by_doctype = {}
+    for row in rows:
+        if row.reference_doctype and row.reference_docname:
+            by_doctype.setdefault(row.reference_doctype, set()).add(row.reference_docname)
+    existing = {}
+    for doctype, docnames in by_doctype.items():
+        if not frappe.db.exists("DocType", doctype):
+            existing[doctype] = set()
+            continue
+        # get_list, so documents the scheduler cannot read count as missing
+        existing[doctype] = set(frappe.get_list(doctype,
+            filters={"name": ["in", list(docnames)]}, pluck="name", limit_page_length=0))
+
+    users = {u for row in rows for u in [*row.participants, row.host]}
+    enabled_users = set(frappe.get_all("User",
+        filters={"name": ["in", list(users)], "enabled": 1}, pluck="name")) if users else set()
+
+    seen = set()
+    for row in rows:
+        if row.reference_doctype and row.reference_docname \
+                and row.reference_docname not in existing.get(row.reference_doctype, ()):
+            errors.append(_("Row {0}: {1} {2} does not exist or is not permitted").format(
+                row.idx, row.reference_doctype, row.reference_docname))
+        for user in [row.host, *row.participants]:
+            if user not in enabled_users:
+                errors.append(_("Row {0}: user {1} does not exist or is disabled").format(row.idx, user))
+        key = (row.reference_doctype, row.reference_docname, row.start_time)
+        if row.reference_docname and key in seen:
+            errors.append(_("Row {0}: duplicate of an earlier row").format(row.idx))
+        seen.add(key)
+
+    if errors:
+        shown = errors[:MAX_ERRORS_SHOWN]
+        if len(errors) > MAX_ERRORS_SHOWN:
+            shown.append(_("... and {0} more").format(len(errors) - MAX_ERRORS_SHOWN))
+        frappe.throw("<br>".join(shown), title=_("No meetings were scheduled"))
+    return rows
+
+
+def _insert(rows):
+    """
+    Writes the validated rows with one bulk INSERT per table.
+    Mirrors what Meeting.validate and Meeting.sync_with_event would store.
+    """
+    import datetime
+
+    now = frappe.utils.now()
+    user = frappe.session.user
+    series_field = frappe.get_meta("Event").get_field("naming_series")
+    event_series = ((series_field and series_field.options) or "EV.#####").split("\n")[0]
+    site_url = frappe.utils.get_url()
+
+    meeting_values, event_values = [], []
+    participant_values, attendee_values, event_participant_values = [], [], []
+    names = []
+
+    for row in rows:
+        meeting = frappe.new_doc("Meeting")
+        set_new_name(meeting)
+        event = frappe.new_doc("Event")
+        event.naming_series = event_series
+        set_new_name(event)
+        names.append(meeting.name)
+
+        ends_on = row.end_time or row.start_time + datetime.timedelta(hours=1)
+        repeat = [row.repeat_this_meeting, row.repeat_on or "", row.repeat_till] + [row[day] for day in WEEKDAYS]
+
+        meeting_values.append((
+            meeting.name, now, now, user, user, 0, 0,
+            "Active", row.host, row.start_time, row.end_time, new_session_id(),
+            row.reference_doctype, row.reference_docname, event.name, row.large_meeting, row.meeting_details,
+            reminders.get_next_occurrence(row), *repeat
+        ))
+
+        description = f"Join link: {site_url}/app/meeting/{meeting.name}"
+        if row.meeting_details:
+            description += f"<br><br>{row.meeting_details}"
+        event_values.append((
+            event.name, now, now, user, user, 0, 0, event_series,
+            f"Video Meeting: {row.reference_docname or 'Meeting'}", row.start_time, ends_on,
+            "Meeting", "Private", "Open", description,
+            *repeat
+        ))
+
+        # The host is an accepted participant, as in create_room
+        invited = [(row.host, "Accepted")] + [(u, "Pending") for u in dict.fromkeys(row.participants) if u != row.host]
+        for idx, (participant, status) in enumerate(invited, 1):
+            if row.large_meeting:
+                attendee_values.append((frappe.generate_hash(length=10), now, now, user, user,
+                    meeting.name, participant, status))
+            else:
+                participant_values.append((frappe.generate_hash(length=10), now, now, user, user,
+                    meeting.name, "Meeting", "participants", idx, participant, status))
+            event_participant_values.append((frappe.generate_hash(length=10), now, now, user, user,
+                event.name, "Event", "event_participants", idx, "User", participant))
+
+    frappe.db.bulk_insert("Event", fields=EVENT_FIELDS, values=event_values)
+    frappe.db.bulk_insert("Event Participants",
+        fields=["name", "creation", "modified", "owner", "modified_by", "parent", "parenttype", "parentfield",
+            "idx", "reference_doctype", "reference_docname"],
+        values=event_participant_values)
+    frappe.db.bulk_insert("Meeting", fields=MEETING_FIELDS, values=meeting_values)
+    if participant_values:
+        frappe.db.bulk_insert("Meeting Participant",
+            fields=["name", "creation", "modified", "owner", "modified_by", "parent", "parenttype", "parentfield",
+                "idx", "user", "invitation_status"],
+            values=participant_values)
+    if attendee_values:
+        frappe.db.bulk_insert(participants.ATTENDEE,
+            fields=["name", "creation", "modified", "owner", "modified_by", "meeting", "user", "invitation_status"],
+            values=attendee_values)
+
+    metrics.track_status_change(None, "Active", count=len(names))
+    frappe.db.after_commit.add(lambda: active_rooms.invalidate(rows))
+    return names
+
+
+def _enqueue_post_insert(names):
+    chunks = [names[i:i + POST_INSERT_CHUNK] for i in range(0, len(names), POST_INSERT_CHUNK)]
+    for chunk in chunks:
+        tracing.enqueue(
+            "erpnext_meet.erpnext_meet.utils.bulk_schedule.run_post_insert",
+            queue="long",
+            meeting_names=chunk,
+            enqueue_after_commit=True
+        )
+    return len(chunks)
+
+
+@tracing.traced("bulk_schedule.run_post_insert")
+def run_post_insert(meeting_names):
+    """
+    Background job: Event shares and invites for a chunk of bulk scheduled
+    meetings, committing after each meeting.
+    """
+    from erpnext_meet.erpnext_meet import api
+
+    search.update_index(meeting_names)
+    frappe.db.commit()
+    meetings = frappe.get_all("Meeting",
+        filters={"name": ["in", meeting_names]},
+        fields=["name", "host", "event_ref", "large_meeting"])
+    for meeting in meetings:
+        try:
+            users = participants.get_users(meeting.name, exclude_rejected=True, large=meeting.large_meeting)
+            if meeting.event_ref:
+                api.sync_event_shares(meeting.event_ref, list(dict.fromkeys([meeting.host, *users])))
+            if any(u != meeting.host for u in users):
+                api.send_meeting_invites(meeting.name)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(title="Meeting Bulk Schedule Error", message=frappe.get_traceback())
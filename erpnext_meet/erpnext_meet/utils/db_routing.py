@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+import frappe
+
+
+def _can_use_replica():
+    if not frappe.conf.get("read_from_replica") or frappe.flags.in_test:
+        return False
+    # Already on the replica (nested call)
+    if getattr(frappe.local, "primary_db", None) is not None:
+        return False
+    # Reads after a write in the same transaction must see that write
+    if getattr(frappe.db, "transaction_writes", 0):
+        return False
+    return True
+
+
+@contextmanager
+def read_replica():
+    """
+    Runs the enclosed read-only queries on the read replica when the site has
+    `read_from_replica` configured, the same way frappe.read_only() does for
+    whole functions. Stays on the primary when no replica is configured or when
+    the current transaction has already written. Do not write inside this block.
+    """
+    if not _can_use_replica():
+        yield
+        return
+
+    switched = frappe.connect_replica()
+    try:
+        yield
+    finally:
+        if switched:
+            frappe.local.db.close()
+            frappe.local.db = frappe.local.primary_db
+            # Reset so the next block can connect again
+            del frappe.local.primary_db
+            del frappe.local.replica_db
+
+
+def confirm_on_primary(doctype, candidates, filters):
+    """
+    Staleness guard for replica reads that lead to writes.
+    Re-applies `filters` (list form) on the primary, restricted by primary key to the
+    rows the replica returned, and keeps only the candidates that still match.
+    """
+    if not candidates:
+        return candidates
+
+    still_matching = set(frappe.get_all(doctype,
+        filters=[*filters, [doctype, "name", "in", [c.name for c in candidates]]],
+        pluck="name"
+    ))
+    return [c for c in candidates if c.name in still_matching]
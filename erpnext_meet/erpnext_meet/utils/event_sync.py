@@ -0,0 +1,333 @@
+import datetime
+import json
+
+import frappe
+from frappe.utils import get_datetime, getdate, now_datetime
+
+from erpnext_meet.erpnext_meet.utils import (
+    active_rooms,
+    analytics,
+    guest_tokens,
+    metrics,
+    participants,
+    reminders,
+    search,
+    tracing,
+)
+
+# Incremental Event <-> Meeting reconciler.
+#
+# Each source (Meeting, Event, Deleted Document) is read in (modified, name) order
+# from a stored watermark, using the standard `modified` index, so every run only
+# touches rows changed since the previous one. Both sides of a pair are compared
+# and only differing fields are written, with update_modified=False so the
+# reconciler's own writes do not show up as new changes.
+#
+# Conflict rules:
+#   - times, recurrence and participants: the side modified last wins (a tie goes to the Meeting)
+#   - status: an Ended Meeting marks its Event Completed; a Cancelled Event ends its Meeting
+#   - Ended meetings keep their times (end_time is the actual end, not the scheduled one)
+#   - a deleted Event is unlinked from its Meeting; a deleted Meeting cancels its open Event
+
+WATERMARK_FIELD = "event_sync_watermarks"
+BATCH_SIZE = 500
+MAX_BATCHES = 20
+LOCK_KEY = "erpnext_meet:event_sync"
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# (Meeting field, Event field)
+SCHEDULE_FIELDS = [
+    ("start_time", "starts_on"),
+    ("end_time", "ends_on"),
+    ("repeat_this_meeting", "repeat_this_event"),
+    ("repeat_on", "repeat_on"),
+    ("repeat_till", "repeat_till"),
+] + [(day, day) for day in WEEKDAYS]
+
+PAIR_COLUMNS = """
+    m.name AS meeting, m.modified AS meeting_modified, m.status, m.host, m.large_meeting, m.session_id,
+    m.reference_doctype, m.reference_docname, m.start_time, m.end_time, m.repeat_this_meeting, m.repeat_on AS m_repeat_on,
+    m.repeat_till AS m_repeat_till, {m_weekdays},
+    e.name AS event, e.modified AS event_modified, e.status AS event_status, e.starts_on, e.ends_on,
+    e.repeat_this_event, e.repeat_on AS e_repeat_on, e.repeat_till AS e_repeat_till, {e_weekdays}
+""".format(
+    m_weekdays=", ".join(f"m.{day} AS m_{day}" for day in WEEKDAYS),
+    e_weekdays=", ".join(f"e.{day} AS e_{day}" for day in WEEKDAYS),
+)
+
+
+def reconcile():
+    """
+    Scheduled task: reconciles everything changed since the last run, in bounded batches.
+    """
+    lock = frappe.cache().lock(frappe.cache().make_key(LOCK_KEY), timeout=600)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        watermarks = get_watermarks()
+        for source, process in (("Meeting", _process_meetings), ("Event", _process_events),
+                ("Deleted Document", _process_deletions)):
+            for _ in range(MAX_BATCHES):
+                rows = _changed_rows(source, watermarks[source])
+                if rows:
+                    process(rows)
+                    watermarks[source] = [str(rows[-1].modified), rows[-1].name]
+                    _save_watermarks(watermarks)
+                    frappe.db.commit()
+                if len(rows) < BATCH_SIZE:
+                    break
+    finally:
+        lock.release()
+
+
+def get_watermarks():
+    stored = frappe.db.get_single_value("Meeting Settings", WATERMARK_FIELD)
+    watermarks = json.loads(stored) if stored else {}
+    # First run: start from now instead of walking the whole history
+    now = str(now_datetime())
+    for source in ("Meeting", "Event", "Deleted Document"):
+        watermarks.setdefault(source, [now, ""])
+    return watermarks
+
+
+def _save_watermarks(watermarks):
+    frappe.db.set_single_value("Meeting Settings", WATERMARK_FIELD, json.dumps(watermarks))
+
+
+def _changed_rows(source, watermark):
+    """
+    Keyset page of rows after `watermark` in (modified, name) order. The range
+    condition on `modified` alone lets MariaDB use the modified index.
+    """
+    values = {"modified": get_datetime(watermark[0]), "name": watermark[1], "limit": BATCH_SIZE}
+    after = """{t}.modified >= %(modified)s AND ({t}.modified > %(modified)s OR {t}.name > %(name)s)"""
+
+    if source == "Meeting":
+        return frappe.db.sql(f"""
+            SELECT m.name, m.modified, {PAIR_COLUMNS}
+            FROM `tabMeeting` m
+            LEFT JOIN `tabEvent` e ON e.name = m.event_ref
+            WHERE {after.format(t="m")}
+            ORDER BY m.modified, m.name
+            LIMIT %(limit)s
+        """, values, as_dict=True)
+
+    if source == "Event":
+        return frappe.db.sql(f"""
+            SELECT e.name, e.modified, {PAIR_COLUMNS}
+            FROM `tabEvent` e
+            LEFT JOIN `tabMeeting` m ON m.event_ref = e.name
+            WHERE {after.format(t="e")}
+            ORDER BY e.modified, e.name
+            LIMIT %(limit)s
+        """, values, as_dict=True)
+
+    return frappe.db.sql(f"""
+        SELECT d.name, d.modified, d.deleted_doctype, d.deleted_name, d.data
+        FROM `tabDeleted Document` d
+        WHERE {after.format(t="d")}
+        ORDER BY d.modified, d.name
+        LIMIT %(limit)s
+    """, values, as_dict=True)
+
+
+def _process_meetings(rows):
+    # Rows without a counterpart still move the watermark forward
+    _reconcile_pairs([row for row in rows if row.event])
+
+
+def _process_events(rows):
+    _reconcile_pairs([row for row in rows if row.meeting])
+
+
+def _reconcile_pairs(pairs):
+    if not pairs:
+        return
+
+    meeting_users = _load_meeting_users(pairs)
+    event_users = _load_event_users([p.event for p in pairs])
+
+    for pair in pairs:
+        try:
+            with tracing.span("event_sync.reconcile_pair", meetings=[pair.meeting]):
+                _reconcile_pair(pair, meeting_users.get(pair.meeting, {}), event_users.get(pair.event, set()))
+        except Exception:
+            frappe.log_error(title="Meeting Event Sync Error", message=frappe.get_traceback())
+
+
+def _reconcile_pair(pair, meeting_users, event_users):
+    """
+    meeting_users: {user: invitation_status}; event_users: set of User participants on the Event.
+    """
+    # Status
+    if pair.status == "Ended" and pair.event_status not in ("Completed", "Cancelled", "Closed"):
+        frappe.db.set_value("Event", pair.event, "status", "Completed", update_modified=False)
+    elif pair.event_status == "Cancelled" and pair.status != "Ended":
+        _end_meeting(pair)
+        return
+
+    if pair.status == "Ended":
+        return
+
+    event_wins = get_datetime(pair.event_modified) > get_datetime(pair.meeting_modified)
+
+    # Times and recurrence
+    meeting_values = _meeting_schedule(pair)
+    event_values = _event_schedule(pair)
+    if event_wins:
+        changes = {m: event_values[e] for m, e in SCHEDULE_FIELDS if meeting_values[m] != event_values[e]}
+        if changes:
+            changes["next_occurrence"] = reminders.get_next_occurrence(
+                {m: event_values[e] for m, e in SCHEDULE_FIELDS})
+            frappe.db.set_value("Meeting", pair.meeting, changes, update_modified=False)
+    else:
+        changes = {e: meeting_values[m] for m, e in SCHEDULE_FIELDS if meeting_values[m] != event_values[e]}
+        if changes:
+            frappe.db.set_value("Event", pair.event, changes, update_modified=False)
+
+    # Participants. The Event lists the host and every participant who has not rejected.
+    # Meeting.sync_with_event does not mirror large meetings, so for them the Meeting
+    # side is the source of truth and its diff is applied here.
+    expected = {u for u, status in meeting_users.items() if status != "Rejected"} | {pair.host}
+    if expected == event_users:
+        return
+
+    if event_wins and not pair.large_meeting:
+        added = sorted(event_users - set(meeting_users))
+        removed = sorted(u for u in expected - event_users if u != pair.host)
+        if added:
+            participants.add_participants(pair.meeting, added, large=pair.large_meeting)
+            tracing.enqueue(
+                "erpnext_meet.erpnext_meet.api.send_meeting_invites",
+                meeting_name=pair.meeting,
+                added_users=added,
+                queue="short",
+                enqueue_after_commit=True
+            )
+        if removed:
+            participants.remove_participants(pair.meeting, removed, large=pair.large_meeting)
+        if added or removed:
+            search.queue_update([pair.meeting])
+        valid_users = sorted(event_users)
+    else:
+        _set_event_users(pair.event, event_users, expected)
+        valid_users = sorted(expected)
+
+    tracing.enqueue(
+        "erpnext_meet.erpnext_meet.api.sync_event_shares",
+        event_name=pair.event,
+        valid_users=valid_users,
+        queue="short",
+        enqueue_after_commit=True
+    )
+
+
+def _meeting_schedule(pair):
+    repeating = bool(pair.repeat_this_meeting)
+    start = get_datetime(pair.start_time) if pair.start_time else None
+    # Same defaults as Meeting.sync_with_event
+    end = get_datetime(pair.end_time) if pair.end_time else (start + datetime.timedelta(hours=1) if start else None)
+    values = {
+        "start_time": start,
+        "end_time": end,
+        "repeat_this_meeting": int(repeating),
+        "repeat_on": (pair.m_repeat_on or None) if repeating else None,
+        "repeat_till": getdate(pair.m_repeat_till) if repeating and pair.m_repeat_till else None,
+    }
+    weekly = repeating and pair.m_repeat_on == "Weekly"
+    values.update({day: int(bool(pair.get(f"m_{day}"))) if weekly else 0 for day in WEEKDAYS})
+    return values
+
+
+def _event_schedule(pair):
+    repeating = bool(pair.repeat_this_event)
+    values = {
+        "starts_on": get_datetime(pair.starts_on) if pair.starts_on else None,
+        "ends_on": get_datetime(pair.ends_on) if pair.ends_on else None,
+        "repeat_this_event": int(repeating),
+        "repeat_on": (pair.e_repeat_on or None) if repeating else None,
+        "repeat_till": getdate(pair.e_repeat_till) if repeating and pair.e_repeat_till else None,
+    }
+    weekly = repeating and pair.e_repeat_on == "Weekly"
+    values.update({day: int(bool(pair.get(f"e_{day}"))) if weekly else 0 for day in WEEKDAYS})
+    return values
+
+
+def _end_meeting(pair):
+    frappe.db.set_value("Meeting", pair.meeting, {"status": "Ended", "end_time": now_datetime()}, update_modified=False)
+    metrics.track_status_change(pair.status, "Ended")
+    guest_tokens.revoke_session(pair.session_id)
+    analytics.record_meeting_end(pair)
+    frappe.db.after_commit.add(lambda: active_rooms.invalidate([pair]))
+    search.queue_update([pair.meeting])
+
+
+def _load_meeting_users(pairs):
+    """
+    {meeting: {user: invitation_status}} for a batch, in two queries.
+    """
+    result = {}
+    small = [p.meeting for p in pairs if not p.large_meeting]
+    large = [p.meeting for p in pairs if p.large_meeting]
+    if small:
+        for row in frappe.get_all("Meeting Participant",
+                filters={"parent": ["in", small], "parenttype": "Meeting"},
+                fields=["parent", "user", "invitation_status"]):
+            result.setdefault(row.parent, {})[row.user] = row.invitation_status
+    if large:
+        for row in frappe.get_all(participants.ATTENDEE,
+                filters={"meeting": ["in", large]},
+                fields=["meeting", "user", "invitation_status"]):
+            result.setdefault(row.meeting, {})[row.user] = row.invitation_status
+    return result
+
+
+def _load_event_users(events):
+    result = {}
+    for row in frappe.get_all("Event Participants",
+            filters={"parent": ["in", events], "parenttype": "Event", "reference_doctype": "User"},
+            fields=["parent", "reference_docname"]):
+        result.setdefault(row.parent, set()).add(row.reference_docname)
+    return result
+
+
+def _set_event_users(event, current, expected):
+    removed = current - expected
+    if removed:
+        frappe.db.delete("Event Participants", {
+            "parent": event, "parenttype": "Event", "reference_doctype": "User",
+            "reference_docname": ["in", list(removed)]
+        })
+
+    added = sorted(expected - current)
+    if added:
+        start_idx = frappe.db.sql("""
+            SELECT COALESCE(MAX(idx), 0) FROM `tabEvent Participants` WHERE parent = %s AND parenttype = 'Event'
+        """, (event,))[0][0]
+        now = frappe.utils.now()
+        frappe.db.bulk_insert("Event Participants",
+            fields=["name", "creation", "modified", "owner", "modified_by", "parent", "parenttype", "parentfield",
+                "idx", "reference_doctype", "reference_docname"],
+            values=[
+                (frappe.generate_hash(length=10), now, now, "Administrator", "Administrator", event, "Event",
+                    "event_participants", start_idx + i + 1, "User", user)
+                for i, user in enumerate(added)
+            ]
+        )
+
+
+def _process_deletions(rows):
+    deleted_events = [r.deleted_name for r in rows if r.deleted_doctype == "Event"]
+    if deleted_events:
+        # Meeting.sync_with_event creates a new Event on the Meeting's next save
+        frappe.db.sql("""
+            UPDATE `tabMeeting` SET event_ref = NULL WHERE event_ref IN %s
+        """, (deleted_events,))
+
+    for row in rows:
+        if row.deleted_doctype != "Meeting":
+            continue
+        event = json.loads(row.data or "{}").get("event_ref")
+        if event and frappe.db.get_value("Event", event, "status") == "Open":
+            frappe.db.set_value("Event", event, "status", "Cancelled", update_modified=False)
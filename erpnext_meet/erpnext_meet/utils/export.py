@@ -0,0 +1,205 @@
+import contextlib
+import csv
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, getdate, now_datetime
+
+from erpnext_meet.erpnext_meet.utils import tracing
+
+# Meeting history export: one row per participant per meeting, streamed from an
+# unbuffered cursor through generators straight into a private file, so memory
+# stays flat no matter how many meetings are exported.
+
+FORMATS = ("CSV", "Excel")
+CHUNK_ROWS = 1000
+
+COLUMNS = [
+    "Meeting", "Status", "Host", "Reference DocType", "Reference Name", "Start Time", "End Time",
+    "Repeats", "Participant", "Role", "Invitation Status",
+]
+
+
+@frappe.whitelist()
+def export_meeting_history(file_format="CSV", from_date=None, to_date=None, status=None, host=None, reference_doctype=None):
+    """
+    Queues a meeting history export for the current user, who is notified with a
+    link to the private file when it is ready.
+    Users without System Manager only export meetings they host.
+    """
+    if file_format not in FORMATS:
+        frappe.throw(_("Format must be one of {0}").format(", ".join(FORMATS)))
+    if not frappe.has_permission("Meeting", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    if "System Manager" not in frappe.get_roles():
+        host = frappe.session.user
+
+    filters = {
+        "from_date": str(getdate(from_date)) if from_date else None,
+        "to_date": str(getdate(to_date)) if to_date else None,
+        "status": status or None,
+        "host": host or None,
+        "reference_doctype": reference_doctype or None,
+    }
+    tracing.enqueue(
+        "erpnext_meet.erpnext_meet.utils.export.build_export",
+        queue="long",
+        timeout=3600,
+        user=frappe.session.user,
+        file_format=file_format,
+        filters=filters,
+        enqueue_after_commit=True
+    )
+    return _("Your export has been queued. You will be notified when it is ready.")
+
+
+@tracing.traced("export.build_export")
+def build_export(user, file_format, filters):
+    """
+    Background job: streams the rows into a private file, registers it as a File and notifies `user`.
+    """
+    filename = "meeting-history-{}.{}".format(
+        now_datetime().strftime("%Y%m%d-%H%M%S"), "csv" if file_format == "CSV" else "xlsx"
+    )
+    path = frappe.get_site_path("private", "files", filename)
+
+    try:
+        writer = _write_csv if file_format == "CSV" else _write_xlsx
+        row_count = writer(path, _rows(_stream(*_build_query(filters))))
+
+        file_doc = frappe.get_doc({
+            "doctype": "File",
+            "file_name": filename,
+            "file_url": f"/private/files/{filename}",
+            "is_private": 1,
+            "file_size": os.path.getsize(path),
+        })
+        # The content is already on disk; only the record is created
+        file_doc.insert(ignore_permissions=True)
+        # Make the File visible only to the requesting user
+        frappe.db.set_value("File", file_doc.name, "owner", user, update_modified=False)
+        frappe.db.commit()
+
+        _notify(user,
+            _("Meeting history export is ready ({0} rows)").format(row_count),
+            f'<a href="{file_doc.file_url}">{filename}</a>'
+        )
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        frappe.log_error(title="Meeting Export Error", message=frappe.get_traceback())
+        _notify(user, _("Meeting history export failed"), _("Please check the Error Log."))
+
+
+def _build_query(filters):
+    """
+    Returns (query, values) with all filters applied inside SQL.
+    Participants come from both storage modes: the child table and Meeting Attendee.
+    """
+    conditions, values = [], {}
+    if filters.get("from_date"):
+        conditions.append("m.start_time >= %(from_date)s")
+        values["from_date"] = get_datetime(filters["from_date"])
+    if filters.get("to_date"):
+        conditions.append("m.start_time < %(to_date)s + INTERVAL 1 DAY")
+        values["to_date"] = getdate(filters["to_date"])
+    for field in ("status", "host", "reference_doctype"):
+        if filters.get(field):
+            conditions.append(f"m.{field} = %({field})s")
+            values[field] = filters[field]
+
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    query = f"""
+        SELECT m.name AS meeting, m.status, m.host, m.reference_doctype, m.reference_docname,
+            m.start_time, m.end_time, IF(m.repeat_this_meeting, m.repeat_on, NULL) AS repeat_on,
+            p.user, p.invitation_status
+        FROM `tabMeeting` m
+        LEFT JOIN (
+            SELECT parent AS meeting, user, invitation_status FROM `tabMeeting Participant`
+            WHERE parenttype = 'Meeting'
+            UNION ALL
+            SELECT meeting, user, invitation_status FROM `tabMeeting Attendee`
+        ) p ON p.meeting = m.name
+        {where}
+        ORDER BY m.start_time, m.name, p.user
+    """
+    return query, values
+
+
+def _stream(query, values):
+    """
+    Yields result rows one by one from an unbuffered (server-side) cursor where the
+    framework supports it. No other query may run on the connection until it is exhausted.
+    """
+    unbuffered = getattr(frappe.db, "unbuffered_cursor", None)
+    with (unbuffered() if unbuffered else contextlib.nullcontext()):
+        yield from frappe.db.sql(query, values, as_dict=True, as_iterator=True)
+
+
+def _rows(records):
+    for record in records:
+        yield [
+            record.meeting,
+            record.status,
+            record.host,
+            record.reference_doctype,
+            record.reference_docname,
+            record.start_time,
+            record.end_time,
+            record.repeat_on,
+            record.user,
+            ("Host" if record.user == record.host else "Participant") if record.user else None,
+            record.invitation_status,
+        ]
+
+
+def _chunks(rows, size=CHUNK_ROWS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_csv(path, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([_(label) for label in COLUMNS])
+        for chunk in _chunks(rows):
+            writer.writerows(chunk)
+            f.flush()
+            count += len(chunk)
+    return count
+
+
+def _write_xlsx(path, rows):
+    from openpyxl import Workbook
+
+    # write_only keeps only the current row in memory and spools the sheet to disk
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(_("Meeting History"))
+    sheet.append([_(label) for label in COLUMNS])
+    count = 0
+    for chunk in _chunks(rows):
+        for row in chunk:
+            sheet.append(row)
+        count += len(chunk)
+    workbook.save(path)
+    return count
+
+
+def _notify(user, subject, content):
+    doc = frappe.new_doc("Notification Log")
+    doc.subject = subject
+    doc.email_content = content
+    doc.for_user = user
+    doc.type = "Alert"
+    doc.insert(ignore_permissions=True)
+    frappe.db.commit()
+    frappe.publish_realtime("msgprint", {"message": f"{subject}<br>{content}", "title": _("Meeting Export")}, user=user)
@@ -0,0 +1,112 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+import frappe
+from frappe import _
+from frappe.utils.password import get_encryption_key
+
+# Guest invite tokens are stateless: "<payload>.<signature>", both base64url.
+# Verification needs only the site encryption key and one Redis round trip
+# for the revocation check, so guest joins never touch the database.
+REVOKED_TOKEN_KEY = "erpnext_meet:guest_invite:revoked:{0}"
+REVOKED_SESSION_KEY = "erpnext_meet:guest_invite:revoked_session:{0}"
+ROLES = ("participant", "moderator")
+DEFAULT_VALIDITY_HOURS = 24
+MAX_VALIDITY_HOURS = 30 * 24
+
+
+class InvalidGuestToken(frappe.PermissionError):
+    pass
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload):
+    key = hashlib.sha256(f"erpnext_meet.guest_invite:{get_encryption_key()}".encode()).digest()
+    return hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest()
+
+
+def issue(session_id, display_name, valid_hours=DEFAULT_VALIDITY_HOURS, role="participant"):
+    """
+    Returns a signed guest token for the meeting with `session_id`.
+    """
+    if role not in ROLES:
+        frappe.throw(_("Invalid guest role"))
+    if not 0 < float(valid_hours) <= MAX_VALIDITY_HOURS:
+        frappe.throw(_("Invite validity must be between 0 and {0} hours").format(MAX_VALIDITY_HOURS))
+
+    payload = _b64encode(json.dumps({
+        "sid": session_id,
+        "name": display_name,
+        "role": role,
+        "exp": int(time.time() + float(valid_hours) * 3600),
+        "jti": uuid.uuid4().hex[:12],
+    }, separators=(",", ":")).encode())
+    return f"{payload}.{_b64encode(_sign(payload))}"
+
+
+def decode(token):
+    """
+    Returns the claims of a correctly signed token (expired or not), else None.
+    """
+    try:
+        payload, signature = token.split(".", 1)
+        if not hmac.compare_digest(_b64decode(signature), _sign(payload)):
+            return None
+        return json.loads(_b64decode(payload))
+    except Exception:
+        return None
+
+
+def verify(token, session_id=None):
+    """
+    Verifies signature, expiry and revocation of a guest token without a DB query.
+    Returns the claims dict or raises InvalidGuestToken.
+    """
+    claims = decode(token)
+    if not claims:
+        raise InvalidGuestToken(_("Invalid invite link."))
+    if claims["exp"] < time.time():
+        raise InvalidGuestToken(_("This invite link has expired."))
+    if session_id and claims["sid"] != session_id:
+        raise InvalidGuestToken(_("This invite link is for a different meeting."))
+
+    pipe = frappe.cache().pipeline()
+    pipe.exists(frappe.cache().make_key(REVOKED_TOKEN_KEY.format(claims["jti"])))
+    pipe.exists(frappe.cache().make_key(REVOKED_SESSION_KEY.format(claims["sid"])))
+    if any(pipe.execute()):
+        raise InvalidGuestToken(_("This invite link has been revoked."))
+
+    return claims
+
+
+def revoke(claims):
+    """
+    Revokes a single token given its decoded claims. The revocation entry expires
+    with the token itself, so the list only ever holds tokens that could still be used.
+    """
+    ttl = int(claims["exp"] - time.time())
+    if ttl > 0:
+        pipe = frappe.cache().pipeline()
+        pipe.set(frappe.cache().make_key(REVOKED_TOKEN_KEY.format(claims["jti"])), 1, ex=ttl)
+        pipe.execute()
+
+
+def revoke_session(session_id):
+    """
+    Revokes every guest token of a meeting, e.g. when it ends.
+    Kept for the longest possible token lifetime.
+    """
+    pipe = frappe.cache().pipeline()
+    pipe.set(frappe.cache().make_key(REVOKED_SESSION_KEY.format(session_id)), 1, ex=MAX_VALIDITY_HOURS * 3600)
+    pipe.execute()
@@ -0,0 +1,204 @@
+import datetime
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+from erpnext_meet.erpnext_meet.utils import metrics, tracing
+from erpnext_meet.erpnext_meet.utils.lease import Lease
+
+# Per-recipient invite delivery. send_meeting_invites records one Meeting Invite
+# Delivery row per recipient with two bitmasks over the invite steps:
+#
+#   delivered   steps that succeeded (SHARED | NOTIFIED | EMAILED)
+#   failed      steps still to retry
+#
+# A step in neither mask is pending: with an invite digest window, the
+# notification and email wait in the digest, and invite_digest.send_digest
+# records their outcome through record_digest().
+#
+# A recipient with a failed step gets next_retry = now + RETRY_DELAY * 2^attempts
+# (capped at MAX_DELAY). retry() runs every minute, picks due rows by a range scan
+# on next_retry and re-attempts only their failed steps. After MAX_ATTEMPTS the
+# row keeps its failed bits with next_retry cleared, and the host sees it as
+# undelivered on the Meeting form until retried by hand.
+
+SHARED = 1
+NOTIFIED = 2
+EMAILED = 4
+ALL_STEPS = SHARED | NOTIFIED | EMAILED
+STEPS = {SHARED: "shared", NOTIFIED: "notified", EMAILED: "emailed"}
+
+RETRY_DELAY = 60
+MAX_DELAY = 6 * 60 * 60
+MAX_ATTEMPTS = 8
+MAX_ROWS_PER_RUN = 500
+LEASE_TTL = 300
+CHUNK_SIZE = 1000
+MAX_FAILURES_SHOWN = 100
+
+
+def next_retry(attempts, now=None):
+    delay = min(RETRY_DELAY * 2 ** attempts, MAX_DELAY)
+    return (now or now_datetime()) + datetime.timedelta(seconds=delay)
+
+
+def step_names(mask):
+    return [name for bit, name in STEPS.items() if mask & bit]
+
+
+def record(meeting_name, states):
+    """
+    Stores the outcome of an invite. `states` is {user: (delivered, failed)}.
+    A recipient invited again starts over with a fresh row.
+    """
+    if not states:
+        return
+    users = list(states)
+    for i in range(0, len(users), CHUNK_SIZE):
+        frappe.db.sql("DELETE FROM `tabMeeting Invite Delivery` WHERE meeting = %(meeting)s AND user IN %(users)s",
+            {"meeting": meeting_name, "users": users[i:i + CHUNK_SIZE]})
+
+    now = now_datetime()
+    retry_at = next_retry(0, now)
+    frappe.db.bulk_insert("Meeting Invite Delivery",
+        fields=["name", "creation", "modified", "owner", "modified_by", "meeting", "user", "delivered", "failed",
+            "attempts", "next_retry"],
+        values=[(frappe.generate_hash(length=10), now, now, "Administrator", "Administrator", meeting_name, user,
+            delivered, failed, 0, retry_at if failed else None) for user, (delivered, failed) in states.items()])
+
+
+def record_digest(user, meeting_names, done, failed):
+    """
+    Records the outcome of a digest sent to `user` for `meeting_names`. Steps
+    that are already delivered are never marked failed again.
+    """
+    if not meeting_names:
+        return
+    # next_retry and failed come first: MySQL evaluates SET left to right with the new values
+    frappe.db.sql("""
+        UPDATE `tabMeeting Invite Delivery`
+        SET next_retry = CASE WHEN (%(failed)s & ~(delivered | %(done)s)) != 0
+                THEN COALESCE(next_retry, %(retry_at)s) ELSE next_retry END,
+            failed = (failed | %(failed)s) & ~(delivered | %(done)s),
+            delivered = delivered | %(done)s
+        WHERE user = %(user)s AND meeting IN %(meetings)s
+    """, {"user": user, "meetings": list(meeting_names), "done": done, "failed": failed,
+        "retry_at": next_retry(0)})
+
+
+def retry():
+    """
+    Scheduled task (every minute): re-attempts the failed steps that are due.
+    """
+    lease = Lease("invite_delivery.retry", ttl=LEASE_TTL)
+    if not lease.acquire():
+        return
+    try:
+        rows = frappe.db.sql("""
+            SELECT name, meeting, user, delivered, failed, attempts FROM `tabMeeting Invite Delivery`
+            WHERE next_retry <= %(now)s
+            ORDER BY next_retry LIMIT %(limit)s
+        """, {"now": now_datetime(), "limit": MAX_ROWS_PER_RUN}, as_dict=True)
+        by_meeting = {}
+        for row in rows:
+            by_meeting.setdefault(row.meeting, []).append(row)
+        for meeting_name, meeting_rows in by_meeting.items():
+            if lease.lost:
+                break
+            _retry_meeting(meeting_name=meeting_name, rows=meeting_rows)
+            frappe.db.commit()
+    finally:
+        lease.release()
+
+
+@tracing.traced("invite_delivery.retry")
+def _retry_meeting(meeting_name, rows):
+    from erpnext_meet.erpnext_meet import api
+
+    meeting = frappe.db.exists("Meeting", meeting_name) and frappe.get_doc("Meeting", meeting_name)
+    if not meeting or meeting.status == "Ended":
+        # Nothing left to invite to: keep the failures for the summary, stop retrying
+        frappe.db.sql("UPDATE `tabMeeting Invite Delivery` SET next_retry = NULL WHERE name IN %(names)s",
+            {"names": [row.name for row in rows]})
+        return
+
+    room_name = api.get_room_name(meeting)
+    join_url = api.get_join_url(room_name)
+    doctype = meeting.reference_doctype or "Meeting"
+    docname = meeting.reference_docname or meeting.name
+
+    original_user = frappe.session.user
+    frappe.set_user("Administrator")
+    try:
+        now = now_datetime()
+        for row in rows:
+            done = 0
+            if row.failed & SHARED and api.share_meeting(meeting_name, row.user):
+                done |= SHARED
+            if row.failed & NOTIFIED and api.create_invite_notification(row.user, doctype, docname, join_url):
+                done |= NOTIFIED
+            if row.failed & EMAILED and api.send_invite_email(meeting, row.user, doctype, docname, join_url):
+                done |= EMAILED
+
+            failed = row.failed & ~done
+            attempts = row.attempts + 1
+            frappe.db.set_value("Meeting Invite Delivery", row.name, {
+                "delivered": row.delivered | done,
+                "failed": failed,
+                "attempts": attempts,
+                "next_retry": next_retry(attempts, now) if failed and attempts < MAX_ATTEMPTS else None,
+            }, update_modified=False)
+            metrics.inc("erpnext_meet_invite_retries_total", {"result": "error" if failed else "success"})
+    finally:
+        frappe.set_user(original_user)
+
+
+def _check_access(meeting_name):
+    host = frappe.db.get_value("Meeting", meeting_name, "host")
+    if host != frappe.session.user and "System Manager" not in frappe.get_roles():
+        frappe.throw(_("Only the host can see the invite delivery of this meeting."), frappe.PermissionError)
+
+
+@frappe.whitelist()
+def get_summary(meeting_name):
+    """
+    Invite delivery of a meeting, for its host:
+    {"recipients": n, "shared": n, "notified": n, "emailed": n, "retrying": n, "given_up": n,
+     "pending": n, "failures": [{user, failed, attempts, next_retry}]}
+    `pending` counts recipients whose invite is still waiting in the digest.
+    `failed` lists the step names still undelivered.
+    """
+    _check_access(meeting_name)
+    summary = frappe.db.sql("""
+        SELECT COUNT(*) AS recipients,
+            COALESCE(SUM(CASE WHEN (delivered & 1) != 0 THEN 1 ELSE 0 END), 0) AS shared,
+            COALESCE(SUM(CASE WHEN (delivered & 2) != 0 THEN 1 ELSE 0 END), 0) AS notified,
+            COALESCE(SUM(CASE WHEN (delivered & 4) != 0 THEN 1 ELSE 0 END), 0) AS emailed,
+            COALESCE(SUM(CASE WHEN failed != 0 AND next_retry IS NOT NULL THEN 1 ELSE 0 END), 0) AS retrying,
+            COALESCE(SUM(CASE WHEN failed != 0 AND next_retry IS NULL THEN 1 ELSE 0 END), 0) AS given_up,
+            COALESCE(SUM(CASE WHEN failed = 0 AND (delivered | failed) != %(all_steps)s THEN 1 ELSE 0 END), 0)
+                AS pending
+        FROM `tabMeeting Invite Delivery` WHERE meeting = %(meeting)s
+    """, {"meeting": meeting_name, "all_steps": ALL_STEPS}, as_dict=True)[0]
+
+    summary.failures = frappe.get_all("Meeting Invite Delivery",
+        filters={"meeting": meeting_name, "failed": ["!=", 0]},
+        fields=["user", "failed", "attempts", "next_retry"],
+        order_by="user asc", limit_page_length=MAX_FAILURES_SHOWN)
+    for row in summary.failures:
+        row.failed = step_names(row.failed)
+    return summary
+
+
+@frappe.whitelist()
+def retry_now(meeting_name):
+    """
+    Schedules every undelivered step of the meeting for the next retry run,
+    including recipients whose retries were given up.
+    """
+    _check_access(meeting_name)
+    frappe.db.sql("""
+        UPDATE `tabMeeting Invite Delivery` SET attempts = 0, next_retry = %(now)s
+        WHERE meeting = %(meeting)s AND failed != 0
+    """, {"meeting": meeting_name, "now": now_datetime()})
@@ -0,0 +1,212 @@
+import json
+import time
+
+import frappe
+from frappe import _
+
+from erpnext_meet.erpnext_meet.utils import invite_delivery, metrics, tracing
+
+# Invite coalescing. With Meeting Settings > Invite Digest Window set, invites are
+# buffered per recipient in Redis instead of creating a Notification Log and an
+# email each:
+#
+#   erpnext_meet:invite_digest:pending           sorted set, recipient -> time of first buffered invite
+#   erpnext_meet:invite_digest:items:{user}      hash, meeting -> invite (one entry per meeting)
+#   erpnext_meet:invite_digest:sent:{meeting}    set of recipients already invited to the meeting
+#
+# flush() (every minute) sends one alert and one email per recipient whose window
+# has elapsed, listing all of their meetings.
+
+PENDING_KEY = "erpnext_meet:invite_digest:pending"
+ITEMS_KEY = "erpnext_meet:invite_digest:items:{0}"
+SENT_KEY = "erpnext_meet:invite_digest:sent:{0}"
+SENT_TTL = 90 * 24 * 60 * 60
+MAX_RECIPIENTS_PER_FLUSH = 500
+DIGEST_STEPS = invite_delivery.NOTIFIED | invite_delivery.EMAILED
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def get_window():
+    """
+    Digest window in seconds; 0 means invites are sent immediately.
+    """
+    return (frappe.get_cached_doc("Meeting Settings").get("invite_digest_window") or 0) * 60
+
+
+def is_enabled():
+    return get_window() > 0
+
+
+def buffer(user, meeting_name, room_name, doctype, docname):
+    """
+    Queues an invite for the next digest of `user`. Invites to a meeting the
+    user was already invited to, or that is already queued, are dropped.
+    Returns False if an earlier digest already delivered it.
+    """
+    pipe = frappe.cache().pipeline()
+    pipe.sismember(_key(SENT_KEY.format(meeting_name)), user)
+    if pipe.execute()[0]:
+        metrics.inc("erpnext_meet_invites_total", {"step": "digest", "result": "duplicate"})
+        return False
+
+    pipe = frappe.cache().pipeline()
+    pipe.hsetnx(_key(ITEMS_KEY.format(user)), meeting_name, json.dumps({
+        "meeting": meeting_name,
+        "room_name": room_name,
+        "doctype": doctype,
+        "docname": docname,
+    }))
+    # NX keeps the time of the first invite, so later invites do not extend the window
+    pipe.zadd(_key(PENDING_KEY), {user: time.time()}, nx=True)
+    queued = pipe.execute()[0]
+    metrics.inc("erpnext_meet_invites_total", {"step": "digest", "result": "queued" if queued else "duplicate"})
+    return True
+
+
+def _take(user):
+    """
+    Atomically removes and returns the buffered invites of `user`.
+    """
+    pipe = frappe.cache().pipeline(transaction=True)
+    pipe.hvals(_key(ITEMS_KEY.format(user)))
+    pipe.delete(_key(ITEMS_KEY.format(user)))
+    pipe.zrem(_key(PENDING_KEY), user)
+    values = pipe.execute()[0]
+    return [json.loads(v) for v in values]
+
+
+def flush():
+    """
+    Scheduled task: sends the digests whose window has elapsed.
+    """
+    window = get_window()
+    # Once disabled, anything still buffered is sent right away
+    cutoff = time.time() - window if window else "+inf"
+    pipe = frappe.cache().pipeline()
+    pipe.zrangebyscore(_key(PENDING_KEY), "-inf", cutoff, start=0, num=MAX_RECIPIENTS_PER_FLUSH)
+    recipients = [frappe.safe_decode(u) for u in pipe.execute()[0]]
+    if not recipients:
+        return
+
+    original_user = frappe.session.user
+    frappe.set_user("Administrator")
+    try:
+        for user in recipients:
+            items = _take(user)
+            if items:
+                try:
+                    with tracing.span("invite_digest.send", meetings=[i["meeting"] for i in items]):
+                        send_digest(user, items)
+                except Exception:
+                    frappe.log_error(title="Meeting Invite Digest Error", message=frappe.get_traceback())
+                    # The items are taken: leave the steps to the invite delivery retries
+                    invite_delivery.record_digest(user, [i["meeting"] for i in items], 0, DIGEST_STEPS)
+            frappe.db.commit()
+    finally:
+        frappe.set_user(original_user)
+
+
+def send_digest(user, items):
+    from erpnext_meet.erpnext_meet import api
+
+    meetings = {m.name: m for m in frappe.get_all("Meeting",
+        filters={"name": ["in", [i["meeting"] for i in items]]},
+        fields=["name", "host", "status", "start_time", "end_time", "repeat_this_meeting", "repeat_on",
+            "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    )}
+    # Meetings deleted or ended while buffered are left out. Their digest steps
+    # are neither delivered nor failed: nothing is retried and nothing counts as
+    # given up (a deleted meeting's delivery rows are gone with it).
+    items = [i for i in items if i["meeting"] in meetings and meetings[i["meeting"]].status != "Ended"]
+    if not items:
+        return
+    items.sort(key=lambda i: meetings[i["meeting"]].start_time or frappe.utils.get_datetime("9999-12-31"))
+
+    if len(items) == 1:
+        # A single invite looks exactly like an immediate one
+        item = items[0]
+        join_url = api.get_join_url(item["room_name"])
+        notified = api.create_invite_notification(user, item["doctype"], item["docname"], join_url)
+        emailed = api.send_invite_email(frappe.get_doc("Meeting", item["meeting"]), user, item["doctype"],
+            item["docname"], join_url)
+        _record(user, items, notified, emailed)
+        _mark_sent(user, items)
+        return
+
+    rows = []
+    for item in items:
+        meeting = meetings[item["meeting"]]
+        rows.append({
+            "reference": f"{item['doctype']} {item['docname']}",
+            "host": frappe.utils.get_fullname(meeting.host),
+            "start_time": frappe.utils.format_datetime(meeting.start_time, "medium") if meeting.start_time else "",
+            "repeat_info": api.get_repeat_info(meeting),
+            "join_url": api.get_join_url(item["room_name"]),
+        })
+
+    subject = _("You have been invited to {0} video meetings").format(len(rows))
+    context = {
+        "intro_message": subject,
+        "meetings": rows,
+        "join_button_label": _("Join"),
+    }
+    if frappe.db.exists("Email Template", "Meeting Invitation Digest"):
+        template = frappe.get_doc("Email Template", "Meeting Invitation Digest")
+        subject = frappe.render_template(template.subject, context)
+        message = frappe.render_template(template.response, context)
+    else:
+        message = "<p>{}</p><ul>{}</ul>".format(context["intro_message"], "".join(
+            f"""<li><b>{r['reference']}</b> ({r['host']}) {r['start_time']} {r['repeat_info']}
+                - <a href="{r['join_url']}" target="_blank">{context['join_button_label']}</a></li>"""
+            for r in rows
+        ))
+
+    notified = emailed = False
+    try:
+        doc = frappe.new_doc("Notification Log")
+        doc.subject = subject
+        doc.email_content = message
+        doc.for_user = user
+        # Opens the first meeting
+        doc.document_type = "Meeting"
+        doc.document_name = items[0]["meeting"]
+        doc.type = "Alert"
+        doc.erpnext_meet_source = "invite_digest"
+        doc.insert(ignore_permissions=True)
+        notified = True
+        metrics.inc("erpnext_meet_invites_total", {"step": "notification", "result": "success"})
+    except Exception as e:
+        metrics.inc("erpnext_meet_invites_total", {"step": "notification", "result": "error"})
+        frappe.log_error(f"Failed to create invite digest notification for {user}: {e!s}", "Meeting Notification Error")
+
+    try:
+        frappe.sendmail(
+            recipients=[f"{frappe.utils.get_fullname(user)} <{user}>"],
+            subject=subject,
+            message=message
+        )
+        emailed = True
+        metrics.inc("erpnext_meet_invites_total", {"step": "email", "result": "success"})
+    except Exception as e:
+        metrics.inc("erpnext_meet_invites_total", {"step": "email", "result": "error"})
+        frappe.log_error(f"Failed to send invite digest email to {user}: {e!s}", "Meeting Email Error")
+
+    _record(user, items, notified, emailed)
+    _mark_sent(user, items)
+
+
+def _record(user, items, notified, emailed):
+    steps = {invite_delivery.NOTIFIED: notified, invite_delivery.EMAILED: emailed}
+    invite_delivery.record_digest(user, [i["meeting"] for i in items],
+        sum(bit for bit, ok in steps.items() if ok), sum(bit for bit, ok in steps.items() if not ok))
+
+
+def _mark_sent(user, items):
+    pipe = frappe.cache().pipeline()
+    for item in items:
+        pipe.sadd(_key(SENT_KEY.format(item["meeting"])), user)
+        pipe.expire(_key(SENT_KEY.format(item["meeting"])), SENT_TTL)
+    pipe.execute()
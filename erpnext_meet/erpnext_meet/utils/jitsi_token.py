@@ -0,0 +1,92 @@
+import time
+import unicodedata
+from urllib.parse import quote
+
+import frappe
+import jwt
+
+# Room-scoped Jitsi JWTs. Every moderation decision is made here, when the token is
+# issued, and carried in the claims, so the Prosody modules (mod_token_affiliation,
+# mod_dynamic_moderation) can apply affiliation synchronously at join without any
+# database or timer:
+#
+#   room                          exact MUC node of the room (see jitsi_room()), never "*"
+#   context.user.role             host | moderator | participant | guest
+#   context.user.affiliation      owner | member, derived from the role
+#   context.user.moderator        true for host and moderator
+#   context.user.lobby_bypass     skip the lobby if the room has one
+#   context.features              feature grants read by Jitsi Meet
+#   context.room                  room name and meeting session ID, for the modules' room check
+
+TOKEN_TTL = 7200
+OWNER_ROLES = ("host", "moderator")
+LEEWAY = 30
+
+ROLES = {
+    # role: (affiliation, lobby_bypass, features)
+    "host": ("owner", True, {"livestreaming": True, "recording": True, "transcription": True, "outbound-call": True, "screen-sharing": True}),
+    "moderator": ("owner", True, {"livestreaming": False, "recording": True, "transcription": True, "outbound-call": False, "screen-sharing": True}),
+    "participant": ("member", True, {"livestreaming": False, "recording": False, "transcription": False, "outbound-call": False, "screen-sharing": True}),
+    "guest": ("member", False, {"livestreaming": False, "recording": False, "transcription": False, "outbound-call": False, "screen-sharing": False}),
+}
+
+
+def jitsi_room(room_name):
+    """
+    The MUC node Prosody sees for `room_name`. Jitsi Meet's getBackendSafeRoomName
+    NFKC-normalizes and lowercases the name, then applies encodeURIComponent;
+    Prosody's nodeprep lowercases the percent escapes as well.
+    """
+    room = unicodedata.normalize("NFKC", room_name).lower()
+    return quote(room, safe="-_.!~*'()").lower()
+
+
+def room_path(room_name):
+    # For URLs: Jitsi decodes the path before applying jitsi_room()
+    return quote(room_name, safe="")
+
+
+def build_claims(settings, room_name, role, user_id, user_name, email=None, avatar=""):
+    if role not in ROLES:
+        frappe.throw(f"Unknown meeting role: {role}")
+
+    affiliation, lobby_bypass, features = ROLES[role]
+    moderator = affiliation == "owner"
+    now = int(time.time())
+    return {
+        "aud": "jitsi",
+        "iss": settings.app_id,
+        "sub": "meet.jitsi",
+        "room": jitsi_room(room_name),
+        "iat": now,
+        "nbf": now - LEEWAY,
+        "exp": now + TOKEN_TTL,
+        "context": {
+            "user": {
+                "id": user_id,
+                "name": user_name,
+                "email": email or user_id,
+                "avatar": avatar,
+                "role": role,
+                "affiliation": affiliation,
+                "moderator": moderator,
+                "lobby_bypass": lobby_bypass,
+            },
+            "features": dict(features),
+            "room": {
+                "name": jitsi_room(room_name),
+                "session_id": room_name.rsplit("-", 1)[-1],
+            },
+        },
+        # Top-level copies for Jitsi components that only read these
+        "moderator": moderator,
+        "affiliation": affiliation,
+    }
+
+
+def encode(settings, claims):
+    token = jwt.encode(claims, settings.get_password("app_secret"), algorithm="HS256")
+    if isinstance(token, bytes):
+        return token.decode("utf-8")
+    return token
+
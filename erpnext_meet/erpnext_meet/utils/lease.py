@@ -0,0 +1,76 @@
+import threading
+import uuid
+
+import frappe
+
+# Redis lease lock with heartbeat. The lease is held under a random token and
+# expires after `ttl` seconds unless renewed, so a crashed worker never blocks the
+# next run for longer than one TTL. A daemon thread renews it every ttl/3 while
+# the holder works; callers check `lease.lost` between units of work and stop if
+# another worker has taken over.
+
+# Renew / release only if the lease is still ours
+RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class Lease:
+    def __init__(self, name, ttl=300):
+        # Resolve the key and scripts here: the heartbeat thread has no frappe.local
+        self.key = frappe.cache().make_key(f"erpnext_meet:lease:{name}")
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid.uuid4().hex
+        self.lost = False
+        self._redis = frappe.cache()
+        self._renew = self._redis.register_script(RENEW_LUA)
+        self._release = self._redis.register_script(RELEASE_LUA)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def acquire(self):
+        # Plain redis-py SET: RedisWrapper.set_value would pickle the token
+        if not self._redis.set(self.key, self.token, nx=True, px=self.ttl_ms):
+            return False
+        self._thread = threading.Thread(target=self._heartbeat, name=f"lease:{self.key}", daemon=True)
+        self._thread.start()
+        return True
+
+    def renew(self):
+        if not self._renew(keys=[self.key], args=[self.token, self.ttl_ms]):
+            self.lost = True
+        return not self.lost
+
+    def _heartbeat(self):
+        interval = self.ttl_ms / 3000.0
+        while not self._stop.wait(interval):
+            try:
+                if not self.renew():
+                    return
+            except Exception:
+                # Transient Redis error: try again on the next beat, the TTL still covers us
+                pass
+
+    def release(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        try:
+            self._release(keys=[self.key], args=[self.token])
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.release()
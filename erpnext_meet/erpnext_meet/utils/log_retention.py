@@ -0,0 +1,123 @@
+import json
+
+import frappe
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+from frappe.utils import add_days, cint, now_datetime
+
+from erpnext_meet.erpnext_meet.utils import metrics
+
+# Retention for the rows this app writes to shared log tables. Each category has
+# an age limit and a count limit in Meeting Settings (0 = no limit). The daily
+# purge selects primary keys in batches of BATCH_SIZE with plain reads and deletes
+# them by primary key, committing after every batch, so no delete holds locks for
+# long. At most MAX_ROWS_PER_RUN rows per category go per run; a larger backlog
+# drains over the following days.
+
+BATCH_SIZE = 1000
+MAX_ROWS_PER_RUN = 100000
+
+# Error Log titles used by the app. Older calls passed (message, title)
+# positionally, which Frappe stores with the title in `error`, so both columns
+# are matched.
+ERROR_TITLES = [
+    "Event Share Error", "Instant Meeting Error", "Meeting Active Room Cache Error", "Meeting Bulk Schedule Error",
+    "Meeting Creation Error", "Meeting Email Error", "Meeting End Error", "Meeting Event Sync Error",
+    "Meeting Export Error", "Meeting Invite Digest Error", "Meeting Invite Error", "Meeting Join Error",
+    "Meeting Notification Error", "Meeting Rollup Error", "Meeting Share Error", "Meeting Start Error", "RSVP Error",
+]
+# Written by debug logging in earlier versions
+DEBUG_TITLES = ["RSVP Debug", "Jitsi Join URL"]
+
+# Notification Logs written by the app carry their origin in a custom field, so
+# retention never touches notifications Frappe or other apps link to a Meeting:
+#   invite          api.create_invite_notification
+#   invite_digest   invite_digest.send_digest
+#   reminder        reminders._send
+SOURCE_FIELD = "erpnext_meet_source"
+NOTIFICATION_SOURCES = ["invite", "invite_digest", "reminder"]
+
+# category: (doctype, condition, settings prefix)
+CATEGORIES = {
+    "errors": ("Error Log", "(method IN %(titles)s OR error IN %(titles)s)", "error_log"),
+    "debug": ("Error Log", "(method IN %(debug_titles)s OR error IN %(debug_titles)s)", "debug_log"),
+    "invite_notifications": ("Notification Log", f"{SOURCE_FIELD} IN %(sources)s", "notification_log"),
+}
+
+
+def setup():
+    """
+    Adds the source field to Notification Log. Runs after install and every migrate.
+    """
+    create_custom_fields({"Notification Log": [{
+        "fieldname": SOURCE_FIELD,
+        "label": "ERPNext Meet Source",
+        "fieldtype": "Data",
+        "insert_after": "document_name",
+        "hidden": 1,
+        "read_only": 1,
+        "search_index": 1,
+    }]}, ignore_validate=True, update=True)
+
+
+def purge():
+    """
+    Scheduled task (daily): applies the retention policy and records the rows
+    removed per category in Meeting Settings > Last Purge.
+    """
+    settings = frappe.get_cached_doc("Meeting Settings")
+    removed = {}
+    for category, (doctype, condition, prefix) in CATEGORIES.items():
+        removed[category] = purge_category(doctype, condition,
+            days=cint(settings.get(f"{prefix}_retention_days")),
+            max_rows=cint(settings.get(f"{prefix}_max_rows")))
+        if removed[category]:
+            metrics.inc("erpnext_meet_purged_rows_total", {"category": category}, removed[category])
+
+    frappe.db.set_single_value("Meeting Settings", "last_log_purge",
+        json.dumps({"finished_at": str(now_datetime()), "removed": removed}), update_modified=False)
+    frappe.db.commit()
+    return removed
+
+
+def purge_category(doctype, condition, days=0, max_rows=0):
+    """
+    Deletes the rows matching `condition` that are older than `days` or beyond the
+    newest `max_rows`. Returns the number of rows deleted.
+    """
+    values = {"titles": ERROR_TITLES, "debug_titles": DEBUG_TITLES, "sources": NOTIFICATION_SOURCES}
+    cutoffs = []
+    if days:
+        cutoffs.append(add_days(now_datetime(), -days))
+    if max_rows:
+        # Creation time of the oldest row to keep
+        newest = frappe.db.sql(f"""
+            SELECT creation FROM `tab{doctype}` WHERE {condition}
+            ORDER BY creation DESC LIMIT 1 OFFSET %(offset)s
+        """, dict(values, offset=max_rows - 1))
+        if newest:
+            cutoffs.append(newest[0][0])
+    if not cutoffs:
+        return 0
+
+    values["cutoff"] = max(cutoffs)
+    removed = 0
+    while removed < MAX_ROWS_PER_RUN:
+        names = [r[0] for r in frappe.db.sql(f"""
+            SELECT name FROM `tab{doctype}` WHERE {condition} AND creation < %(cutoff)s LIMIT %(limit)s
+        """, dict(values, limit=min(BATCH_SIZE, MAX_ROWS_PER_RUN - removed)))]
+        if not names:
+            break
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name IN %(names)s", {"names": names})
+        frappe.db.commit()
+        removed += len(names)
+    return removed
+
+
+@frappe.whitelist()
+def purge_now():
+    """
+    Runs the purge immediately.
+    Usage: bench --site <site> execute erpnext_meet.erpnext_meet.utils.log_retention.purge_now
+    """
+    frappe.only_for("System Manager")
+    return purge()
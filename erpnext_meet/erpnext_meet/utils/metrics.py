@@ -0,0 +1,226 @@
+import functools
+import hmac
+import time
+
+import frappe
+from werkzeug.wrappers import Response
+
+# All metrics live in three Redis hashes so every gunicorn and RQ worker
+# aggregates into the same place with a single pipelined round trip.
+# Pipelines are used throughout because they bypass RedisWrapper's
+# pickling and key-prefixing overrides; keys are prefixed via _key().
+COUNTERS_KEY = "erpnext_meet:metrics:counters"
+HISTOGRAMS_KEY = "erpnext_meet:metrics:histograms"
+GAUGES_KEY = "erpnext_meet:metrics:gauges"
+GAUGES_SEEDED_KEY = "erpnext_meet:metrics:gauges_seeded"
+
+# Gauges are re-seeded from the database at most once per day to correct drift
+GAUGE_RESEED_INTERVAL = 24 * 60 * 60
+GAUGE_STATUSES = ("Active", "Waiting")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HELP = {
+    "erpnext_meet_calls_total": ("counter", "Calls to instrumented meeting operations."),
+    "erpnext_meet_invites_total": ("counter", "Meeting invitations processed per delivery step."),
+    "erpnext_meet_invite_retries_total": ("counter", "Invite recipients retried, by whether all failed steps went through."),
+    "erpnext_meet_rate_limited_total": ("counter", "Requests rejected by admission control per bucket scope."),
+    "erpnext_meet_lifecycle_rows_total": ("counter", "Meetings ended by the hourly lifecycle sweeps."),
+    "erpnext_meet_purged_rows_total": ("counter", "Log rows removed by the retention purge per category."),
+    "erpnext_meet_reminders_total": ("counter", "Meeting start reminders sent."),
+    "erpnext_meet_operation_duration_seconds": ("histogram", "Duration of instrumented meeting operations."),
+    "erpnext_meet_meetings": ("gauge", "Meetings currently in a live status."),
+}
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+
+
+def inc(metric, labels=None, amount=1):
+    """
+    Increments a counter. Never raises: metrics must not break the operation they observe.
+    """
+    try:
+        pipe = frappe.cache().pipeline()
+        pipe.hincrby(_key(COUNTERS_KEY), f"{metric}|{_labels(labels)}", amount)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def observe(operation, duration, status="success"):
+    """
+    Records one call of `operation` in the call counter and the duration histogram.
+    Buckets are stored non-cumulative (one HINCRBY per observation) and summed on export.
+    """
+    bucket = next((str(b) for b in BUCKETS if duration <= b), "+Inf")
+    try:
+        pipe = frappe.cache().pipeline()
+        pipe.hincrby(
+            _key(COUNTERS_KEY),
+            f"erpnext_meet_calls_total|{_labels({'operation': operation, 'status': status})}",
+            1,
+        )
+        pipe.hincrby(_key(HISTOGRAMS_KEY), f"{operation}|{bucket}", 1)
+        pipe.hincrbyfloat(_key(HISTOGRAMS_KEY), f"{operation}|sum", duration)
+        pipe.hincrby(_key(HISTOGRAMS_KEY), f"{operation}|count", 1)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def timed(operation):
+    """
+    Decorator that counts calls and records their duration under `operation`.
+    Place it below @frappe.whitelist() so the whitelisted function is the wrapper.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            status = "success"
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                observe(operation, time.monotonic() - start, status)
+
+        return wrapper
+
+    return decorator
+
+
+def track_status_change(old_status, new_status, count=1):
+    """
+    Moves `count` meetings between status gauges. Called wherever Meeting.status changes,
+    including the raw SQL paths in api.py and tasks.py.
+    """
+    if old_status == new_status or not count:
+        return
+    try:
+        pipe = frappe.cache().pipeline()
+        if old_status in GAUGE_STATUSES:
+            pipe.hincrby(_key(GAUGES_KEY), old_status, -count)
+        if new_status in GAUGE_STATUSES:
+            pipe.hincrby(_key(GAUGES_KEY), new_status, count)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def seed_gauges():
+    """
+    Recomputes the meeting gauges from the database with a single grouped query.
+    """
+    rows = frappe.db.sql(
+        """
+        SELECT status, COUNT(*)
+        FROM `tabMeeting`
+        WHERE status IN %s
+        GROUP BY status
+        """,
+        (GAUGE_STATUSES,),
+    )
+    counts = {status: 0 for status in GAUGE_STATUSES}
+    counts.update({status: cnt for status, cnt in rows})
+
+    pipe = frappe.cache().pipeline()
+    pipe.hset(_key(GAUGES_KEY), mapping=counts)
+    pipe.set(_key(GAUGES_SEEDED_KEY), 1, ex=GAUGE_RESEED_INTERVAL)
+    pipe.execute()
+    return counts
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def render():
+    """
+    Renders all metrics in the Prometheus text exposition format.
+    """
+    pipe = frappe.cache().pipeline()
+    pipe.exists(_key(GAUGES_SEEDED_KEY))
+    if not pipe.execute()[0]:
+        seed_gauges()
+
+    pipe.hgetall(_key(COUNTERS_KEY))
+    pipe.hgetall(_key(HISTOGRAMS_KEY))
+    pipe.hgetall(_key(GAUGES_KEY))
+    counters, histograms, gauges = pipe.execute()
+
+    series = {}
+
+    # Counters: field is "<metric>|<labels>"
+    for field, value in counters.items():
+        metric, labels = _decode(field).split("|", 1)
+        series.setdefault(metric, []).append(f"{metric}{{{labels}}} {int(value)}")
+
+    # Histograms: field is "<operation>|<bucket|sum|count>"
+    per_operation = {}
+    for field, value in histograms.items():
+        operation, part = _decode(field).rsplit("|", 1)
+        per_operation.setdefault(operation, {})[part] = float(value)
+
+    metric = "erpnext_meet_operation_duration_seconds"
+    for operation in sorted(per_operation):
+        values = per_operation[operation]
+        cumulative = 0
+        for bucket in [str(b) for b in BUCKETS] + ["+Inf"]:
+            cumulative += int(values.get(bucket, 0))
+            series.setdefault(metric, []).append(
+                f'{metric}_bucket{{operation="{operation}",le="{bucket}"}} {cumulative}'
+            )
+        series[metric].append(f'{metric}_sum{{operation="{operation}"}} {values.get("sum", 0)}')
+        series[metric].append(f'{metric}_count{{operation="{operation}"}} {int(values.get("count", 0))}')
+
+    for status in GAUGE_STATUSES:
+        value = max(int(gauges.get(status.encode(), gauges.get(status, 0))), 0)
+        series.setdefault("erpnext_meet_meetings", []).append(
+            f'erpnext_meet_meetings{{status="{status}"}} {value}'
+        )
+
+    lines = []
+    for metric in sorted(series):
+        metric_type, help_text = HELP.get(metric, ("untyped", ""))
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        lines.extend(sorted(series[metric]) if metric_type != "histogram" else series[metric])
+
+    return "\n".join(lines) + "\n"
+
+
+def _check_access():
+    if frappe.session.user != "Guest" and "System Manager" in frappe.get_roles():
+        return
+
+    settings = frappe.get_single("Meeting Settings")
+    expected = settings.get_password("metrics_token", raise_exception=False)
+    auth_header = frappe.get_request_header("Authorization") or ""
+    supplied = auth_header[7:] if auth_header.startswith("Bearer ") else ""
+
+    if not expected or not supplied or not hmac.compare_digest(supplied, expected):
+        frappe.throw(frappe._("Not permitted to read meeting metrics"), frappe.PermissionError)
+
+
+@frappe.whitelist(allow_guest=True)
+def export():
+    """
+    Prometheus scrape endpoint.
+    Usage: /api/method/erpnext_meet.erpnext_meet.utils.metrics.export
+    Authenticate as System Manager or with "Authorization: Bearer <Metrics Token>".
+    """
+    _check_access()
+    return Response(render(), mimetype=CONTENT_TYPE)
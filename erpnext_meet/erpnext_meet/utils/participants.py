@@ -0,0 +1,163 @@
+import frappe
+
+# Participant access for both storage modes:
+#   - regular meetings keep participants in the "Meeting Participant" child table
+#   - large meetings (Meeting.large_meeting) keep them in the standalone, indexed
+#     "Meeting Attendee" table so loading or saving the Meeting never touches them
+# Everything here is set-based; no function loads the Meeting document.
+
+ATTENDEE = "Meeting Attendee"
+
+
+def is_large(meeting_name):
+    return bool(frappe.db.get_value("Meeting", meeting_name, "large_meeting"))
+
+
+def _table(large):
+    return ATTENDEE if large else "Meeting Participant"
+
+
+def _meeting_filter(meeting_name, large):
+    if large:
+        return {"meeting": meeting_name}
+    return {"parent": meeting_name, "parenttype": "Meeting", "parentfield": "participants"}
+
+
+def get_status(meeting_name, user, large=None):
+    """
+    Returns the invitation status of `user`, or None if not a participant.
+    """
+    if large is None:
+        large = is_large(meeting_name)
+    return frappe.db.get_value(_table(large), dict(_meeting_filter(meeting_name, large), user=user), "invitation_status")
+
+
+def is_participant(meeting_name, user, large=None):
+    return get_status(meeting_name, user, large) is not None
+
+
+def get_users(meeting_name, exclude_rejected=False, large=None):
+    if large is None:
+        large = is_large(meeting_name)
+    filters = _meeting_filter(meeting_name, large)
+    if exclude_rejected:
+        filters["invitation_status"] = ["!=", "Rejected"]
+    return frappe.get_all(_table(large), filters=filters, pluck="user", order_by="user asc")
+
+
+def count(meeting_name, large=None):
+    if large is None:
+        large = is_large(meeting_name)
+    return frappe.db.count(_table(large), _meeting_filter(meeting_name, large))
+
+
+def get_page(meeting_name, start=0, page_length=50, search=None, status=None, large=None):
+    """
+    Returns one page of participants ordered by user, served by the (meeting, user) index.
+    """
+    if large is None:
+        large = is_large(meeting_name)
+    filters = _meeting_filter(meeting_name, large)
+    if status:
+        filters["invitation_status"] = status
+    if search:
+        filters["user"] = ["like", f"%{search}%"]
+    return frappe.get_all(_table(large),
+        filters=filters,
+        fields=["user", "invitation_status"],
+        order_by="user asc",
+        limit_start=frappe.utils.cint(start),
+        limit_page_length=frappe.utils.cint(page_length)
+    )
+
+
+def add_attendees(meeting_name, users, status="Pending"):
+    """
+    Adds users to a large meeting with one SELECT and one bulk INSERT.
+    `users` may be a list of user IDs or of (user, status) pairs.
+    Returns the users that were not participants before.
+    """
+    rows = [(u, status) if isinstance(u, str) else tuple(u) for u in users if u]
+    if not rows:
+        return []
+
+    existing = set(frappe.get_all(ATTENDEE,
+        filters={"meeting": meeting_name, "user": ["in", [user for user, _ in rows]]},
+        pluck="user"
+    ))
+
+    now = frappe.utils.now()
+    values, added = [], []
+    for user, user_status in rows:
+        if user in existing or user in added:
+            continue
+        added.append(user)
+        values.append((
+            frappe.generate_hash(length=10), now, now, frappe.session.user, frappe.session.user,
+            meeting_name, user, user_status or "Pending"
+        ))
+
+    if values:
+        frappe.db.bulk_insert(ATTENDEE,
+            fields=["name", "creation", "modified", "owner", "modified_by", "meeting", "user", "invitation_status"],
+            values=values,
+            ignore_duplicates=True
+        )
+    return added
+
+
+def remove_attendees(meeting_name, users):
+    if users:
+        frappe.db.delete(ATTENDEE, {"meeting": meeting_name, "user": ["in", list(users)]})
+
+
+def add_participants(meeting_name, users, large=None):
+    """
+    Adds users as Pending participants in either storage mode without saving the Meeting.
+    Returns the users that were not participants before.
+    """
+    if large is None:
+        large = is_large(meeting_name)
+    if large:
+        return add_attendees(meeting_name, users)
+
+    filters = _meeting_filter(meeting_name, large)
+    existing = set(frappe.get_all("Meeting Participant", filters=filters, pluck="user"))
+    added = [u for u in dict.fromkeys(users) if u and u not in existing]
+    if added:
+        start_idx = frappe.db.sql("""
+            SELECT COALESCE(MAX(idx), 0) FROM `tabMeeting Participant`
+            WHERE parent = %s AND parenttype = 'Meeting' AND parentfield = 'participants'
+        """, (meeting_name,))[0][0]
+        now = frappe.utils.now()
+        frappe.db.bulk_insert("Meeting Participant",
+            fields=["name", "creation", "modified", "owner", "modified_by", "parent", "parenttype", "parentfield",
+                "idx", "user", "invitation_status"],
+            values=[
+                (frappe.generate_hash(length=10), now, now, frappe.session.user, frappe.session.user,
+                    meeting_name, "Meeting", "participants", start_idx + i + 1, user, "Pending")
+                for i, user in enumerate(added)
+            ]
+        )
+    return added
+
+
+def remove_participants(meeting_name, users, large=None):
+    if large is None:
+        large = is_large(meeting_name)
+    if users:
+        frappe.db.delete(_table(large), dict(_meeting_filter(meeting_name, large), user=["in", list(users)]))
+
+
+def set_status(meeting_name, user, status, large=None):
+    """
+    Updates one participant's invitation status with a single UPDATE.
+    Returns False if the user is not a participant.
+    """
+    if large is None:
+        large = is_large(meeting_name)
+    name = frappe.db.get_value(_table(large), dict(_meeting_filter(meeting_name, large), user=user))
+    if not name:
+        return False
+    frappe.db.set_value(_table(large), name, "invitation_status", status)
+    return True
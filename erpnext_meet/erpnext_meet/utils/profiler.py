@@ -0,0 +1,150 @@
+import functools
+import json
+import random
+import re
+import time
+
+import frappe
+
+# Rolling store of sampled profiles, newest first
+PROFILES_KEY = "erpnext_meet:profiles"
+MAX_PROFILES = 500
+TOP_STATEMENTS = 5
+MAX_STATEMENT_LENGTH = 300
+
+
+def _is_enabled():
+    try:
+        if not frappe.db.get_single_value("Meeting Settings", "enable_profiling", cache=True):
+            return False
+        rate = frappe.db.get_single_value("Meeting Settings", "profiling_sample_rate", cache=True)
+    except Exception:
+        return False
+    return random.random() < (rate if rate is not None else 1)
+
+
+def _normalize(query):
+    return re.sub(r"\s+", " ", str(query)).strip()[:MAX_STATEMENT_LENGTH]
+
+
+def _install_sql_hook():
+    """
+    Shadows frappe.db.sql on the current connection so every active frame sees each query.
+    Returns the original bound method for _remove_sql_hook.
+    """
+    original_sql = frappe.db.sql
+
+    @functools.wraps(original_sql)
+    def sql(query, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            return original_sql(query, *args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - start
+            statement = _normalize(query)
+            for frame in frappe.local.erpnext_meet_profiles:
+                frame["queries"] += 1
+                frame["db_time"] += elapsed
+                stats = frame["statements"].setdefault(statement, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+
+    frappe.db.sql = sql
+    return original_sql
+
+
+def _remove_sql_hook():
+    if "sql" in vars(frappe.db):
+        del frappe.db.sql
+
+
+def _store(frame):
+    top = sorted(frame["statements"].items(), key=lambda s: s[1][1], reverse=True)[:TOP_STATEMENTS]
+    record = {
+        "method": frame["method"],
+        "timestamp": frappe.utils.now(),
+        "user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+        "status": frame["status"],
+        "queries": frame["queries"],
+        "db_ms": round(frame["db_time"] * 1000, 2),
+        "python_ms": round(max(frame["total_time"] - frame["db_time"], 0) * 1000, 2),
+        "total_ms": round(frame["total_time"] * 1000, 2),
+        "top_statements": [
+            {"query": query, "count": count, "ms": round(elapsed * 1000, 2)}
+            for query, (count, elapsed) in top
+        ],
+    }
+    try:
+        pipe = frappe.cache().pipeline()
+        pipe.lpush(frappe.cache().make_key(PROFILES_KEY), json.dumps(record))
+        pipe.ltrim(frappe.cache().make_key(PROFILES_KEY), 0, MAX_PROFILES - 1)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def profile(name=None):
+    """
+    Decorator that records query count, DB time, Python time and the top statements of
+    a call when profiling is enabled in Meeting Settings and the call is sampled.
+    Nested profiled calls are recorded separately; queries count towards every open frame.
+    """
+
+    def decorator(fn):
+        method = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            frames = getattr(frappe.local, "erpnext_meet_profiles", None)
+            # Nested calls inherit the sampling decision of the outermost frame
+            if frames is None and not _is_enabled():
+                return fn(*args, **kwargs)
+
+            outermost = frames is None
+            if outermost:
+                frames = frappe.local.erpnext_meet_profiles = []
+                _install_sql_hook()
+
+            frame = {
+                "method": method,
+                "status": "success",
+                "queries": 0,
+                "db_time": 0.0,
+                "statements": {},
+            }
+            frames.append(frame)
+            start = time.monotonic()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                frame["status"] = "error"
+                raise
+            finally:
+                frame["total_time"] = time.monotonic() - start
+                frames.remove(frame)
+                if outermost:
+                    _remove_sql_hook()
+                    frappe.local.erpnext_meet_profiles = None
+                _store(frame)
+
+        return wrapper
+
+    return decorator
+
+
+def get_profiles(method=None, limit=MAX_PROFILES):
+    """
+    Returns stored profiles, newest first, optionally filtered by method.
+    """
+    raw = frappe.cache().pipeline()
+    raw.lrange(frappe.cache().make_key(PROFILES_KEY), 0, limit - 1)
+    profiles = [json.loads(p) for p in raw.execute()[0]]
+    if method:
+        profiles = [p for p in profiles if p["method"] == method]
+    return profiles
+
+
+@frappe.whitelist()
+def clear_profiles():
+    frappe.only_for("System Manager")
+    frappe.cache().delete_value(PROFILES_KEY)
@@ -0,0 +1,128 @@
+import math
+
+import frappe
+from werkzeug.exceptions import TooManyRequests
+
+from erpnext_meet.erpnext_meet.utils import metrics
+
+BUCKET_PREFIX = "erpnext_meet:ratelimit"
+
+# Atomic token bucket. Uses the Redis clock so all workers share one time source.
+# KEYS[1] = bucket key, ARGV = capacity, refill rate (tokens per ms), cost
+# Returns {allowed (0/1), retry_after_ms}
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = math.ceil((cost - tokens) / refill)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill) + 1000)
+return {allowed, retry_after}
+"""
+
+
+def _script():
+    if not hasattr(frappe.local, "erpnext_meet_token_bucket"):
+        frappe.local.erpnext_meet_token_bucket = frappe.cache().register_script(TOKEN_BUCKET_LUA)
+    return frappe.local.erpnext_meet_token_bucket
+
+
+def get_limits():
+    """
+    Returns the configured per-minute limits, or None when rate limiting is disabled.
+    """
+    settings = frappe.get_cached_doc("Meeting Settings")
+    if not settings.get("enable_rate_limiting"):
+        return None
+    return frappe._dict({
+        "user": settings.rate_limit_per_user or 0,
+        "ip": settings.rate_limit_per_ip or 0,
+        "room": settings.rate_limit_per_room or 0,
+        "create": settings.rate_limit_room_creation or 0,
+        "webhook": settings.rate_limit_webhook or 0,
+    })
+
+
+def enforce(scope, identifier, limit_per_minute, cost=1):
+    """
+    Takes `cost` tokens from the bucket of `identifier` in `scope`.
+    Raises a 429 with Retry-After when the bucket is empty. Fails open if Redis is unavailable.
+    """
+    if not limit_per_minute or not identifier:
+        return
+
+    key = frappe.cache().make_key(f"{BUCKET_PREFIX}:{scope}:{identifier}")
+    try:
+        allowed, retry_after_ms = _script()(keys=[key], args=[limit_per_minute, limit_per_minute / 60000.0, cost])
+    except Exception:
+        return
+
+    if not allowed:
+        metrics.inc("erpnext_meet_rate_limited_total", {"scope": scope})
+        raise TooManyRequests(
+            description=frappe._("Too many requests. Please try again shortly."),
+            retry_after=max(1, math.ceil(retry_after_ms / 1000)),
+        )
+
+
+def check_request(scope):
+    """
+    Limits the caller: per user when logged in, per IP for guests.
+    Logged-in users are not limited per IP so users behind a shared NAT do not starve each other.
+    """
+    limits = get_limits()
+    if not limits:
+        return
+    if frappe.session.user == "Guest":
+        enforce(f"{scope}:ip", frappe.local.request_ip, limits.ip)
+    else:
+        enforce(f"{scope}:user", frappe.session.user, limits.user)
+
+
+def check_room(session_id):
+    """
+    Limits joins per room. Callers skip this for the host, which is the priority lane:
+    a reconnect storm by participants can never lock the host out of their own meeting.
+    """
+    limits = get_limits()
+    if limits:
+        enforce("join:room", session_id, limits.room)
+
+
+def check_room_creation():
+    limits = get_limits()
+    if limits:
+        enforce("create:user", frappe.session.user, limits.create)
+
+
+def check_webhook(authenticated):
+    """
+    Call after the token check. Prosody sends every event from one address, so
+    authenticated webhooks get their own bucket (unlimited by default) and never
+    compete with guests or with each other per IP; a reconnect storm must not drop
+    the room events that end meetings. Requests with a wrong token are limited per IP.
+    """
+    limits = get_limits()
+    if not limits:
+        return
+    if authenticated:
+        enforce("webhook", "prosody", limits.webhook)
+    else:
+        enforce("webhook:ip", frappe.local.request_ip, limits.ip)
+
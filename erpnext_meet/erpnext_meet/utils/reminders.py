@@ -0,0 +1,202 @@
+import datetime
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime, now_datetime
+
+from erpnext_meet.erpnext_meet.utils import availability, metrics, tracing
+
+# "Starting soon" reminders. dispatch() runs every minute and looks only at
+# occurrences starting within the next Meeting Settings > Reminder Lead Time:
+#
+#   - one-off meetings by a range query on the (repeat_this_meeting, start_time) index
+#   - repeating meetings by a range query on next_occurrence, the start of their
+#     next occurrence not reminded yet. Meeting.validate sets it, and every run
+#     moves it past the window for the meetings it looked at.
+#
+# Both queries take at most MAX_MEETINGS_PER_RUN meetings; the rest wait for the
+# next run. Each occurrence is claimed once in Redis (SET NX,
+# erpnext_meet:reminder:{meeting}:{start}), so overlapping runs never remind
+# twice; if sending fails the claims are released and the next run retries.
+# Accepted participants of all due meetings are loaded in two queries; the desk
+# notifications are written with one bulk insert and each recipient gets a
+# realtime push with the join link.
+
+SENT_KEY = "erpnext_meet:reminder:{0}:{1}"
+SENT_TTL = 2 * 24 * 60 * 60
+MAX_MEETINGS_PER_RUN = 500
+# Far enough ahead for any rule to recur, e.g. Yearly on February 29
+NEXT_OCCURRENCE_HORIZON = datetime.timedelta(days=4 * 366 + 1)
+MEETING_FIELDS = """
+    name, host, session_id, reference_doctype, reference_docname, large_meeting,
+    start_time AS starts_on, end_time AS ends_on, repeat_this_meeting AS is_repeating,
+    repeat_on, repeat_till, monday, tuesday, wednesday, thursday, friday, saturday, sunday
+"""
+
+
+def get_lead_time():
+    return cint(frappe.get_cached_doc("Meeting Settings").get("reminder_minutes_before"))
+
+
+def dispatch():
+    """
+    Scheduled task (every minute): sends the reminders that are due.
+    """
+    lead = get_lead_time()
+    if lead <= 0:
+        return
+
+    window_start = now_datetime()
+    window_end = window_start + datetime.timedelta(minutes=lead)
+    due, repeating = get_due_occurrences(window_start, window_end)
+    due = _claim(due)
+
+    sent = 0
+    try:
+        if due:
+            with tracing.span("reminders.dispatch", meetings=list({meeting.name for meeting, occ_start in due})):
+                recipients = _load_recipients([meeting for meeting, occ_start in due])
+                sent = _send(due, recipients, window_start)
+        _advance(repeating, window_end)
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        _release(due)
+        raise
+    if sent:
+        metrics.inc("erpnext_meet_reminders_total", {}, sent)
+
+
+def get_due_occurrences(window_start, window_end):
+    """
+    Returns ([(meeting, occurrence_start)], repeating meetings looked at) for the
+    occurrences starting in [window_start, window_end).
+    A next_occurrence before the window (e.g. runs were missed) is picked up as
+    well, so it gets moved forward.
+    """
+    params = {"window_start": window_start, "window_end": window_end, "limit": MAX_MEETINGS_PER_RUN}
+    one_off = frappe.db.sql(f"""
+        SELECT {MEETING_FIELDS} FROM `tabMeeting`
+        WHERE repeat_this_meeting = 0 AND start_time >= %(window_start)s AND start_time < %(window_end)s
+            AND status != 'Ended'
+        ORDER BY start_time LIMIT %(limit)s
+    """, params, as_dict=True)
+    repeating = frappe.db.sql(f"""
+        SELECT {MEETING_FIELDS} FROM `tabMeeting`
+        WHERE next_occurrence < %(window_end)s AND repeat_this_meeting = 1 AND status != 'Ended'
+        ORDER BY next_occurrence LIMIT %(limit)s
+    """, params, as_dict=True)
+
+    due = [(m, m.starts_on) for m in one_off]
+    for m in repeating:
+        for occ_start, _occ_end in availability.expand_occurrences(m, window_start, window_end):
+            if occ_start >= window_start:
+                due.append((m, occ_start))
+    return due, repeating
+
+
+def get_next_occurrence(meeting, after=None):
+    """
+    Start of the first occurrence of a repeating Meeting (doc or dict with its
+    fields) at or after `after` (default now), or None.
+    """
+    if not meeting.get("repeat_this_meeting") or not meeting.get("repeat_on") \
+            or not meeting.get("start_time") or meeting.get("status") == "Ended":
+        return None
+    row = frappe._dict({day: meeting.get(day) for day in availability.WEEKDAYS})
+    row.update(starts_on=meeting.get("start_time"), ends_on=meeting.get("end_time"), is_repeating=1,
+        repeat_on=meeting.get("repeat_on"), repeat_till=meeting.get("repeat_till"))
+    return _first_occurrence(row, after or now_datetime())
+
+
+def _first_occurrence(row, after):
+    after = max(after, get_datetime(row.starts_on))
+    for occ_start, _occ_end in availability.expand_occurrences(row, after, after + NEXT_OCCURRENCE_HORIZON):
+        if occ_start >= after:
+            return occ_start
+    return None
+
+
+def _advance(repeating, window_end):
+    """
+    Moves next_occurrence of the repeating meetings looked at past the window,
+    whose occurrences have all been claimed by now.
+    """
+    for m in repeating:
+        frappe.db.set_value("Meeting", m.name, "next_occurrence", _first_occurrence(m, window_end),
+            update_modified=False)
+
+
+def _claim(due):
+    """
+    Keeps the occurrences no earlier run has reminded, and marks them as reminded.
+    """
+    if not due:
+        return []
+    pipe = frappe.cache().pipeline()
+    for meeting, occ_start in due:
+        key = frappe.cache().make_key(SENT_KEY.format(meeting.name, int(occ_start.timestamp())))
+        pipe.set(key, 1, nx=True, ex=SENT_TTL)
+    return [occurrence for occurrence, claimed in zip(due, pipe.execute(), strict=True) if claimed]
+
+
+def _release(due):
+    """
+    Drops the claims of occurrences that could not be reminded, so the next run retries them.
+    """
+    if due:
+        frappe.cache().delete_value([SENT_KEY.format(meeting.name, int(occ_start.timestamp()))
+            for meeting, occ_start in due])
+
+
+def _load_recipients(meetings):
+    """
+    {meeting: [users]}: the host and every participant who accepted.
+    """
+    recipients = {m.name: [m.host] if m.host else [] for m in meetings}
+    small = [m.name for m in meetings if not m.large_meeting]
+    large = [m.name for m in meetings if m.large_meeting]
+    if small:
+        for row in frappe.get_all("Meeting Participant",
+                filters={"parent": ["in", small], "parenttype": "Meeting", "invitation_status": "Accepted"},
+                fields=["parent", "user"]):
+            recipients[row.parent].append(row.user)
+    if large:
+        for row in frappe.get_all("Meeting Attendee",
+                filters={"meeting": ["in", large], "invitation_status": "Accepted"},
+                fields=["meeting", "user"]):
+            recipients[row.meeting].append(row.user)
+    return {name: list(dict.fromkeys(users)) for name, users in recipients.items()}
+
+
+def _send(due, recipients, now):
+    from erpnext_meet.erpnext_meet import api
+
+    timestamp = frappe.utils.now()
+    notifications, pushes = [], []
+    for meeting, occ_start in due:
+        join_url = api.get_join_url(api.get_room_name(meeting))
+        minutes = max(int((occ_start - now).total_seconds() // 60), 0)
+        title = f"{meeting.reference_doctype} {meeting.reference_docname}" if meeting.reference_docname else meeting.name
+        subject = _("Video meeting starts in {0} minutes: {1}").format(minutes, title)
+        content = f"""<p>{subject}</p><p><a href="{join_url}" target="_blank">{_("Click here to Join Meeting")}</a></p>"""
+        for user in recipients.get(meeting.name, []):
+            notifications.append((frappe.generate_hash(length=10), timestamp, timestamp, "Administrator",
+                "Administrator", subject, content, user, "Alert", "Meeting", meeting.name, 0, "reminder"))
+            pushes.append((user, {
+                "meeting": meeting.name,
+                "subject": subject,
+                "start_time": str(occ_start),
+                "join_url": join_url,
+            }))
+
+    if notifications:
+        frappe.db.bulk_insert("Notification Log",
+            fields=["name", "creation", "modified", "owner", "modified_by", "subject", "email_content", "for_user",
+                "type", "document_type", "document_name", "read", "erpnext_meet_source"],
+            values=notifications)
+    for user, message in pushes:
+        frappe.publish_realtime("erpnext_meet_reminder", message, user=user, after_commit=True)
+        # Refreshes the notification bell, as Notification Log inserts do
+        frappe.publish_realtime("notification", user=user, after_commit=True)
+    return len(notifications)
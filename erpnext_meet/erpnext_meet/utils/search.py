@@ -0,0 +1,279 @@
+import contextlib
+import re
+import sqlite3
+
+import frappe
+from frappe import _
+from frappe.utils import cint, getdate, strip_html
+
+from erpnext_meet.erpnext_meet.utils import db_routing, tracing
+
+# Full-text search over meetings. Each meeting is indexed as one document whose
+# text is the stripped meeting_details, the reference doctype and name, and the
+# IDs and full names of the host and participants. Backends are pluggable:
+#
+#   mariadb   InnoDB table with a FULLTEXT index, next to the site's tables (default on MariaDB)
+#   sqlite    FTS5 database in the site's private folder (default elsewhere, e.g. Postgres)
+#
+# Set `erpnext_meet_search_backend` in site_config.json to choose explicitly.
+# The index is updated by a short job queued after each Meeting save, end or
+# participant change; rebuild() backfills it.
+
+BATCH_SIZE = 500
+MAX_PAGE_LENGTH = 100
+
+
+class MariaDBBackend:
+    table = "__erpnext_meet_search"
+
+    def setup(self):
+        frappe.db.sql_ddl(f"""
+            CREATE TABLE IF NOT EXISTS `{self.table}` (
+                name VARCHAR(140) NOT NULL PRIMARY KEY,
+                reference_doctype VARCHAR(140),
+                reference_docname VARCHAR(140),
+                host VARCHAR(140),
+                status VARCHAR(140),
+                start_time DATETIME(6),
+                content LONGTEXT,
+                FULLTEXT INDEX content (content)
+            ) ENGINE=InnoDB CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+
+    def upsert(self, rows):
+        frappe.db.sql(f"""
+            INSERT INTO `{self.table}` (name, reference_doctype, reference_docname, host, status, start_time, content)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(rows))}
+            ON DUPLICATE KEY UPDATE reference_doctype = VALUES(reference_doctype),
+                reference_docname = VALUES(reference_docname), host = VALUES(host), status = VALUES(status),
+                start_time = VALUES(start_time), content = VALUES(content)
+        """, [v for row in rows for v in (row.name, row.reference_doctype, row.reference_docname, row.host,
+            row.status, row.start_time, row.content)])
+
+    def delete(self, names):
+        frappe.db.sql(f"DELETE FROM `{self.table}` WHERE name IN %(names)s", {"names": names})
+
+    def clear(self):
+        frappe.db.sql(f"DELETE FROM `{self.table}`")
+
+    def search(self, text, filters, start, page_length):
+        conditions, values = ["MATCH(content) AGAINST (%(text)s IN NATURAL LANGUAGE MODE)"], {"text": text}
+        for field, op, value in filters:
+            conditions.append(f"{field} {op} %({field}{len(values)})s")
+            values[f"{field}{len(values)}"] = value
+        where = " AND ".join(conditions)
+
+        with db_routing.read_replica():
+            total = frappe.db.sql(f"SELECT COUNT(*) FROM `{self.table}` WHERE {where}", values)[0][0]
+            rows = frappe.db.sql(f"""
+                SELECT name, reference_doctype, reference_docname, host, status, start_time,
+                    MATCH(content) AGAINST (%(text)s IN NATURAL LANGUAGE MODE) AS score
+                FROM `{self.table}`
+                WHERE {where}
+                ORDER BY score DESC, start_time DESC
+                LIMIT %(start)s, %(page_length)s
+            """, dict(values, start=start, page_length=page_length), as_dict=True)
+        return total, rows
+
+
+class SQLiteBackend:
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per operation; WAL lets searches run during writes
+        conn = sqlite3.connect(frappe.get_site_path("private", "erpnext_meet_search.sqlite3"), timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def setup(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS meeting_search USING fts5(
+                    name UNINDEXED, reference_doctype UNINDEXED, reference_docname UNINDEXED, host UNINDEXED,
+                    status UNINDEXED, start_time UNINDEXED, content,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+
+    def upsert(self, rows):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM meeting_search WHERE name = ?", [(row.name,) for row in rows])
+            conn.executemany("INSERT INTO meeting_search VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (row.name, row.reference_doctype, row.reference_docname, row.host, row.status,
+                    str(row.start_time) if row.start_time else None, row.content)
+                for row in rows
+            ])
+
+    def delete(self, names):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM meeting_search WHERE name = ?", [(name,) for name in names])
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meeting_search")
+
+    def search(self, text, filters, start, page_length):
+        # Any of the words, ranked by BM25, like MariaDB's natural language mode
+        terms = re.findall(r"\w+", text, flags=re.UNICODE)
+        if not terms:
+            return 0, []
+        conditions = ["meeting_search MATCH ?"]
+        values = [" OR ".join(f'"{term}"' for term in terms)]
+        for field, op, value in filters:
+            conditions.append(f"{field} {op} ?")
+            values.append(str(value))
+        where = " AND ".join(conditions)
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM meeting_search WHERE {where}", values).fetchone()[0]
+            rows = conn.execute(f"""
+                SELECT name, reference_doctype, reference_docname, host, status, start_time,
+                    -bm25(meeting_search) AS score
+                FROM meeting_search
+                WHERE {where}
+                ORDER BY score DESC, start_time DESC
+                LIMIT ? OFFSET ?
+            """, [*values, page_length, start]).fetchall()
+        return total, [frappe._dict(dict(row)) for row in rows]
+
+
+BACKENDS = {
+    "mariadb": MariaDBBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def get_backend():
+    name = frappe.conf.get("erpnext_meet_search_backend") or ("mariadb" if frappe.db.db_type == "mariadb" else "sqlite")
+    if name not in BACKENDS:
+        frappe.throw(_("Unknown meeting search backend: {0}").format(name))
+    return BACKENDS[name]()
+
+
+def setup():
+    """
+    Creates the index storage if missing. Runs after every migrate.
+    """
+    get_backend().setup()
+
+
+def queue_update(meeting_names):
+    """
+    Re-indexes `meeting_names` in a short job once the current transaction commits.
+    """
+    meeting_names = [n for n in meeting_names if n]
+    if meeting_names:
+        tracing.enqueue(
+            "erpnext_meet.erpnext_meet.utils.search.update_index",
+            queue="short",
+            meeting_names=meeting_names,
+            enqueue_after_commit=True
+        )
+
+
+@tracing.traced("search.update_index")
+def update_index(meeting_names):
+    """
+    Background job: indexes the given meetings, and drops the ones that no longer exist.
+    """
+    rows = _build_rows(meeting_names)
+    backend = get_backend()
+    if rows:
+        backend.upsert(rows)
+    deleted = set(meeting_names) - {row.name for row in rows}
+    if deleted:
+        backend.delete(list(deleted))
+
+
+def _build_rows(meeting_names):
+    """
+    Index rows for a batch of meetings, with one query per table.
+    """
+    meetings = frappe.get_all("Meeting",
+        filters={"name": ["in", list(meeting_names)]},
+        fields=["name", "reference_doctype", "reference_docname", "host", "status", "start_time",
+            "meeting_details", "large_meeting"])
+    if not meetings:
+        return []
+
+    users = {}
+    small = [m.name for m in meetings if not m.large_meeting]
+    large = [m.name for m in meetings if m.large_meeting]
+    if small:
+        for row in frappe.get_all("Meeting Participant",
+                filters={"parent": ["in", small], "parenttype": "Meeting"}, fields=["parent", "user"]):
+            users.setdefault(row.parent, []).append(row.user)
+    if large:
+        for row in frappe.get_all("Meeting Attendee", filters={"meeting": ["in", large]}, fields=["meeting", "user"]):
+            users.setdefault(row.meeting, []).append(row.user)
+
+    everyone = {u for names in users.values() for u in names} | {m.host for m in meetings if m.host}
+    full_names = {u.name: u.full_name for u in frappe.get_all("User",
+        filters={"name": ["in", list(everyone)]}, fields=["name", "full_name"])} if everyone else {}
+
+    rows = []
+    for m in meetings:
+        people = dict.fromkeys(([m.host] if m.host else []) + users.get(m.name, []))
+        parts = [m.reference_doctype, m.reference_docname, strip_html(m.meeting_details or "")]
+        parts += [f"{full_names.get(u) or ''} {u}" for u in people]
+        m.content = " ".join(p for p in parts if p)
+        rows.append(m)
+    return rows
+
+
+@frappe.whitelist()
+def search_meetings(text, start=0, page_length=20, status=None, from_date=None, to_date=None):
+    """
+    Ranked full-text search over meetings.
+    Returns {"total": n, "results": [{name, reference_doctype, reference_docname, host, status, start_time, score}]}.
+    """
+    frappe.has_permission("Meeting", "read", throw=True)
+    text = (text or "").strip()
+    if not text:
+        return {"total": 0, "results": []}
+
+    filters = []
+    if status:
+        filters.append(("status", "=", status))
+    if from_date:
+        filters.append(("start_time", ">=", str(getdate(from_date))))
+    if to_date:
+        filters.append(("start_time", "<", str(frappe.utils.add_days(getdate(to_date), 1))))
+
+    page_length = min(max(cint(page_length), 1), MAX_PAGE_LENGTH)
+    total, rows = get_backend().search(text, filters, max(cint(start), 0), page_length)
+    return {"total": total, "results": rows}
+
+
+@frappe.whitelist()
+def rebuild():
+    """
+    Rebuilds the whole index from the Meeting table, BATCH_SIZE meetings at a time.
+    Usage: bench --site <site> execute erpnext_meet.erpnext_meet.utils.search.rebuild
+    """
+    frappe.only_for("System Manager")
+    backend = get_backend()
+    backend.setup()
+    backend.clear()
+
+    last_name = ""
+    indexed = 0
+    while True:
+        names = frappe.get_all("Meeting",
+            filters={"name": [">", last_name]},
+            order_by="name asc",
+            limit_page_length=BATCH_SIZE,
+            pluck="name")
+        if not names:
+            break
+        rows = _build_rows(names)
+        if rows:
+            backend.upsert(rows)
+        indexed += len(rows)
+        last_name = names[-1]
+        frappe.db.commit()
+    return indexed
@@ -0,0 +1,126 @@
+import os
+import random
+import threading
+import time
+import uuid
+
+import frappe
+
+# Session IDs are 16 chars of lowercase Crockford base32 (no "-", so room names
+# still split on the last dash; lowercase because Jitsi lowercases room names):
+#
+#   10 chars  48-bit millisecond timestamp  -> time-ordered, appends to the B-tree
+#    4 chars  20-bit node ID                -> unique per worker process (Redis INCR, shared by all sites)
+#    2 chars  10-bit sequence               -> 1024 IDs per millisecond per node
+#
+# Legacy 8-char hex IDs keep working: lookups are plain equality on session_id.
+ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+NODE_BITS = 20
+SEQUENCE_BITS = 10
+NODE_COUNTER_KEY = "erpnext_meet:session_id:node"
+
+_lock = threading.Lock()
+_state = {"pid": None, "node": None, "last_ms": 0, "sequence": 0}
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _node_id():
+    # Re-acquire after fork so gunicorn/RQ workers never share a node ID.
+    # The counter key is not site-prefixed: a worker serves several sites with
+    # one node ID, so it has to be unique across every site on this Redis.
+    if _state["pid"] != os.getpid():
+        try:
+            pipe = frappe.cache().pipeline()
+            pipe.incr(NODE_COUNTER_KEY)
+            node = pipe.execute()[0]
+        except Exception:
+            node = random.getrandbits(NODE_BITS)
+            frappe.log_error(title="Meeting Session ID Error",
+                message=f"Redis is unavailable, using random node ID {node}\n{frappe.get_traceback()}")
+        _state.update(pid=os.getpid(), node=node % (1 << NODE_BITS), last_ms=0, sequence=0)
+    return _state["node"]
+
+
+def new_session_id():
+    """
+    Returns a compact, URL-safe, time-ordered session ID, monotonic per process.
+    """
+    with _lock:
+        node = _node_id()
+        now_ms = int(time.time() * 1000)
+
+        # Never go backwards, even if the wall clock does
+        if now_ms <= _state["last_ms"]:
+            now_ms = _state["last_ms"]
+            _state["sequence"] += 1
+            if _state["sequence"] >= (1 << SEQUENCE_BITS):
+                # Sequence exhausted for this millisecond: borrow the next one
+                now_ms += 1
+                _state["sequence"] = 0
+        else:
+            _state["sequence"] = 0
+        _state["last_ms"] = now_ms
+
+        return _encode(now_ms, 10) + _encode(node, 4) + _encode(_state["sequence"], 2)
+
+
+def benchmark(rows=50000, batch_size=1000):
+    """
+    Compares insert throughput and index size of legacy uuid4()[:8] IDs against
+    new_session_id() on scratch tables shaped like tabMeeting's session_id column.
+    Usage: bench --site <site> execute erpnext_meet.erpnext_meet.utils.session_id.benchmark
+    """
+    schemes = {
+        "uuid4_8": lambda: str(uuid.uuid4())[:8],
+        "time_ordered": new_session_id,
+    }
+    results = {}
+
+    for scheme, generate in schemes.items():
+        table = f"__erpnext_meet_sid_bench_{scheme}"
+        frappe.db.sql_ddl(f"DROP TABLE IF EXISTS `{table}`")
+        frappe.db.sql_ddl(f"""
+            CREATE TABLE `{table}` (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                session_id VARCHAR(140) NOT NULL,
+                UNIQUE KEY session_id (session_id)
+            ) ENGINE=InnoDB
+        """)
+
+        try:
+            start = time.monotonic()
+            for offset in range(0, rows, batch_size):
+                ids = [generate() for _ in range(min(batch_size, rows - offset))]
+                # INSERT IGNORE: a colliding ID is dropped instead of failing the batch
+                frappe.db.sql(
+                    f"INSERT IGNORE INTO `{table}` (session_id) VALUES {', '.join(['(%s)'] * len(ids))}",
+                    tuple(ids)
+                )
+                frappe.db.commit()
+            elapsed = time.monotonic() - start
+
+            # information_schema is readable by the site's own DB user, unlike mysql.innodb_index_stats.
+            # The secondary session_id index is the only one counted in INDEX_LENGTH.
+            frappe.db.sql(f"ANALYZE TABLE `{table}`")
+            index_bytes = frappe.db.sql("""
+                SELECT INDEX_LENGTH FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (table,))
+            stored = frappe.db.sql(f"SELECT COUNT(*) FROM `{table}`")[0][0]
+        finally:
+            frappe.db.sql_ddl(f"DROP TABLE IF EXISTS `{table}`")
+
+        results[scheme] = {
+            "rows_per_second": round(rows / elapsed) if elapsed else None,
+            "index_bytes": index_bytes[0][0] if index_bytes else None,
+            "collisions": rows - stored,
+        }
+
+    return results
@@ -0,0 +1,189 @@
+import contextlib
+import functools
+import json
+import time
+import uuid
+
+import frappe
+from frappe.utils import get_datetime
+
+# Trace context for the request -> background job pipelines (create_room ->
+# invite_users -> send_meeting_invites, Meeting.save -> sync_with_event ->
+# sync_event_shares, ...). A trace starts at the first traced entry point and is
+# passed to every job the app queues through tracing.enqueue() as the `_trace`
+# keyword, which @traced removes again before the job function runs.
+#
+# Each traced stage records one span:
+#   {trace_id, span_id, parent_id, name, start, queue_wait, duration, user, error}
+# queue_wait is the time from enqueue() to the job starting; for jobs queued with
+# enqueue_after_commit it includes the rest of the enqueuing transaction.
+#
+# Spans are kept per meeting in a capped Redis list (erpnext_meet:trace:{meeting}),
+# newest first, and expire after SPAN_TTL. get_timeline() adds the meeting's
+# Email Queue rows, so delivery delay after frappe.sendmail is visible too.
+
+SPANS_KEY = "erpnext_meet:trace:{0}"
+MAX_SPANS = 500
+SPAN_TTL = 14 * 24 * 60 * 60
+
+
+def _new_id(length=16):
+    return uuid.uuid4().hex[:length]
+
+
+def current():
+    return getattr(frappe.local, "erpnext_meet_trace", None)
+
+
+def set_meeting(meeting_name):
+    """
+    Attaches `meeting_name` to the current trace, so its spans (including the open
+    ones) show up in the meeting's timeline.
+    """
+    context = current()
+    if context and meeting_name and meeting_name not in context["meetings"]:
+        context["meetings"].append(meeting_name)
+
+
+@contextlib.contextmanager
+def span(name, incoming=None, meetings=None, **attributes):
+    """
+    Records the enclosed block as a span of the current trace. `incoming` is the
+    context a job received from enqueue(); without it and outside any span, a new
+    trace starts here.
+    """
+    parent = current()
+    queue_wait = None
+    if incoming:
+        trace_id, parent_id = incoming.get("trace_id") or _new_id(), incoming.get("parent_id")
+        trace_meetings = list(incoming.get("meetings") or [])
+        if incoming.get("enqueued_at"):
+            queue_wait = max(time.time() - incoming["enqueued_at"], 0)
+    elif parent:
+        # Shared with the parent, so a meeting found in a nested stage tags the whole request
+        trace_id, parent_id, trace_meetings = parent["trace_id"], parent["span_id"], parent["meetings"]
+    else:
+        trace_id, parent_id, trace_meetings = _new_id(), None, []
+
+    context = {"trace_id": trace_id, "span_id": _new_id(8), "meetings": trace_meetings}
+    frappe.local.erpnext_meet_trace = context
+    for meeting in meetings or []:
+        set_meeting(meeting)
+
+    start = time.time()
+    error = None
+    try:
+        yield context
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        frappe.local.erpnext_meet_trace = parent
+        _record(context, {
+            "trace_id": trace_id,
+            "span_id": context["span_id"],
+            "parent_id": parent_id,
+            "name": name,
+            "start": start,
+            "queue_wait": queue_wait,
+            "duration": time.time() - start,
+            "user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+            "error": error,
+            "attributes": attributes or None,
+        })
+
+
+def _meetings_from(kwargs):
+    meetings = list(kwargs.get("meeting_names") or [])
+    if kwargs.get("meeting_name"):
+        meetings.append(kwargs["meeting_name"])
+    return meetings
+
+
+def traced(name):
+    """
+    Decorator for entry points and background jobs: runs the function in a span
+    named `name`, continuing the trace passed in `_trace` if any. Meetings passed
+    as meeting_name / meeting_names are attached to the trace.
+    Place it below @frappe.whitelist(), @metrics.timed and @profiler.profile.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            incoming = kwargs.pop("_trace", None)
+            if isinstance(incoming, str):
+                incoming = json.loads(incoming)
+            with span(name, incoming=incoming, meetings=_meetings_from(kwargs)):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enqueue(method, **kwargs):
+    """
+    frappe.enqueue that carries the current trace into the job.
+    The job function must be decorated with @traced.
+    """
+    context = current()
+    kwargs["_trace"] = {
+        "trace_id": context["trace_id"] if context else _new_id(),
+        "parent_id": context["span_id"] if context else None,
+        "meetings": list(context["meetings"]) if context else [],
+        "enqueued_at": time.time(),
+    }
+    return frappe.enqueue(method, **kwargs)
+
+
+def _record(context, record):
+    if not context["meetings"]:
+        return
+    try:
+        value = json.dumps(record)
+        pipe = frappe.cache().pipeline()
+        for meeting in context["meetings"]:
+            key = frappe.cache().make_key(SPANS_KEY.format(meeting))
+            pipe.lpush(key, value)
+            pipe.ltrim(key, 0, MAX_SPANS - 1)
+            pipe.expire(key, SPAN_TTL)
+        pipe.execute()
+    except Exception:
+        # Tracing must never break the traced operation
+        pass
+
+
+@frappe.whitelist()
+def get_timeline(meeting_name):
+    """
+    Spans recorded for a meeting plus its Email Queue rows, oldest first:
+    [{trace_id, span_id, parent_id, name, start, queue_wait, duration, user, error, attributes}]
+    Times are epoch seconds; queue_wait and duration are seconds.
+    """
+    frappe.only_for("System Manager")
+    pipe = frappe.cache().pipeline()
+    pipe.lrange(frappe.cache().make_key(SPANS_KEY.format(meeting_name)), 0, MAX_SPANS - 1)
+    spans = [json.loads(s) for s in pipe.execute()[0]]
+
+    # Delivery happens in Frappe's email queue, after send_meeting_invites returns
+    for email in frappe.get_all("Email Queue",
+            filters={"reference_doctype": "Meeting", "reference_name": meeting_name},
+            fields=["name", "status", "creation", "modified"],
+            order_by="creation asc", limit_page_length=MAX_SPANS):
+        created = get_datetime(email.creation).timestamp()
+        spans.append({
+            "trace_id": None,
+            "span_id": email.name,
+            "parent_id": None,
+            "name": "email_queue",
+            "start": created,
+            "queue_wait": get_datetime(email.modified).timestamp() - created if email.status == "Sent" else None,
+            "duration": None,
+            "user": None,
+            "error": email.status if email.status in ("Error", "Expired") else None,
+            "attributes": {"status": email.status},
+        })
+
+    spans.sort(key=lambda s: s["start"])
+    return spans
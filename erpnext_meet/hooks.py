@@ -31,7 +31,8 @@ app_license = "mit"
 
 # include js, css files in header of desk.html
 # app_include_css = "/assets/erpnext_meet/css/erpnext_meet.css"
-app_include_js = "/assets/erpnext_meet/js/meeting.js"
+# Bootstrap only: the meeting client is loaded on demand (see utils/boot.py)
+app_include_js = "/assets/erpnext_meet/js/meeting_bootstrap.js"
 
 # include js, css files in header of web template
 # web_include_css = "/assets/erpnext_meet/css/erpnext_meet.css"
@@ -41,7 +42,7 @@ app_include_js = "/assets/erpnext_meet/js/meeting.js"
 # page_js = {"page" : "public/js/file.js"}
 
 # include js in doctype views
-doctype_js = {"Meeting" : "public/js/meeting.js"}
+# doctype_js = {"doctype" : "public/js/doctype.js"}
 # doctype_list_js = {"doctype" : "public/js/doctype_list.js"}
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
@@ -51,6 +52,19 @@ doctype_js = {"Meeting" : "public/js/meeting.js"}
 # include app icons in desk
 # app_include_icons = "erpnext_meet/public/icons.svg"
 
+# Boot
+# ----------
+
+boot_session = "erpnext_meet.erpnext_meet.utils.boot.boot_session"
+
+# Migration
+# ----------
+
+after_migrate = [
+    "erpnext_meet.erpnext_meet.utils.search.setup",
+    "erpnext_meet.erpnext_meet.utils.log_retention.setup",
+]
+
 # Home Pages
 # ----------
 
@@ -81,7 +95,7 @@ doctype_js = {"Meeting" : "public/js/meeting.js"}
 # ------------
 
 # before_install = "erpnext_meet.install.before_install"
-# after_install = "erpnext_meet.install.after_install"
+after_install = "erpnext_meet.erpnext_meet.utils.log_retention.setup"
 
 # Uninstallation
 # ------------
@@ -149,7 +163,20 @@ doctype_js = {"Meeting" : "public/js/meeting.js"}
 scheduler_events = {
     "hourly": [
         "erpnext_meet.tasks.hourly"
-    ]
+    ],
+    "daily": [
+        "erpnext_meet.erpnext_meet.utils.log_retention.purge"
+    ],
+    "cron": {
+        "* * * * *": [
+            "erpnext_meet.erpnext_meet.utils.invite_digest.flush",
+            "erpnext_meet.erpnext_meet.utils.reminders.dispatch",
+            "erpnext_meet.erpnext_meet.utils.invite_delivery.retry"
+        ],
+        "*/5 * * * *": [
+            "erpnext_meet.erpnext_meet.utils.event_sync.reconcile"
+        ]
+    }
 }
 
 
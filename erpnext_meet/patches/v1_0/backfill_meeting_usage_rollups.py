@@ -0,0 +1,5 @@
+from erpnext_meet.erpnext_meet.utils.analytics import rebuild_rollups
+
+
+def execute():
+    rebuild_rollups()
@@ -0,0 +1,5 @@
+from erpnext_meet.erpnext_meet.utils.search import rebuild
+
+
+def execute():
+    rebuild()
@@ -0,0 +1,14 @@
+import frappe
+
+from erpnext_meet.erpnext_meet.utils import reminders
+from erpnext_meet.erpnext_meet.utils.availability import WEEKDAYS
+
+
+def execute():
+    meetings = frappe.get_all("Meeting",
+        filters={"repeat_this_meeting": 1, "status": ["!=", "Ended"]},
+        fields=["name", "status", "start_time", "end_time", "repeat_this_meeting", "repeat_on", "repeat_till",
+            *WEEKDAYS])
+    for meeting in meetings:
+        frappe.db.set_value("Meeting", meeting.name, "next_occurrence", reminders.get_next_occurrence(meeting),
+            update_modified=False)
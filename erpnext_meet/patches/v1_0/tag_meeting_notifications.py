@@ -0,0 +1,19 @@
+import frappe
+
+from erpnext_meet.erpnext_meet.utils import log_retention
+
+
+def execute():
+    # Patches run before after_migrate, so the field is created here first
+    log_retention.setup()
+
+    # Rows written before the tag existed, recognized by their default (untranslated) subjects
+    for source, condition in (
+        ("invite", "subject LIKE 'Video Meeting Invite:%%'"),
+        ("invite_digest", "document_type = 'Meeting' AND subject LIKE 'You have been invited to %% video meetings'"),
+        ("reminder", "document_type = 'Meeting' AND subject LIKE 'Video meeting starts in %% minutes:%%'"),
+    ):
+        frappe.db.sql(f"""
+            UPDATE `tabNotification Log` SET {log_retention.SOURCE_FIELD} = %(source)s
+            WHERE {log_retention.SOURCE_FIELD} IS NULL AND {condition}
+        """, {"source": source})
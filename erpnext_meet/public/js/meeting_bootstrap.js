@@ -0,0 +1,75 @@
+// Included on every desk page, so keep it small. The meeting client itself
+// (meeting_client.js) is fetched the first time a form with meeting actions or
+// the invite dialog is opened. Which forms get which actions comes from boot
+// data (erpnext_meet.erpnext_meet.utils.boot), not from a runtime call.
+frappe.provide("erpnext_meet");
+
+erpnext_meet.config = (frappe.boot && frappe.boot.erpnext_meet) || { doctypes: {} };
+
+erpnext_meet.load_client = function () {
+    if (!erpnext_meet._client_loaded) {
+        erpnext_meet._client_loaded = new Promise(resolve => {
+            frappe.require(erpnext_meet.config.client || "/assets/erpnext_meet/js/meeting_client.js", () => {
+                resolve(erpnext_meet.client);
+            });
+        });
+    }
+    return erpnext_meet._client_loaded;
+};
+
+Object.keys(erpnext_meet.config.doctypes).forEach(doctype => {
+    let actions = erpnext_meet.config.doctypes[doctype];
+    frappe.ui.form.on(doctype, {
+        refresh: function (frm) {
+            erpnext_meet.load_client().then(client => client.refresh(frm, actions));
+        }
+    });
+});
+
+// Live-meeting indicator in the list views of doctypes with meeting actions:
+// one batched lookup per list render, without loading the client
+const list_render = frappe.views.ListView.prototype.render;
+frappe.views.ListView.prototype.render = function () {
+    let result = list_render.apply(this, arguments);
+    if (this.doctype !== "Meeting" && erpnext_meet.config.doctypes[this.doctype]) {
+        erpnext_meet.show_live_meetings(this);
+    }
+    return result;
+};
+
+erpnext_meet.show_live_meetings = function (listview) {
+    let docnames = (listview.data || []).map(d => d.name);
+    if (!docnames.length) return;
+    frappe.xcall("erpnext_meet.erpnext_meet.api.get_active_rooms", {
+        doctype: listview.doctype,
+        docnames: docnames
+    }).then(rooms => {
+        listview.$result.find(".list-row-checkbox").each(function () {
+            let room = (rooms || {})[unescape($(this).attr("data-name"))];
+            let $subject = $(this).closest(".list-row").find(".list-subject");
+            $subject.find(".meet-live").remove();
+            if (room) {
+                $subject.append(`<span class="indicator-pill red meet-live" style="margin-left: 6px;"
+                    title="${frappe.utils.escape_html(frappe.user.full_name(room.host))}">Live</span>`);
+            }
+        });
+    });
+};
+
+// Meeting start reminders (utils/reminders.py)
+frappe.realtime.on("erpnext_meet_reminder", function (data) {
+    frappe.show_alert({
+        message: `${frappe.utils.escape_html(data.subject)}
+            <a href="${encodeURI(data.join_url)}" target="_blank">Join</a>`,
+        indicator: "blue"
+    }, 30);
+});
+
+// Global entry points of the invite dialog, kept for existing callers
+function start_meeting() {
+    erpnext_meet.load_client().then(client => client.start_meeting());
+}
+
+function create_and_join_room(invited_users) {
+    erpnext_meet.load_client().then(client => client.create_and_join_room(invited_users));
+}
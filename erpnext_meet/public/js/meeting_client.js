@@ -0,0 +1,473 @@
+// Desk meeting client. Not included on every page: meeting_bootstrap.js loads
+// it on first use (a form with meeting actions, or the invite dialog) and calls
+// erpnext_meet.client.refresh with the form's actions from boot data.
+frappe.provide("erpnext_meet");
+
+erpnext_meet.client = {
+    refresh: function (frm, actions) {
+        if (actions.includes("join")) {
+            setup_video_button(frm);
+        }
+        if (actions.includes("participants")) {
+            render_large_meeting_participants(frm);
+        }
+        if (actions.includes("timeline") && !frm.is_new() && frappe.user.has_role("System Manager")) {
+            frm.add_custom_button('Timeline', function () {
+                show_meeting_timeline(frm);
+            }, 'View');
+        }
+        if (actions.includes("invite_delivery") && !frm.is_new()
+            && (frm.doc.host === frappe.session.user || frappe.user.has_role("System Manager"))) {
+            frm.add_custom_button('Invite Delivery', function () {
+                show_invite_delivery(frm);
+            }, 'View');
+            show_invite_delivery_alert(frm);
+        }
+        if (actions.includes("start_meeting") && !frm.is_new()) {
+            frm.add_custom_button('Start Meeting', function () {
+                start_meeting();
+            });
+            show_live_meeting(frm);
+        }
+    },
+    start_meeting: function () {
+        start_meeting();
+    },
+    create_and_join_room: function (invited_users) {
+        create_and_join_room(invited_users);
+    }
+};
+
+function setup_video_button(frm) {
+    if (!frm || !frm.doc) return;
+
+    // Only for Meeting (or docs with status/session_id)
+    if (frm.doctype !== "Meeting") return;
+
+    // Remove existing buttons
+    frm.remove_custom_button('Join Meeting');
+    frm.remove_custom_button('End Meeting');
+
+    if ((frm.doc.status === "Active" || frm.doc.status === "Waiting") && frm.doc.session_id) {
+        let room_name = `Meet-${frm.doc.reference_doctype || 'Instant'}-${frm.doc.reference_docname || 'Meeting'}-${frm.doc.session_id}`.replace(/ /g, "_");
+
+        // Fix for Instant
+        if (!frm.doc.reference_doctype) {
+            room_name = `Meet-Instant-${frm.doc.session_id}`;
+        }
+
+        // --- RSVP LOGIC ---
+        let status = null;
+        if (frm.doc.large_meeting) {
+            // Large meetings do not load participants with the document
+            status = (frm.doc.__onload || {}).my_invitation_status || null;
+        } else {
+            let current_user_participant = (frm.doc.participants || []).find(p => p.user === frappe.session.user);
+            status = current_user_participant ? current_user_participant.invitation_status : null;
+        }
+
+        // If Pending, show Accept/Reject
+        if (status === "Pending" && frm.doc.host !== frappe.session.user) {
+            let accept_btn = frm.add_custom_button('Accept', function () {
+                frappe.call({
+                    method: 'erpnext_meet.erpnext_meet.api.update_invitation_status',
+                    args: { room_name: room_name, status: 'Accepted' },
+                    callback: function (r) {
+                        if (r.message) {
+                            frappe.show_alert({ message: "Invitation Accepted", indicator: 'green' });
+                            frm.reload_doc();
+                        }
+                    }
+                });
+            });
+            accept_btn.addClass("btn-primary");
+
+            let reject_btn = frm.add_custom_button('Reject', function () {
+                frappe.confirm("Are you sure you want to reject this meeting invite?", () => {
+                    frappe.call({
+                        method: 'erpnext_meet.erpnext_meet.api.update_invitation_status',
+                        args: { room_name: room_name, status: 'Rejected' },
+                        callback: function (r) {
+                            if (r.message) {
+                                frappe.show_alert({ message: "Invitation Rejected", indicator: 'orange' });
+                                frm.reload_doc();
+                            }
+                        }
+                    });
+                });
+            });
+            reject_btn.addClass("btn-danger");
+        }
+        else if (status === "Rejected") {
+            frm.dashboard.add_comment("Warning", "You have rejected this invitation.");
+        }
+        // If Accepted or Host, show Join Button
+        else if (status === "Accepted" || frm.doc.host === frappe.session.user) {
+            let join_btn = frm.add_custom_button('Join Meeting', function () {
+                join_meeting_direct(room_name);
+            });
+            join_btn.addClass("btn-danger");
+        }
+
+        // Signed guest invite links (host only)
+        if (frm.doc.host === frappe.session.user) {
+            frm.add_custom_button('Guest Invite Link', function () {
+                create_guest_invite(frm);
+            });
+        }
+
+        // Only show End Meeting button for non-repeating meetings
+        // REMOVED: Auto timeout logic handles ending meetings now.
+        /*
+        if (frm.doc.host === frappe.session.user && !frm.doc.repeat_this_meeting) {
+            frm.add_custom_button('End Meeting', function () {
+                frappe.confirm('End this meeting?', () => {
+                    frappe.call({
+                        method: 'erpnext_meet.erpnext_meet.api.end_meeting',
+                        args: { room_name: room_name },
+                        callback: function () {
+                            frm.reload_doc();
+                        }
+                    });
+                });
+            });
+        }
+        */
+    }
+}
+
+// Large meetings: participants are fetched page by page instead of with the document
+const PARTICIPANT_PAGE_LENGTH = 50;
+
+function render_large_meeting_participants(frm) {
+    if (!frm.doc.large_meeting || frm.is_new()) return;
+
+    let $wrapper = frm.get_field('participants_html').$wrapper;
+    $wrapper.html(`
+        <div class="meet-participants">
+            <div style="display: flex; gap: 8px; margin-bottom: 10px;">
+                <input type="text" class="form-control input-sm meet-participant-search" placeholder="Search User...">
+                <button class="btn btn-default btn-sm meet-add-participants">Add Participants</button>
+            </div>
+            <div class="text-muted small meet-participant-total"></div>
+            <table class="table table-bordered table-condensed" style="margin-top: 6px;">
+                <thead><tr><th>User</th><th>Invitation Status</th></tr></thead>
+                <tbody class="meet-participant-rows"></tbody>
+            </table>
+            <button class="btn btn-default btn-xs meet-load-more" style="display: none;">Load More</button>
+        </div>
+    `);
+
+    let state = { start: 0, search: '' };
+    let load_page = function (reset) {
+        if (reset) {
+            state.start = 0;
+            $wrapper.find('.meet-participant-rows').empty();
+        }
+        frappe.call({
+            method: 'erpnext_meet.erpnext_meet.api.get_meeting_participants',
+            args: {
+                meeting_name: frm.doc.name,
+                start: state.start,
+                page_length: PARTICIPANT_PAGE_LENGTH,
+                search: state.search
+            },
+            callback: function (r) {
+                if (!r.message) return;
+                let rows = r.message.participants;
+                $wrapper.find('.meet-participant-rows').append(rows.map(p => `
+                    <tr>
+                        <td>${frappe.utils.escape_html(p.full_name || p.user)}
+                            <span class="text-muted small">${frappe.utils.escape_html(p.user)}</span></td>
+                        <td>${p.invitation_status}</td>
+                    </tr>
+                `).join(''));
+                state.start += rows.length;
+                $wrapper.find('.meet-participant-total').text(`${r.message.total} participants`);
+                $wrapper.find('.meet-load-more').toggle(rows.length === PARTICIPANT_PAGE_LENGTH);
+            }
+        });
+    };
+
+    $wrapper.find('.meet-load-more').on('click', () => load_page(false));
+    $wrapper.find('.meet-participant-search').on('change', function () {
+        state.search = $(this).val();
+        load_page(true);
+    });
+    $wrapper.find('.meet-add-participants').on('click', function () {
+        let d = new frappe.ui.Dialog({
+            title: 'Add Participants',
+            fields: [
+                { fieldtype: 'MultiSelectList', fieldname: 'users', label: 'Users', options: 'User', reqd: 1,
+                    get_data: txt => frappe.db.get_link_options('User', txt, { enabled: 1 }) }
+            ],
+            primary_action_label: 'Add',
+            primary_action: function (values) {
+                frappe.call({
+                    method: 'erpnext_meet.erpnext_meet.api.add_meeting_participants',
+                    args: { meeting_name: frm.doc.name, users: values.users },
+                    callback: function (r) {
+                        d.hide();
+                        frappe.show_alert({ message: `${(r.message || []).length} participants added`, indicator: 'green' });
+                        load_page(true);
+                    }
+                });
+            }
+        });
+        d.show();
+    });
+
+    load_page(true);
+}
+
+function create_guest_invite(frm) {
+    let d = new frappe.ui.Dialog({
+        title: 'Guest Invite Link',
+        fields: [
+            { fieldtype: 'Data', fieldname: 'display_name', label: 'Guest Name', reqd: 1 },
+            { fieldtype: 'Data', fieldname: 'email', label: 'Send to Email (optional)', options: 'Email' },
+            { fieldtype: 'Float', fieldname: 'valid_hours', label: 'Valid for (Hours)', default: 24 },
+            { fieldtype: 'Select', fieldname: 'role', label: 'Role', options: 'participant\nmoderator', default: 'participant' }
+        ],
+        primary_action_label: 'Create Link',
+        primary_action: function (values) {
+            frappe.call({
+                method: 'erpnext_meet.erpnext_meet.api.create_guest_invite',
+                args: Object.assign({ meeting_name: frm.doc.name }, values),
+                callback: function (r) {
+                    if (r.message) {
+                        d.hide();
+                        frappe.utils.copy_to_clipboard(r.message.join_link);
+                        frappe.msgprint({
+                            title: 'Guest Invite Link',
+                            message: `<p>Valid until ${frappe.datetime.str_to_user(r.message.expires_on)}</p>
+                                <input type="text" class="form-control" readonly value="${r.message.join_link}">`
+                        });
+                    }
+                }
+            });
+        }
+    });
+    d.show();
+}
+
+// Same batched lookup as the list view indicator, for a single document
+function show_live_meeting(frm) {
+    frappe.xcall('erpnext_meet.erpnext_meet.api.get_active_rooms', {
+        doctype: frm.doctype,
+        docnames: [frm.docname]
+    }).then(rooms => {
+        let room = (rooms || {})[frm.docname];
+        if (!room || frm.docname !== frm.doc.name) return;
+        frm.dashboard.set_headline_alert(`
+            <div class="flex justify-between align-center">
+                <span>Live meeting hosted by ${frappe.utils.escape_html(frappe.user.full_name(room.host))}</span>
+                <button class="btn btn-xs btn-danger meet-join-live">Join Meeting</button>
+            </div>
+        `);
+        frm.dashboard.$wrapper.find('.meet-join-live').on('click', () => join_meeting_direct(room.room_name));
+    });
+}
+
+// Where the time went: spans of the request -> job pipelines and email delivery
+function show_meeting_timeline(frm) {
+    frappe.xcall('erpnext_meet.erpnext_meet.utils.tracing.get_timeline', { meeting_name: frm.doc.name }).then(spans => {
+        let seconds = value => (value === null || value === undefined) ? '' : value.toFixed(2);
+        let d = new frappe.ui.Dialog({ title: 'Meeting Timeline', size: 'extra-large' });
+        d.$body.html(spans.length ? `
+            <table class="table table-bordered table-condensed">
+                <thead><tr><th>Started</th><th>Stage</th><th>Queue Wait (s)</th><th>Run Time (s)</th><th>Trace</th><th>User</th><th>Error</th></tr></thead>
+                <tbody>${spans.map(s => `
+                    <tr>
+                        <td>${frappe.datetime.str_to_user(frappe.datetime.get_datetime_as_string(new Date(s.start * 1000)))}</td>
+                        <td>${frappe.utils.escape_html(s.name)}${s.attributes && s.attributes.status ? ` (${frappe.utils.escape_html(s.attributes.status)})` : ''}</td>
+                        <td>${seconds(s.queue_wait)}</td>
+                        <td>${seconds(s.duration)}</td>
+                        <td class="text-muted small">${s.trace_id || ''}</td>
+                        <td>${frappe.utils.escape_html(s.user || '')}</td>
+                        <td>${frappe.utils.escape_html(s.error || '')}</td>
+                    </tr>
+                `).join('')}</tbody>
+            </table>
+        ` : '<p class="text-muted">No spans recorded for this meeting yet.</p>');
+        d.show();
+    });
+}
+
+// Host view of per-recipient invite delivery (utils/invite_delivery.py)
+function show_invite_delivery_alert(frm) {
+    frappe.xcall('erpnext_meet.erpnext_meet.utils.invite_delivery.get_summary', { meeting_name: frm.doc.name }).then(summary => {
+        let undelivered = summary.retrying + summary.given_up;
+        if (!undelivered || frm.docname !== frm.doc.name) return;
+        frm.dashboard.set_headline_alert(`
+            <div class="flex justify-between align-center">
+                <span>${undelivered} of ${summary.recipients} invites not fully delivered${summary.retrying ? ', retrying' : ''}</span>
+                <button class="btn btn-xs btn-default meet-invite-delivery">Details</button>
+            </div>
+        `, summary.given_up ? 'red' : 'orange');
+        frm.dashboard.$wrapper.find('.meet-invite-delivery').on('click', () => show_invite_delivery(frm));
+    });
+}
+
+function show_invite_delivery(frm) {
+    frappe.xcall('erpnext_meet.erpnext_meet.utils.invite_delivery.get_summary', { meeting_name: frm.doc.name }).then(summary => {
+        let d = new frappe.ui.Dialog({
+            title: 'Invite Delivery',
+            size: 'large',
+            primary_action_label: 'Retry Now',
+            primary_action: function () {
+                frappe.xcall('erpnext_meet.erpnext_meet.utils.invite_delivery.retry_now', { meeting_name: frm.doc.name }).then(() => {
+                    d.hide();
+                    frappe.show_alert({ message: 'Undelivered invites will be retried within a minute', indicator: 'blue' });
+                });
+            }
+        });
+        d.$body.html(`
+            <p>${summary.recipients} recipients: ${summary.shared} shared, ${summary.notified} notified, ${summary.emailed} emailed.
+                ${summary.retrying} retrying, ${summary.given_up} given up, ${summary.pending} waiting for the invite digest.</p>
+            ${summary.failures.length ? `
+                <table class="table table-bordered table-condensed">
+                    <thead><tr><th>User</th><th>Undelivered</th><th>Attempts</th><th>Next Retry</th></tr></thead>
+                    <tbody>${summary.failures.map(f => `
+                        <tr>
+                            <td>${frappe.utils.escape_html(frappe.user.full_name(f.user))}</td>
+                            <td>${f.failed.join(', ')}</td>
+                            <td>${f.attempts}</td>
+                            <td>${f.next_retry ? frappe.datetime.str_to_user(f.next_retry) : 'Given up'}</td>
+                        </tr>
+                    `).join('')}</tbody>
+                </table>
+            ` : '<p class="text-muted">All invites were delivered.</p>'}
+        `);
+        if (!summary.failures.length) d.get_primary_btn().hide();
+        d.show();
+    });
+}
+
+function join_meeting_direct(room_name) {
+    let url = frappe.urllib.get_full_url("/api/method/erpnext_meet.erpnext_meet.api.join_room?room_name=" + encodeURIComponent(room_name));
+    window.open(url, '_blank');
+}
+
+function start_meeting() {
+    frappe.call({
+        method: 'frappe.client.get_list',
+        args: {
+            doctype: 'User',
+            fields: ['name', 'full_name', 'email'],
+            filters: {
+                'enabled': 1,
+                'user_type': 'System User',
+                'name': ['!=', 'Guest']
+            },
+            limit_page_length: 500,
+            order_by: 'full_name asc'
+        },
+        callback: function (r) {
+            if (r.message) {
+                let users = r.message;
+                let d = new frappe.ui.Dialog({
+                    title: 'Invite Participants',
+                    fields: [
+                        {
+                            fieldtype: 'HTML',
+                            fieldname: 'user_list_html'
+                        }
+                    ],
+                    primary_action_label: 'Start Meeting',
+                    primary_action: function () {
+                        let selected_users = [];
+                        d.$wrapper.find('.meet-user-checkbox:checked').each(function () {
+                            selected_users.push($(this).data('user'));
+                        });
+
+                        if (selected_users.length === 0) {
+                            frappe.msgprint("Please select at least one user.");
+                            return;
+                        }
+
+                        create_and_join_room(selected_users);
+                        d.hide();
+                    }
+                });
+
+                let html = `
+                    <div style="padding: 10px;">
+                        <input type="text" class="form-control input-sm" placeholder="Search Name..." id="meet-user-filter" style="margin-bottom: 10px;">
+                        <div class="list-group" style="max-height: 400px; overflow-y: auto; border: 1px solid #d1d8dd; border-radius: 4px;" id="meet-user-list-container">
+                            ${users.map(u => `
+                                <div class="list-group-item meet-user-item" data-search="${(u.full_name || '').toLowerCase()} ${(u.email || '').toLowerCase()}">
+                                    <div class="row" style="display: flex; align-items: center;">
+                                        <div class="col-xs-1" style="width: 30px;">
+                                            <input type="checkbox" class="meet-user-checkbox" data-user="${u.name}">
+                                        </div>
+                                        <div class="col-xs-11">
+                                            <div style="font-weight: bold;">${u.full_name || u.name}</div>
+                                            <div class="text-muted small">${u.email}</div>
+                                        </div>
+                                    </div>
+                                </div>
+                            `).join('')}
+                        </div>
+                    </div>
+                `;
+
+                d.fields_dict.user_list_html.$wrapper.html(html);
+
+                d.$wrapper.find('#meet-user-filter').on('keyup', function () {
+                    let val = $(this).val().toLowerCase();
+                    d.$wrapper.find('.meet-user-item').each(function () {
+                        let text = $(this).data('search');
+                        $(this).toggle(text.indexOf(val) !== -1);
+                    });
+                });
+
+                d.$wrapper.find('.meet-user-item').on('click', function (e) {
+                    if (e.target.type !== 'checkbox') {
+                        let checkbox = $(this).find('input[type="checkbox"]');
+                        checkbox.prop('checked', !checkbox.prop('checked'));
+                    }
+                });
+
+                d.show();
+            }
+        }
+    });
+}
+
+function create_and_join_room(invited_users) {
+    frappe.call({
+        method: "erpnext_meet.erpnext_meet.api.create_room",
+        args: {
+            doctype: cur_frm ? cur_frm.doctype : null,
+            docname: cur_frm ? cur_frm.docname : null
+        },
+        callback: function (r) {
+            if (r.message) {
+                let room_data = r.message;
+                if (room_data.existing && !room_data.can_join) {
+                    frappe.msgprint("A meeting is already running for this document. Ask its host to invite you.");
+                    return;
+                }
+                if (room_data.existing) {
+                    frappe.show_alert({ message: "A meeting is already running for this document. Joining it.", indicator: 'blue' });
+                }
+                if (invited_users && invited_users.length > 0) {
+                    frappe.call({
+                        method: "erpnext_meet.erpnext_meet.api.invite_users",
+                        args: {
+                            users: invited_users,
+                            room_name: room_data.room_name,
+                            doctype: cur_frm ? cur_frm.doctype : "Meeting",
+                            docname: cur_frm ? cur_frm.docname : room_data.session_name,
+                            meeting_name: room_data.session_name
+                        }
+                    });
+                }
+                if (room_data.join_link) {
+                    window.open(room_data.join_link, '_blank');
+                }
+            }
+        }
+    });
+}
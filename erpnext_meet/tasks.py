@@ -1,6 +1,36 @@
+import json
+import time
+
 import frappe
-from frappe.utils import add_to_date, now_datetime, getdate, nowdate
+from frappe.utils import add_to_date, get_datetime, getdate, now_datetime, nowdate
+
+from erpnext_meet.erpnext_meet.utils import (
+    active_rooms,
+    analytics,
+    db_routing,
+    guest_tokens,
+    metrics,
+    profiler,
+    search,
+)
+from erpnext_meet.erpnext_meet.utils.lease import Lease
+
+# Bounded, resumable lifecycle sweeps. Each run holds a Redis lease (renewed by a
+# heartbeat) so runs never overlap, even across benches, and ends at most
+# MAX_ROWS_PER_RUN meetings in batches of BATCH_SIZE, committing per batch.
+# Each sweep keeps a (modified, name) cursor in Redis, so rows it skips are not
+# re-read on every run and a large backlog drains over consecutive runs.
+LEASE_TTL = 300
+BATCH_SIZE = 500
+MAX_ROWS_PER_RUN = 5000
+CURSOR_KEY = "erpnext_meet:lifecycle:cursor"
+RUNS_KEY = "erpnext_meet:lifecycle:runs"
+MAX_RUNS = 100
+SWEEPS = ("waiting", "stuck", "repeating")
 
+
+@metrics.timed("tasks.hourly")
+@profiler.profile("tasks.hourly")
 def hourly():
     """
     Scheduled task (Hourly) to manage Meeting lifecycle.
@@ -8,80 +38,183 @@ def hourly():
     2. If modified > 1 hour ago, set status to "Ended".
     3. If modified > 24 hours ago (Active), set status to "Ended".
     4. Repeating meetings: auto-end after repeat_till date.
+
+    Candidates are selected on the read replica (if configured) and re-checked
+    on the primary by primary key before they are updated.
     """
-    
+    lease = Lease("tasks.hourly", ttl=LEASE_TTL)
+    if not lease.acquire():
+        # Another worker or bench is still sweeping
+        return
+
+    started = time.monotonic()
+    processed = {sweep: 0 for sweep in SWEEPS}
+    try:
+        budget = MAX_ROWS_PER_RUN
+        for sweep in SWEEPS:
+            while budget > 0 and not lease.lost:
+                scanned, ended, exhausted = _run_batch(sweep, min(BATCH_SIZE, budget))
+                processed[sweep] += ended
+                # Skipped candidates count against the budget too, so a run stays bounded
+                budget -= scanned
+                if exhausted:
+                    break
+    finally:
+        lease.release()
+
+    _record_run(started, processed, completed=not lease.lost)
+
+
+def _filters(sweep):
     # 1. Timeout for Waiting Meetings (1 Hour) - Only non-repeating
-    timeout_threshold = add_to_date(now_datetime(), hours=-1)
-    
-    meetings_to_end = frappe.db.get_all("Meeting", 
-        filters={
-            "status": "Waiting",
-            "modified": ["<", timeout_threshold],
-            "repeat_this_meeting": 0
-        },
-        fields=["name", "session_id", "event_ref"]
-    )
-    
-    for meeting in meetings_to_end:
-        frappe.db.set_value("Meeting", meeting.name, "status", "Ended")
-        frappe.db.set_value("Meeting", meeting.name, "end_time", frappe.utils.now())
-        # Sync Event status
-        if meeting.event_ref:
-            frappe.db.set_value("Event", meeting.event_ref, "status", "Completed")
-        frappe.db.commit()
+    if sweep == "waiting":
+        return [
+            ["Meeting", "status", "=", "Waiting"],
+            ["Meeting", "modified", "<", add_to_date(now_datetime(), hours=-1)],
+            ["Meeting", "repeat_this_meeting", "=", 0]
+        ]
 
     # 2. Timeout for Stuck "Active" Meetings (24 Hours) - Only non-repeating
-    # Logic change: Also check if start_time is old enough. 
-    # If start_time is in future (e.g. next week), DO NOT close even if modified > 24h.
-    active_timeout_threshold = add_to_date(now_datetime(), hours=-24)
-    
-    # We fetch candidates first
-    stuck_meetings = frappe.db.get_all("Meeting",
-        filters={
-            "status": "Active",
-            "modified": ["<", active_timeout_threshold],
-            "repeat_this_meeting": 0
-        },
-        fields=["name", "event_ref", "start_time"]
-    )
-    
-    for meeting in stuck_meetings:
-        # If start_time is provided and is in the future (or recent past), skip
-        # We only close if start_time is also > 24h ago OR start_time is missing (assume creation)
-        should_close = True
-        if meeting.start_time:
-             if meeting.start_time > active_timeout_threshold:
-                 should_close = False
-        
-        if should_close:
-            frappe.db.set_value("Meeting", meeting.name, "status", "Ended")
-            frappe.db.set_value("Meeting", meeting.name, "end_time", frappe.utils.now())
-            # Sync Event status
-            if meeting.event_ref:
-                frappe.db.set_value("Event", meeting.event_ref, "status", "Completed")
-            frappe.db.commit()
+    if sweep == "stuck":
+        return [
+            ["Meeting", "status", "=", "Active"],
+            ["Meeting", "modified", "<", add_to_date(now_datetime(), hours=-24)],
+            ["Meeting", "repeat_this_meeting", "=", 0]
+        ]
 
     # 3. Repeating meetings: auto-end after repeat_till date
-    today = getdate(nowdate())
-    
-    # Filter: repeat_till < today.
-    # IMPORTANT: Explicitly ensure repeat_till is NOT None.
-    # Logic: If repeat_till is None, it means "Forever", so never auto-end.
-    
-    repeating_meetings = frappe.db.get_all("Meeting",
-        filters={
-            "status": ["in", ["Active", "Waiting"]],
-            "repeat_this_meeting": 1,
-            "repeat_till": ["<", today],
-            "repeat_till": ["is", "set"] # Ensure not null
-        },
-        fields=["name", "event_ref"]
-    )
-    
-    for meeting in repeating_meetings:
-        frappe.db.set_value("Meeting", meeting.name, "status", "Ended")
-        frappe.db.set_value("Meeting", meeting.name, "end_time", frappe.utils.now())
-        # Sync Event status to Completed
-        if meeting.event_ref:
-            frappe.db.set_value("Event", meeting.event_ref, "status", "Completed")
-        frappe.db.commit()
+    # If repeat_till is None, it means "Forever", so never auto-end.
+    # List filters: a dict cannot hold both repeat_till conditions
+    return [
+        ["Meeting", "status", "in", ["Active", "Waiting"]],
+        ["Meeting", "repeat_this_meeting", "=", 1],
+        ["Meeting", "repeat_till", "<", getdate(nowdate())],
+        ["Meeting", "repeat_till", "is", "set"] # Ensure not null
+    ]
+
+
+def _should_end(sweep, meeting):
+    if sweep == "stuck" and meeting.start_time:
+        # If start_time is in the future (e.g. next week), DO NOT close even if modified > 24h.
+        # We only close if start_time is also > 24h ago OR start_time is missing (assume creation)
+        return meeting.start_time <= add_to_date(now_datetime(), hours=-24)
+    return True
+
+
+def _active_until(sweep, meeting):
+    if sweep == "waiting":
+        # end_time was set when the last participant left
+        return meeting.end_time
+    if sweep == "stuck":
+        return meeting.modified
+    return None
+
+
+def _run_batch(sweep, limit):
+    """
+    Ends the next batch of candidates after the sweep's cursor.
+    Returns (candidates looked at, meetings ended, whether the sweep reached the end of its candidates).
+    """
+    filters = _filters(sweep)
+    cursor = _get_cursor(sweep)
+    cursor_filters = list(filters)
+    if cursor:
+        cursor_filters.append(["Meeting", "modified", ">=", cursor[0]])
+
+    with db_routing.read_replica():
+        candidates = frappe.db.get_all("Meeting",
+            filters=cursor_filters,
+            fields=["name", "status", "modified", "session_id", "event_ref", "host", "reference_doctype",
+                "reference_docname", "start_time", "end_time", "repeat_this_meeting"],
+            order_by="modified asc, name asc",
+            # Rows at the cursor's own timestamp are skipped below
+            limit_page_length=limit + 1
+        )
+    exhausted = len(candidates) <= limit
+    if cursor:
+        candidates = [c for c in candidates
+            if (get_datetime(c.modified), c.name) > (get_datetime(cursor[0]), cursor[1])]
+    candidates = candidates[:limit]
+
+    if not candidates:
+        _set_cursor(sweep, None)
+        return 0, 0, True
+
+    to_end = [m for m in db_routing.confirm_on_primary("Meeting", candidates, filters) if _should_end(sweep, m)]
+    if to_end:
+        _end_meetings(sweep, to_end)
+
+    # Wrap around once the end is reached, so skipped rows are looked at again next run
+    _set_cursor(sweep, None if exhausted else [str(candidates[-1].modified), candidates[-1].name])
+    frappe.db.commit()
+    active_rooms.invalidate(to_end)
+    return len(candidates), len(to_end), exhausted
+
+
+def _end_meetings(sweep, meetings):
+    now = frappe.utils.now()
+    names = [m.name for m in meetings]
+    frappe.db.sql("""
+        UPDATE `tabMeeting` SET status = 'Ended', end_time = %(now)s, modified = %(now)s
+        WHERE name IN %(names)s
+    """, {"now": now, "names": names})
+
+    # Sync Event status to Completed
+    events = [m.event_ref for m in meetings if m.event_ref]
+    if events:
+        frappe.db.sql("""
+            UPDATE `tabEvent` SET status = 'Completed', modified = %(now)s WHERE name IN %(events)s
+        """, {"now": now, "events": events})
+
+    for status in ("Active", "Waiting"):
+        metrics.track_status_change(status, "Ended", count=sum(1 for m in meetings if m.status == status))
+    metrics.inc("erpnext_meet_lifecycle_rows_total", {"sweep": sweep}, len(meetings))
+    search.queue_update(names)
+
+    for meeting in meetings:
+        guest_tokens.revoke_session(meeting.session_id)
+        analytics.record_meeting_end(meeting, ended_at=now, active_until=_active_until(sweep, meeting))
+
+
+def _get_cursor(sweep):
+    value = frappe.cache().hget(CURSOR_KEY, sweep)
+    return json.loads(value) if value else None
+
+
+def _set_cursor(sweep, cursor):
+    frappe.cache().hset(CURSOR_KEY, sweep, json.dumps(cursor) if cursor else None)
+
+
+def _record_run(started, processed, completed):
+    backlog = {}
+    with db_routing.read_replica():
+        for sweep in SWEEPS:
+            backlog[sweep] = frappe.db.count("Meeting", _filters(sweep))
+
+    run = {
+        "finished_at": str(now_datetime()),
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "processed": processed,
+        "backlog": backlog,
+        "completed": completed,
+    }
+    try:
+        pipe = frappe.cache().pipeline()
+        pipe.lpush(frappe.cache().make_key(RUNS_KEY), json.dumps(run))
+        pipe.ltrim(frappe.cache().make_key(RUNS_KEY), 0, MAX_RUNS - 1)
+        pipe.execute()
+    except Exception:
+        pass
+    return run
+
+
+@frappe.whitelist()
+def get_run_stats(limit=20):
+    """
+    Returns the most recent lifecycle runs, newest first:
+    [{finished_at, duration_seconds, processed: {sweep: n}, backlog: {sweep: n}, completed}]
+    """
+    frappe.only_for("System Manager")
+    pipe = frappe.cache().pipeline()
+    pipe.lrange(frappe.cache().make_key(RUNS_KEY), 0, frappe.utils.cint(limit) - 1)
+    return [json.loads(r) for r in pipe.execute()[0]]
@@ -1,120 +1,111 @@
-local st = require "util.stanza";
-local timer = require "util.timer";
 local module = module;
-module:log("info", "LOADED mod_dynamic_moderation (v13 - NO LOBBY)");
+module:log("info", "LOADED mod_dynamic_moderation (v14 - token claims, no timers)");
 
 local util = module:require 'util';
 local is_admin = util.is_admin;
 
--- Helper to check if user is Real Host based on Token
-local function is_real_host(origin)
-    local token = origin and origin.auth_token;
-    
-    if not token then return false; end
-    
-    local context_user = token.context and token.context.user;
-    
-    if context_user then
-        if context_user.moderator == true or context_user.moderator == "true" then return true; end
-        if context_user.affiliation == "owner" then return true; end
-    end
-    
-    if token.moderator == true or token.moderator == "true" then return true; end
-    if token.affiliation == "owner" then return true; end
-    
-    return false;
+-- Moderator policy on top of mod_token_affiliation, applied synchronously:
+--   - host/moderator token (affiliation owner in the room-scoped claims): stays owner,
+--     and any temporary owner is demoted to member
+--   - other authenticated users: promoted to temporary owner while no owner is present
+--   - guests without a token: member
+--   - when the last owner leaves, the next authenticated participant becomes temporary owner
+
+local OWNER_ROLES = { host = true, moderator = true };
+
+-- Is the occupant a real owner according to its (room-checked) token claims?
+local function is_real_host(room, occupant)
+    return room:get_affiliation(occupant.bare_jid) == "owner"
+        and not (room._data.temporary_owners or {})[occupant.bare_jid];
+end
+
+local function has_token_role(origin, roles)
+    local user = origin and origin.jitsi_meet_context_user;
+    return origin and origin.auth_token ~= nil and user ~= nil and roles[user.role] == true;
 end
 
 local function is_authenticated(origin)
-    local token = origin and origin.auth_token;
-    return token ~= nil;
+    return origin and origin.auth_token ~= nil;
+end
+
+local function occupant_session(occupant)
+    for real_jid in occupant:each_session() do
+        return prosody.full_sessions[real_jid];
+    end
 end
 
 local function force_affiliation(room, jid, affiliation)
-    room:set_affiliation(true, jid, affiliation);
-    timer.add_task(1, function()
+    if room:get_affiliation(jid) ~= affiliation then
         room:set_affiliation(true, jid, affiliation);
-    end);
+    end
+end
+
+local function has_owner(room, except_jid)
+    for _, other in room:each_occupant() do
+        if other.bare_jid ~= except_jid
+           and not is_admin(other.bare_jid)
+           and room:get_affiliation(other.bare_jid) == "owner" then
+            return true;
+        end
+    end
+    return false;
+end
+
+local function promote_temporary(room, occupant)
+    room._data.temporary_owners = room._data.temporary_owners or {};
+    room._data.temporary_owners[occupant.bare_jid] = true;
+    force_affiliation(room, occupant.bare_jid, "owner");
 end
 
 module:hook("muc-occupant-joined", function(event)
     local room = event.room;
     local occupant = event.occupant;
     local origin = event.origin;
-    
-    timer.add_task(2, function()
-        local current_occupant = room:get_occupant_by_nick(occupant.nick);
-        if not current_occupant then return; end
-        
-        -- Skip admin/system users (Jicofo, JVB, etc.)
-        if is_admin(current_occupant.bare_jid) then
-            module:log("info", "Skipping admin user: %s", current_occupant.jid);
-            return;
-        end
-        
-        local real_host = is_real_host(origin);
-        local authenticated = is_authenticated(origin);
-        
-        if real_host then
-            -- Real host (moderator in JWT) gets owner
-            module:log("info", "User is HOST (owner): %s", current_occupant.jid);
-            force_affiliation(room, current_occupant.bare_jid, "owner");
-            
-            -- Demote any other non-admin owners
-            for _, other in room:each_occupant() do
-                if other.bare_jid ~= current_occupant.bare_jid 
-                   and other.affiliation == "owner" 
-                   and not is_admin(other.bare_jid) then
-                    module:log("info", "Demoting accidental owner: %s", other.jid);
-                    force_affiliation(room, other.bare_jid, "member");
-                end
-            end
-        elseif authenticated then
-            -- JWT authenticated non-host user gets member
-            module:log("info", "JWT User (member): %s", current_occupant.jid);
-            force_affiliation(room, current_occupant.bare_jid, "member");
-            
-            -- If no owner exists, promote this user
-            local has_owner = false;
-            for _, existing in room:each_occupant() do
-                if existing.affiliation == "owner" and not is_admin(existing.bare_jid) then 
-                    has_owner = true; 
-                    break; 
-                end
-            end
-            
-            if not has_owner then
-                module:log("info", "No owner exists. Promoting JWT user %s to owner.", current_occupant.jid);
-                force_affiliation(room, current_occupant.bare_jid, "owner");
+
+    -- Skip admin/system users (Jicofo, JVB, etc.)
+    if is_admin(occupant.bare_jid) then
+        return;
+    end
+
+    if has_token_role(origin, OWNER_ROLES) and is_real_host(room, occupant) then
+        module:log("info", "User is HOST (owner): %s", occupant.jid);
+        -- Demote temporary owners
+        for jid in pairs(room._data.temporary_owners or {}) do
+            if jid ~= occupant.bare_jid then
+                module:log("info", "Demoting temporary owner: %s", jid);
+                force_affiliation(room, jid, "member");
             end
-        else
-            -- Guest without JWT - still allow but as participant
-            module:log("info", "Guest user (participant): %s", current_occupant.jid);
-            force_affiliation(room, current_occupant.bare_jid, "member");
         end
-    end);
-end);
+        room._data.temporary_owners = nil;
+    elseif is_authenticated(origin) then
+        if not has_owner(room, occupant.bare_jid) then
+            module:log("info", "No owner exists. Promoting JWT user %s to owner.", occupant.jid);
+            promote_temporary(room, occupant);
+        end
+    else
+        -- Guest without JWT - still allow but as participant
+        force_affiliation(room, occupant.bare_jid, "member");
+    end
+end, 5);
 
 module:hook("muc-occupant-left", function(event)
     local room = event.room;
     local occupant = event.occupant;
-    
-    if occupant.affiliation ~= "owner" then return; end
-    
-    timer.add_task(1, function()
-        local remaining_owner_exists = false;
-        local potential_new_owner = nil;
-        for _, other in room:each_occupant() do
-            if is_admin(other.bare_jid) then
-                -- skip
-            elseif other.affiliation == "owner" then 
-                remaining_owner_exists = true; 
-            elseif not potential_new_owner then 
-                potential_new_owner = other; 
+
+    if room._data.temporary_owners then
+        room._data.temporary_owners[occupant.bare_jid] = nil;
+    end
+    if room:get_affiliation(occupant.bare_jid) ~= "owner" or has_owner(room, occupant.bare_jid) then
+        return;
+    end
+
+    for _, other in room:each_occupant() do
+        if other.bare_jid ~= occupant.bare_jid and not is_admin(other.bare_jid) then
+            if is_authenticated(occupant_session(other)) then
+                module:log("info", "Owner left. Promoting %s to temporary owner.", other.jid);
+                promote_temporary(room, other);
+                return;
             end
         end
-        if not remaining_owner_exists and potential_new_owner then
-            force_affiliation(room, potential_new_owner.bare_jid, "owner");
-        end
-    end);
+    end
 end);
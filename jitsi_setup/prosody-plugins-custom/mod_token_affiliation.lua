@@ -1,65 +1,82 @@
-local LOGLEVEL = "debug"
+-- Applies the room affiliation carried in the ERPNext Meet JWT, synchronously and
+-- once per join. All decisions are made when the token is issued
+-- (erpnext_meet/erpnext_meet/utils/jitsi_token.py); this module only reads:
+--
+--   room / context.room.name     must equal this room, otherwise nothing is granted
+--   context.user.role            host | moderator | participant | guest
+--   context.user.affiliation     owner is honoured only for host and moderator
+--   context.user.lobby_bypass    affiliation is applied before the lobby check
+--
+-- The affiliation is set in muc-occupant-pre-join, before the occupant becomes
+-- visible, so no delayed or repeated set_affiliation is needed.
 
--- Set this parameter in Prosody config if you dont want cascading updates for
--- affiliation. Cascading updates are needed when the authentication is enabled
--- in Jicofo.
-local DISABLE_CASCADING_SET = module:get_option_boolean(
-    "disable_cascading_set", false
-)
+local LOGLEVEL = "debug"
 
+local jid_split = require "util.jid".split;
 local util = module:require 'util';
 local is_admin = util.is_admin;
 local is_healthcheck_room = util.is_healthcheck_room
-local timer = require "util.timer"
+
+local OWNER_ROLES = { host = true, moderator = true };
+local KNOWN_ROLES = { host = true, moderator = true, participant = true, guest = true };
+
 module:log(LOGLEVEL, "loaded")
 
-module:hook("muc-occupant-joined", function (event)
-    local room, occupant, session = event.room, event.occupant, event.origin
+-- The room check expects the claims built by jitsi_token.build_claims in ERPNext Meet
+local function token_affiliation(session, room)
+    local user = session.jitsi_meet_context_user;
+    if not session.auth_token or not user or not KNOWN_ROLES[user.role] then
+        return nil;
+    end
 
-    if is_healthcheck_room(room.jid) or is_admin(occupant.bare_jid) then
-        module:log(LOGLEVEL, "skip affiliation, %s", occupant.jid)
-        return
+    local room_node = jid_split(room.jid);
+    local context_room = session.jitsi_meet_context_room;
+    if session.jitsi_meet_room ~= room_node or not context_room or context_room.name ~= room_node then
+        module:log("warn", "token for %s used in %s, no affiliation granted", tostring(session.jitsi_meet_room), room_node);
+        return nil;
     end
 
-    if not session.auth_token then
-        module:log(LOGLEVEL, "skip affiliation, no token")
-        return
+    if user.affiliation == "owner" and OWNER_ROLES[user.role] then
+        return "owner";
     end
+    return "member";
+end
 
-    if session.token_affiliation_checked then
-        module:log(LOGLEVEL, "skip affiliation, already checked")
-        return
+local function apply(room, occupant, affiliation)
+    if room:get_affiliation(occupant.bare_jid) ~= affiliation then
+        room:set_affiliation(true, occupant.bare_jid, affiliation);
     end
+    module:log(LOGLEVEL, "affiliation %s: %s", affiliation, occupant.bare_jid);
+end
 
-    local affiliation = "member"
-    local context_user = session.jitsi_meet_context_user
+-- Runs before the lobby (members-only) check, so lobby_bypass takes effect
+module:hook("muc-occupant-pre-join", function (event)
+    local room, occupant, session = event.room, event.occupant, event.origin
 
-    if context_user then
-        if context_user["affiliation"] == "owner" then
-            affiliation = "owner"
-        elseif context_user["affiliation"] == "moderator" then
-            affiliation = "owner"
-        elseif context_user["affiliation"] == "teacher" then
-            affiliation = "owner"
-        elseif context_user["moderator"] == "true" then
-            affiliation = "owner"
-        elseif context_user["moderator"] == true then
-            affiliation = "owner"
-        end
+    if is_healthcheck_room(room.jid) or is_admin(occupant.bare_jid) then
+        return
     end
 
-    local i = 0
-    local function setAffiliation()
-        room:set_affiliation(true, occupant.bare_jid, affiliation)
-
-        if DISABLE_CASCADING_SET then return end
-        if i > 8 then return end
+    local affiliation = token_affiliation(session, room);
+    if not affiliation then
+        return
+    end
 
-        i = i + 1
-        timer.add_task(0.2 * i, setAffiliation)
+    local user = session.jitsi_meet_context_user;
+    if affiliation == "owner" or user.lobby_bypass == true or not room:get_members_only() then
+        apply(room, occupant, affiliation);
+    else
+        -- Goes through the lobby first; applied once admitted
+        session.erpnext_meet_pending_affiliation = affiliation;
     end
-    setAffiliation()
-    session.token_affiliation_checked = true
+end, 10)
 
-    module:log(LOGLEVEL, "affiliation: %s", affiliation)
-end)
+module:hook("muc-occupant-joined", function (event)
+    local room, occupant, session = event.room, event.occupant, event.origin
+
+    local affiliation = session.erpnext_meet_pending_affiliation;
+    if affiliation then
+        session.erpnext_meet_pending_affiliation = nil;
+        apply(room, occupant, affiliation);
+    end
+end, 10)